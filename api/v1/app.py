@@ -3,24 +3,89 @@
 Web server
 """
 from flask import Flask, jsonify, make_response
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from flask_cors import CORS
-from models import storage
+from models import serializer, storage
+from models.base_model import BaseModel
+from api.v1.cache import cache, serve_cached, store_response
 from api.v1.views import app_views
 from os import getenv
 
 from werkzeug.exceptions import HTTPException
 
 
+class HBNBJSONProvider(JSONProvider):
+    """JSON provider encoding with the backend picked by models.serializer
+    Model instances are encoded as their memoized to_json()."""
+    sort_keys = True
+
+    @staticmethod
+    def default(obj):
+        """Encode the types the JSON backends do not support."""
+        if isinstance(obj, BaseModel):
+            return obj.to_dict()
+        return DefaultJSONProvider.default(obj)
+
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string."""
+        return serializer.dumps(obj, sort_keys=self.sort_keys,
+                                default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize the JSON string or bytes s."""
+        return serializer.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the arguments to a JSON response without going
+        through an intermediate str."""
+        obj = self._prepare_response_obj(args, kwargs)
+        if isinstance(obj, BaseModel):
+            body = obj.to_json()
+        elif (isinstance(obj, list) and obj and
+              all(isinstance(o, BaseModel) for o in obj)):
+            body = b"[" + b",".join(o.to_json() for o in obj) + b"]"
+        else:
+            body = serializer.dumps(obj, sort_keys=self.sort_keys,
+                                    default=self.default)
+        return self._app.response_class(body + b"\n",
+                                        mimetype="application/json")
+
+
 app = Flask(__name__)
+app.json = HBNBJSONProvider(app)
 app.url_map.strict_slashes = False
 CORS(app, resources={r"/*": {"origins": "0.0.0.0"}})
 
+app_views.before_request(serve_cached)
+app_views.after_request(store_response)
 app.register_blueprint(app_views)
+storage.subscribe(cache.invalidate)
+
+
+@app.before_request
+def begin_unit_of_work():
+    """Run the request in a unit of work, so that the objects it saves
+    are written to the storage once, at its end."""
+    storage.begin()
+
+
+@app.after_request
+def commit_unit_of_work(response):
+    """Write the changes of a successful request before responding, a
+    failed write turning into a 500 error, and drop those of a request
+    answered with an error."""
+    if response.status_code < 400:
+        storage.commit()
+    else:
+        storage.rollback()
+    return response
 
 
 @app.teardown_appcontext
-def close_storage(_):
-    """Close the storage session."""
+def close_storage(exception):
+    """Roll back the unit of work of a request that raised, then close
+    the storage session."""
+    storage.rollback()
     storage.close()
 
 
@@ -30,6 +95,12 @@ def not_found(_):
     return make_response(jsonify(error="Not found"), 404)
 
 
+@app.errorhandler(400)
+def bad_request(error):
+    """Handle the 400 bad request error, like api.v1.asgi."""
+    return make_response(jsonify(error=error.description), 400)
+
+
 # @app.errorhandler(Exception)
 # def error_handler(err):
 #     """Handle all kinds of errors."""
@@ -0,0 +1,360 @@
+#!/usr/bin/python3
+"""
+ASGI variant of the REST API
+
+Serves the /api/v1 routes of api.v1.app to an ASGI server, like
+    uvicorn api.v1.asgi:app
+Each route is a coroutine awaiting the AsyncStorage of
+models.engine.async_storage: in DB mode a request waits on the database
+without holding a thread, in file mode the storage calls run in its
+worker thread. The responses are the ones of the Flask app, the errors
+being JSON objects {"error": <description>}: the pages, places_search
+and the batches go through the functions of api.v1.pagination and of
+the Flask views.
+"""
+from api.v1.pagination import page_args, page
+from api.v1.views.batch import apply_batch, frozen, parents, required
+from api.v1.views.batch import resources
+from api.v1.views.places import search_places
+from models import serializer, storage_t
+from models.amenity import Amenity
+from models.base_model import BaseModel
+from models.city import City
+from models.engine.async_storage import async_storage
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import re
+from urllib.parse import parse_qsl
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import HTTPException, abort
+
+# resources listed and created under an object of another class:
+# <resource>: (parent class, parent resource, foreign key)
+nested = {"cities": (State, "states", "state_id"),
+          "places": (City, "cities", "city_id"),
+          "reviews": (Place, "places", "place_id")}
+
+
+class Request:
+    """The parts of an HTTP request read by the views"""
+
+    def __init__(self, method, url, path, query, body):
+        """Instantiate a Request of the url, its path being relative to
+        /api/v1, None if outside of it, and query its query string"""
+        self.method = method
+        self.url = url
+        self.path = path
+        self.args = MultiDict(parse_qsl(query, keep_blank_values=True))
+        self.body = body
+
+    def get_json(self):
+        """Return the decoded JSON body, None if it is not JSON."""
+        try:
+            return serializer.loads(self.body) if self.body else None
+        except ValueError:
+            return None
+
+
+def encode(obj):
+    """Return obj encoded as JSON like the Flask app, model instances
+    being encoded as their memoized to_json()."""
+    if isinstance(obj, BaseModel):
+        return obj.to_json()
+    if (isinstance(obj, list) and obj and
+            all(isinstance(o, BaseModel) for o in obj)):
+        return b"[" + b",".join(o.to_json() for o in obj) + b"]"
+    return serializer.dumps(obj, sort_keys=True, default=lambda o: o.to_dict())
+
+
+def paginate(storage, request, cls, attr=None, value=None):
+    """Return the response of the requested page of the cls objects whose
+    attr is value, like api.v1.pagination.paginate()."""
+    limit, after = page_args(request.args)
+    return page_response(request, storage.page(
+        cls, None if limit is None else limit + 1, after, attr, value), limit)
+
+
+def page_response(request, objs, limit):
+    """Return the response of the first limit objects of objs, like
+    api.v1.pagination.page_response()."""
+    objs, link = page(objs, limit, request.args,
+                      request.url.split('?', 1)[0])
+    return 200, encode(objs), [] if link is None else [('link', link)]
+
+
+def found(storage, cls, id, load=None):
+    """Return the cls object of id, aborting with a 404 error if none."""
+    obj = storage.get(cls, id, load)
+    if obj is None:
+        abort(404)
+    return obj
+
+
+def json_body(request):
+    """Return the JSON object of the request body, aborting with a 400
+    error if there is none."""
+    attrs = request.get_json()
+    if type(attrs) is not dict:
+        abort(400, 'Not a JSON')
+    return attrs
+
+
+def list_view(resource):
+    """Return the view listing the objects of resource, under their
+    parent if nested."""
+    cls = resources[resource]
+    if resource not in nested:
+        return lambda storage, request: paginate(storage, request, cls)
+    parent, _, attr = nested[resource]
+
+    def view(storage, request, id):
+        """List the objects of the parent of id."""
+        found(storage, parent, id)
+        return paginate(storage, request, cls, attr, id)
+    return view
+
+
+def get_view(resource):
+    """Return the view of an object of resource."""
+    cls = resources[resource]
+    return lambda storage, request, id: (200, encode(found(storage, cls, id)),
+                                         [])
+
+
+def delete_view(resource):
+    """Return the view deleting an object of resource."""
+    cls = resources[resource]
+
+    def view(storage, request, id):
+        """Delete the object of id."""
+        storage.bulk_delete([found(storage, cls, id)])
+        return 200, encode({}), []
+    return view
+
+
+def create_view(resource):
+    """Return the view creating an object of resource, under its parent
+    if nested."""
+    cls = resources[resource]
+    parent, _, attr = nested.get(resource, (None, None, None))
+
+    def view(storage, request, id=None):
+        """Create an object from the JSON body."""
+        if parent is not None:
+            found(storage, parent, id)
+        attrs = json_body(request)
+        for field in sorted(required[cls], key=lambda f: f not in parents):
+            if field == attr:
+                continue
+            if field not in attrs:
+                abort(400, 'Missing {}'.format(field))
+            if field in parents:
+                found(storage, parents[field], attrs[field])
+        if parent is not None:
+            attrs[attr] = id
+        obj = cls(**attrs)
+        storage.bulk_new([obj])
+        return 201, encode(obj), []
+    return view
+
+
+def update_view(resource):
+    """Return the view updating an object of resource."""
+    cls = resources[resource]
+    ignored = {'id', 'updated_at', 'created_at'}.union(frozen[cls])
+
+    def view(storage, request, id):
+        """Update the object of id from the JSON body."""
+        obj = found(storage, cls, id)
+        attrs = json_body(request)
+        storage.bulk_update([(obj, {key: value for key, value in
+                                    attrs.items() if key not in ignored})])
+        return 200, encode(obj), []
+    return view
+
+
+def batch_view(resource):
+    """Return the batch view of resource."""
+    cls = resources[resource]
+    return lambda storage, request: (200, encode(apply_batch(
+        storage, cls, json_body(request))), [])
+
+
+def place_amenities(storage, request, id):
+    """List the amenities of a place."""
+    place = found(storage, Place, id, load=["amenities"])
+    return 200, encode(list(place.amenities)), []
+
+
+def unlink_amenity(storage, request, id, amenity_id):
+    """Delete an amenity of a place."""
+    place = found(storage, Place, id)
+    amenity = found(storage, Amenity, amenity_id)
+    if amenity not in place.amenities:
+        abort(404)
+    storage.bulk_delete([amenity])
+    return 200, encode({}), []
+
+
+def link_amenity(storage, request, id, amenity_id):
+    """Link an amenity to a place."""
+    place = found(storage, Place, id)
+    amenity = found(storage, Amenity, amenity_id)
+    if amenity in place.amenities:
+        return 200, encode(amenity), []
+    if storage_t == 'db':
+        place.amenities.append(amenity)
+    else:
+        place.amenities = amenity
+    storage.bulk_update([(place, {})])
+    return 201, encode(amenity), []
+
+
+def places_search(storage, request):
+    """Search for places like api.v1.views.places."""
+    places, limit = search_places(storage, json_body(request), request.args)
+    return page_response(request, places, limit)
+
+
+async def status(app, request):
+    """Return the status of the web server."""
+    return 200, encode({"status": "OK"}), []
+
+
+async def stats(app, request):
+    """Return the number of each objects by type."""
+    counts = await app.storage.counts()
+    names = {"amenities": Amenity, "cities": City, "places": Place,
+             "reviews": Review, "states": State, "users": User}
+    return 200, encode({name: counts[cls.__name__]
+                        for name, cls in names.items()}), []
+
+
+def offload(view):
+    """Return the coroutine running view on the storage of the app, in a
+    unit of work so that its changes are written at once."""
+    def atomic(storage, request, **params):
+        """Run the view in a unit of work."""
+        with storage.unit_of_work():
+            return view(storage, request, **params)
+
+    async def handler(app, request, **params):
+        """Run the view through the AsyncStorage."""
+        return await app.storage.run(atomic, request, **params)
+    return handler
+
+
+def routes():
+    """Return the list of the (method, path regex, handler) routes."""
+    table = [('GET', '/status', status), ('GET', '/stats', stats),
+             ('POST', '/places_search', offload(places_search)),
+             ('GET', '/places/<id>/amenities', offload(place_amenities)),
+             ('DELETE', '/places/<id>/amenities/<amenity_id>',
+              offload(unlink_amenity)),
+             ('POST', '/places/<id>/amenities/<amenity_id>',
+              offload(link_amenity))]
+    for resource in resources:
+        parent = nested.get(resource, (None, resource))[1]
+        collection = resource if resource not in nested else \
+            '{}/<id>/{}'.format(parent, resource)
+        table += [('GET', '/' + collection, offload(list_view(resource))),
+                  ('POST', '/' + collection, offload(create_view(resource))),
+                  ('POST', '/{}/batch'.format(resource),
+                   offload(batch_view(resource))),
+                  ('GET', '/{}/<id>'.format(resource),
+                   offload(get_view(resource))),
+                  ('PUT', '/{}/<id>'.format(resource),
+                   offload(update_view(resource))),
+                  ('DELETE', '/{}/<id>'.format(resource),
+                   offload(delete_view(resource)))]
+    return [(method, re.compile(re.sub(r'<(\w+)>', r'(?P<\1>[^/]+)', path) +
+                                '/?$'), handler)
+            for method, path, handler in table]
+
+
+class App:
+    """ASGI application serving the /api/v1 routes"""
+    prefix = '/api/v1'
+
+    def __init__(self, storage=None):
+        """Instantiate an App on storage, the AsyncStorage of
+        models.storage if None, created when the server starts"""
+        self.storage = storage
+        self.routes = routes()
+
+    async def __call__(self, scope, receive, send):
+        """Serve the ASGI connection of scope."""
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        """Load the storage on startup and close it on shutdown."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await self.startup()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.storage is not None:
+                    await self.storage.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def startup(self):
+        """Create and load the storage if needed."""
+        if self.storage is None:
+            self.storage = async_storage()
+            await self.storage.reload()
+
+    async def http(self, scope, receive, send):
+        """Answer the HTTP request of scope."""
+        body, more = b'', True
+        while more:
+            message = await receive()
+            body += message.get('body', b'')
+            more = message.get('more_body', False)
+        headers = dict(scope.get('headers', ()))
+        query = scope.get('query_string', b'').decode('latin-1')
+        url = '{}://{}{}{}'.format(
+            scope.get('scheme', 'http'),
+            headers.get(b'host', b'localhost').decode('latin-1'),
+            scope['path'], '?' + query if query else '')
+        path = scope['path']
+        request = Request(scope['method'], url, path[len(self.prefix):]
+                          if path.startswith(self.prefix) else None,
+                          query, body)
+        status, body, headers = await self.dispatch(request)
+        headers = [(b'content-type', b'application/json')] + [
+            (name.encode('latin-1'), value.encode('latin-1'))
+            for name, value in headers]
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': headers})
+        await send({'type': 'http.response.body', 'body': body + b'\n'})
+
+    async def dispatch(self, request):
+        """Return the (status, body, headers) response of the request."""
+        await self.startup()
+        allowed = False
+        try:
+            if request.path is None:
+                abort(404)
+            for method, pattern, handler in self.routes:
+                match = pattern.match(request.path)
+                if match is None:
+                    continue
+                if method != request.method:
+                    allowed = True
+                    continue
+                return await handler(self, request, **match.groupdict())
+            abort(405 if allowed else 404)
+        except HTTPException as error:
+            description = 'Not found' if error.code == 404 else \
+                error.description
+            return error.code, encode({"error": description}), []
+
+
+app = App()
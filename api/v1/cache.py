@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""
+Response cache of the GET endpoints
+
+The responses are kept by URL for HBNB_API_CACHE_TTL seconds (60 by
+default), the HBNB_API_CACHE_SIZE (1024 by default, 0 disables the cache)
+most recently used ones only. Each one is tagged with the classes and the
+objects its URL reads, and dropped as soon as the storage is given one
+of those objects through new() or delete(). Every cached response has an
+ETag, a request whose If-None-Match matches it being answered with 304.
+
+The file storage applies the changes other processes saved before a
+response is served from the cache, notifying the writes it applies, so
+that the workers of api.v1.server drop the responses another one made
+stale. DBStorage cannot tell what other processes wrote: when several
+workers share a database the responses are only kept
+HBNB_API_CACHE_SHARED_TTL seconds (1 by default), see share().
+"""
+from api.v1.views import app_views
+from collections import OrderedDict
+from flask import current_app, g, request
+import hashlib
+from models import storage, storage_t
+from os import getenv
+import threading
+import time
+
+# class name of the objects of each resource of the URLs
+resources = {"amenities": "Amenity", "cities": "City", "places": "Place",
+             "reviews": "Review", "states": "State", "users": "User"}
+# endpoints never cached
+uncached = {"/status"}
+
+
+class ResponseCache:
+    """LRU cache of the bodies of the responses by URL, with a TTL and
+    invalidated by tags: class names and (class name, id) pairs"""
+
+    def __init__(self, size=1024, ttl=60):
+        """Instantiate a ResponseCache of size entries kept ttl seconds"""
+        self.size = size
+        self.ttl = ttl
+        # incremented by every invalidation
+        self.version = 0
+        self.__entries = OrderedDict()
+        self.__tagged = {}
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """return the (body, status, headers, etag) entry of key, or None
+        if it is missing or expired"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self.__drop(key)
+                return None
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value, tags, version=None):
+        """store the value entry of key until one of tags is invalidated,
+        evicting the least recently used entry if the cache is full
+        Nothing is stored if the cache was invalidated since the version
+        given, the value possibly predating the invalidation."""
+        if self.size <= 0:
+            return
+        with self.__lock:
+            if version is not None and version != self.version:
+                return
+            self.__drop(key)
+            self.__entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self.__tagged.setdefault(tag, set()).add(key)
+            while len(self.__entries) > self.size:
+                self.__drop(next(iter(self.__entries)))
+
+    def invalidate(self, name, id):
+        """drop the entries tagged with the class name or the object of
+        that class and id"""
+        with self.__lock:
+            self.version += 1
+            for tag in (name, (name, id)):
+                for key in list(self.__tagged.get(tag, ())):
+                    self.__drop(key)
+
+    def clear(self):
+        """drop every entry"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__tagged.clear()
+
+    def __len__(self):
+        """return the number of entries"""
+        return len(self.__entries)
+
+    def __drop(self, key):
+        """remove key and its tags, the lock being held"""
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self.__tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__tagged[tag]
+
+
+cache = ResponseCache(int(getenv("HBNB_API_CACHE_SIZE") or 1024),
+                      float(getenv("HBNB_API_CACHE_TTL") or 60))
+# seconds the responses are kept when processes share the database
+shared_ttl = float(getenv("HBNB_API_CACHE_SHARED_TTL") or 1)
+
+
+def share(workers):
+    """Prepare the cache of the app served by workers processes: with
+    DBStorage, whose writes are only notified in the process making
+    them, the responses are kept shared_ttl seconds at most."""
+    if workers > 1 and storage_t == "db":
+        cache.ttl = min(cache.ttl, shared_ttl)
+
+
+def tags(path):
+    """Return the tags of the objects read by the endpoint at path,
+    relative to the blueprint: /<resource> depends on every object of
+    its class, /<resource>/<id> on that object, and
+    /<resource>/<id>/<resource> on both. Any other endpoint, like
+    /stats, depends on every class."""
+    parts = path.strip("/").split("/")
+    if parts[0] not in resources or len(parts) > 3:
+        return frozenset(resources.values())
+    tags = {resources[parts[0]]} if len(parts) == 1 else set()
+    if len(parts) > 1:
+        tags.add((resources[parts[0]], parts[1]))
+    if len(parts) == 3:
+        tags.add(resources.get(parts[2], parts[2]))
+    return frozenset(tags)
+
+
+def endpoint_path():
+    """Return the path of the request relative to the blueprint."""
+    return request.path[len(app_views.url_prefix):] or "/"
+
+
+def serve_cached():
+    """Answer a GET request from the cache if possible, with a 304
+    response when the client has the cached version already."""
+    if request.method != 'GET' or endpoint_path() in uncached:
+        return None
+    if storage_t != "db":
+        storage.reload()
+    g.cache_version = cache.version
+    entry = cache.get(request.url)
+    if entry is None:
+        return None
+    body, status, headers, etag = entry
+    response = current_app.response_class(body, status, headers)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def store_response(response):
+    """Keep the successful response of a GET request in the cache, and
+    give it an ETag answering a matching If-None-Match with 304."""
+    if (request.method != 'GET' or response.status_code != 200 or
+            response.direct_passthrough or response.get_etag()[0] or
+            endpoint_path() in uncached):
+        return response
+    body = response.get_data()
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    headers = [(name, value) for name, value in response.headers
+               if name in ('Content-Type', 'Link')]
+    cache.put(request.url, (body, response.status_code, headers, etag),
+              tags(endpoint_path()), g.get('cache_version'))
+    response.set_etag(etag)
+    return response.make_conditional(request)
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+Pagination and field projection of the list endpoints
+
+A page is requested with ?limit=<n>, the following one with the
+?cursor=<token> found in the Link header of the response, and
+?fields=<name>,<name> keeps only those attributes of each object.
+page_args() and page() take the query arguments as a werkzeug MultiDict,
+so that api.v1.asgi pages its responses the same way.
+"""
+import base64
+import binascii
+from flask import abort, jsonify, request
+from models import storage
+from models.base_model import format_time, parse_time
+from urllib.parse import urlencode
+
+
+def encode_cursor(obj):
+    """Return the cursor of the objects created after obj."""
+    created_at = obj.created_at
+    if type(created_at) is not str:
+        created_at = format_time(created_at)
+    token = "{} {}".format(created_at, obj.id).encode()
+    return base64.urlsafe_b64encode(token).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the (created_at datetime, id) pair of the cursor, aborting
+    with a 400 error if it is malformed."""
+    try:
+        token = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = token.decode().split(" ", 1)
+        created_at = parse_time(created_at)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        abort(400, description='Invalid cursor')
+    return created_at, id
+
+
+def page_args(args=None):
+    """Return the limit and the (created_at, id) cursor of the query
+    arguments args, those of the request if None, None when absent,
+    aborting with a 400 error on invalid values."""
+    if args is None:
+        args = request.args
+    limit = args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        abort(400, 'Invalid limit')
+    cursor = args.get('cursor')
+    return limit, None if cursor is None else decode_cursor(cursor)
+
+
+def project(obj, fields):
+    """Return the dictionary of obj restricted to fields."""
+    attrs = obj.to_dict()
+    return {field: attrs[field] for field in fields if field in attrs}
+
+
+def page(objs, limit, args, base_url):
+    """Return the first limit objects of objs, projected on the fields of
+    the query arguments args, and the Link header to the next page of
+    base_url, None if objs holds at most limit objects."""
+    objs = list(objs)
+    link = None
+    if limit is not None and len(objs) > limit:
+        objs = objs[:limit]
+        next_args = args.to_dict()
+        next_args['cursor'] = encode_cursor(objs[-1])
+        link = '<{}?{}>; rel="next"'.format(base_url, urlencode(next_args))
+    fields = args.get('fields')
+    if fields:
+        fields = [field for field in fields.split(',') if field]
+        objs = [project(obj, fields) for obj in objs]
+    return objs, link
+
+
+def page_response(objs, limit):
+    """Return the JSON response of the first limit objects of objs,
+    projected on the requested fields, with a Link header to the next
+    page if objs holds more than limit objects."""
+    objs, link = page(objs, limit, request.args, request.base_url)
+    response = jsonify(objs)
+    if link is not None:
+        response.headers['Link'] = link
+    return response
+
+
+def paginate(cls, attr=None, value=None):
+    """Return the requested page of the cls objects, only those whose
+    attribute attr equals value if attr is given."""
+    limit, after = page_args()
+    objs = storage.page(cls, None if limit is None else limit + 1, after,
+                        attr, value)
+    return page_response(objs, limit)
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Production server of the REST API
+
+    python3 -m api.v1.server
+
+listens on HBNB_API_HOST:HBNB_API_PORT (0.0.0.0:5000 by default), loads
+the storage once then forks HBNB_API_WORKERS processes (one per CPU by
+default) accepting the connections of that socket, each one serving the
+app with a thread per request. The objects loaded before the fork are
+shared copy-on-write by the workers, the garbage collector leaving them
+untouched, and the file storage is shared so that the writes of every
+worker go through the write lock of the JSON file one at a time, each
+one keeping the objects the others saved. The response cache of each
+worker follows the writes of the others, see api.v1.cache. A worker
+that dies is replaced; SIGTERM or SIGINT stops them all.
+"""
+from api.v1.app import app
+from api.v1 import cache
+import gc
+from models import storage
+import os
+import signal
+import socket
+import traceback
+from werkzeug.serving import make_server
+
+
+def work(sock, host, port):
+    """Serve the app on the listening socket sock until SIGTERM."""
+    def stop(signum, frame):
+        """Leave the serving loop."""
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def serve(host, port, workers):
+    """Serve the app on host:port with workers forked processes."""
+    sock = socket.create_server((host, port), backlog=1024)
+    if workers <= 1 or not hasattr(os, "fork"):
+        try:
+            work(sock, host, port)
+        finally:
+            sock.close()
+        return
+    storage.share()
+    cache.share(workers)
+    gc.freeze()
+    children = set()
+    stopping = False
+
+    def stop(signum, frame):
+        """Stop the workers and stop replacing them."""
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while True:
+        while not stopping and len(children) < workers:
+            pid = os.fork()
+            if pid == 0:
+                # the parent stops the workers on Ctrl+C
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                code = 0
+                try:
+                    work(sock, host, port)
+                except SystemExit as e:
+                    code = e.code or 0
+                except BaseException:
+                    traceback.print_exc()
+                    code = 1
+                os._exit(code)
+            children.add(pid)
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if stopping and not children:
+            break
+    sock.close()
+
+
+if __name__ == "__main__":
+    serve(os.getenv('HBNB_API_HOST') or '0.0.0.0',
+          int(os.getenv('HBNB_API_PORT') or 5000),
+          int(os.getenv('HBNB_API_WORKERS') or os.cpu_count() or 1))
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """ View module for amenities endpoint """
 
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 from flask import abort, jsonify, make_response, request
 from models import storage
@@ -10,8 +11,7 @@ from models.amenity import Amenity
 @app_views.route('/amenities', methods=['GET'])
 def get_all_amenities():
     """Return a list of all Amenity objects"""
-    amenities = storage.all(Amenity) or {}
-    return jsonify([amenity.to_dict() for amenity in amenities.values()])
+    return paginate(Amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'])
@@ -20,7 +20,7 @@ def get_amenity_by_id(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
-    return jsonify(amenity.to_dict())
+    return jsonify(amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'])
@@ -38,7 +38,7 @@ def delete_amenity_by_id(amenity_id):
 def create_amenity():
     """Create an Amenity object."""
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
     if 'name' not in attrs:
         abort(400, 'Missing name')
@@ -46,7 +46,7 @@ def create_amenity():
     amenity = Amenity(**attrs)
     storage.new(amenity)
     storage.save()
-    return make_response(jsonify(amenity.to_dict()), 201)
+    return make_response(jsonify(amenity), 201)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['PUT'])
@@ -58,7 +58,7 @@ def update_amenity_by_id(amenity_id):
 
     # get attributes from request body
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
 
     for key, value in attrs.items():
@@ -66,5 +66,5 @@ def update_amenity_by_id(amenity_id):
         if key not in {'id', 'updated_at', 'created_at'}:
             setattr(amenity, key, value)
 
-    storage.save()
-    return jsonify(amenity.to_dict())
+    amenity.save()
+    return jsonify(amenity)
@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+View for the batch endpoints
+
+POST /api/v1/<resource>/batch creates, updates and deletes many objects
+of a resource in one request, the changes being written to the storage
+at once by the unit of work of the request.
+"""
+
+from api.v1.views import app_views
+from flask import abort, jsonify, request
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+resources = {"amenities": Amenity, "cities": City, "places": Place,
+             "reviews": Review, "states": State, "users": User}
+# attributes required to create an object of each class
+required = {Amenity: ("name",), City: ("name", "state_id"),
+            Place: ("name", "city_id", "user_id"),
+            Review: ("text", "place_id", "user_id"), State: ("name",),
+            User: ("email", "password")}
+# attributes an update leaves untouched besides the system ones
+frozen = {Amenity: (), City: ("state_id",), Place: ("user_id", "city_id"),
+          Review: ("user_id", "place_id"), State: (), User: ("email",)}
+# class of the object each foreign key refers to
+parents = {"state_id": State, "city_id": City, "place_id": Place,
+           "user_id": User}
+
+
+@app_views.route('/<resource>/batch', methods=['POST'],
+                 strict_slashes=False)
+def batch(resource):
+    """Create, update and delete objects of the resource.
+    The body is {"create": [<attributes>, ...], "update": [<attributes
+    and id>, ...], "delete": [<id>, ...]}. Every entry is checked before
+    any change is made, aborting with a 400 or 404 error like the single
+    object endpoints."""
+    cls = resources.get(resource)
+    if cls is None:
+        abort(404)
+    body = request.get_json(silent=True)
+    if type(body) is not dict:
+        abort(400, 'Not a JSON')
+    return jsonify(apply_batch(storage, cls, body))
+
+
+def apply_batch(storage, cls, body):
+    """Apply the changes of the batch body to the cls objects of storage
+    and return the dictionary of the created and updated objects and of
+    the deleted ids, aborting before any change if an entry is invalid."""
+    entries = {}
+    for change in ('create', 'update', 'delete'):
+        entries[change] = body.get(change) or []
+        if type(entries[change]) is not list:
+            abort(400, 'Not a list')
+
+    for attrs in entries['create'] + entries['update']:
+        if type(attrs) is not dict:
+            abort(400, 'Not a JSON')
+    for attrs in entries['create']:
+        for field in required[cls]:
+            if field not in attrs:
+                abort(400, 'Missing {}'.format(field))
+        for field, parent in parents.items():
+            if field in required[cls] and (
+                    type(attrs[field]) is not str or
+                    not storage.get(parent, attrs[field])):
+                abort(404)
+    ignored = {'id', 'updated_at', 'created_at'}.union(frozen[cls])
+    changes = []
+    for attrs in entries['update']:
+        id = attrs.get('id')
+        obj = storage.get(cls, id) if type(id) is str else None
+        if not obj:
+            abort(404)
+        changes.append((obj, {key: value for key, value in attrs.items()
+                              if key not in ignored}))
+    deleted = []
+    for id in entries['delete']:
+        obj = storage.get(cls, id) if type(id) is str else None
+        if not obj:
+            abort(404)
+        deleted.append(obj)
+
+    created = [cls(**attrs) for attrs in entries['create']]
+    if created:
+        storage.bulk_new(created)
+    if changes:
+        storage.bulk_update(changes)
+    if deleted:
+        storage.bulk_delete(deleted)
+    return {"created": created, "updated": [obj for obj, _ in changes],
+            "deleted": [obj.id for obj in deleted]}
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """ View module for cities endpoint """
 
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 from flask import abort, jsonify, make_response, request
 from models import storage
@@ -15,8 +16,7 @@ def get_cities_by_state_route(state_id):
     if not state:
         abort(404)
 
-    cities = [city.to_dict() for city in state.cities]
-    return jsonify(cities)
+    return paginate(City, 'state_id', state_id)
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'])
@@ -25,7 +25,7 @@ def get_city_by_id(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    return jsonify(city.to_dict())
+    return jsonify(city)
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'])
@@ -47,7 +47,7 @@ def create_city_by_state_id(state_id):
         abort(404)
 
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
 
     attrs['state_id'] = state_id
@@ -59,7 +59,7 @@ def create_city_by_state_id(state_id):
     city = City(**attrs)
     storage.new(city)
     storage.save()
-    return make_response(jsonify(city.to_dict()), 201)
+    return make_response(jsonify(city), 201)
 
 
 @app_views.route('/cities/<city_id>', methods=['PUT'])
@@ -71,7 +71,7 @@ def update_city_by_id(city_id):
 
     # get attributes from request body
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
 
     for key, value in attrs.items():
@@ -79,5 +79,5 @@ def update_city_by_id(city_id):
         if key not in {'id', 'updated_at', 'created_at', 'state_id'}:
             setattr(city, key, value)
 
-    storage.save()
-    return jsonify(city.to_dict())
+    city.save()
+    return jsonify(city)
@@ -3,7 +3,7 @@
 """
 from api.v1.views import app_views
 from flask import jsonify
-from models import storage
+from models import storage, storage_t
 from models.amenity import Amenity
 from models.city import City
 from models.place import Place
@@ -14,18 +14,24 @@ from models.user import User
 
 @app_views.route('/status', methods=['GET'], strict_slashes=False)
 def status():
-    """Return the status of the web server."""
-    return jsonify({"status": "OK"})
+    """Return the status of the web server, and of the connection pool
+    in DB mode."""
+    response = {"status": "OK"}
+    if storage_t == "db":
+        response["pool"] = storage.pool_stats()
+    return jsonify(response)
 
 
 @app_views.route('/stats', methods=['GET'], strict_slashes=False)
 def stats():
-    """Return the number of each objects by type."""
+    """Return the number of each objects by type, from the counters the
+    storage maintains."""
+    counts = storage.counts()
     response = {}
-    response['amenities'] = storage.count(Amenity)
-    response['cities'] = storage.count(City)
-    response['places'] = storage.count(Place)
-    response['reviews'] = storage.count(Review)
-    response['states'] = storage.count(State)
-    response['users'] = storage.count(User)
+    response['amenities'] = counts[Amenity.__name__]
+    response['cities'] = counts[City.__name__]
+    response['places'] = counts[Place.__name__]
+    response['reviews'] = counts[Review.__name__]
+    response['states'] = counts[State.__name__]
+    response['users'] = counts[User.__name__]
     return jsonify(response)
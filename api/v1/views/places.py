@@ -1,14 +1,14 @@
 #!/usr/bin/python3
 """ View module for places endpoint """
 
+from api.v1.pagination import page_args, page_response, paginate
 from api.v1.views import app_views
 from flask import abort, jsonify, make_response, request
 from models import storage
+from models.engine.search import PlaceSearch, parse_geo, parse_ranges
 from models.place import Place
 from models.city import City
 from models.user import User
-from models.state import State
-from models.amenity import Amenity
 
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'])
@@ -18,8 +18,7 @@ def get_places_by_city_id(city_id):
     if city is None:
         abort(404)
 
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    return paginate(Place, 'city_id', city_id)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'])
@@ -28,7 +27,7 @@ def get_place_by_id(place_id):
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    return jsonify(place.to_dict())
+    return jsonify(place)
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'])
@@ -50,7 +49,7 @@ def create_place(city_id):
         abort(404)
 
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
     if 'user_id' not in attrs:
         abort(400, 'Missing user_id')
@@ -66,7 +65,7 @@ def create_place(city_id):
     place = Place(**attrs)
     storage.new(place)
     storage.save()
-    return make_response(jsonify(place.to_dict()), 201)
+    return make_response(jsonify(place), 201)
 
 
 @app_views.route('/places/<place_id>', methods=['PUT'])
@@ -78,7 +77,7 @@ def update_place_by_id(place_id):
 
     # get attributes from request body
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
 
     for key, value in attrs.items():
@@ -86,59 +85,41 @@ def update_place_by_id(place_id):
         if key not in {'id', 'updated_at', 'created_at', 'user_id', 'city_id'}:
             setattr(place, key, value)
 
-    storage.save()
-    return jsonify(place.to_dict())
+    place.save()
+    return jsonify(place)
 
 
 @app_views.route('/places_search', methods=['POST'])
 def places_search():
-    """Search for places."""
-    lists = request.get_json()
-    if lists is None:
+    """Search for places.
+    The results are paginated like the other list endpoints, an offset
+    query parameter can also skip the first results."""
+    lists = request.get_json(silent=True)
+    if type(lists) is not dict:
         abort(400, 'Not a JSON')
+    return page_response(*search_places(storage, lists, request.args))
 
+
+def search_places(storage, lists, args):
+    """Return the places of storage matching the search body lists and
+    the limit of the page requested by the query arguments args,
+    aborting with a 400 error on invalid values."""
+    for name in ('states', 'cities', 'amenities'):
+        if type(lists.get(name) or []) is not list:
+            abort(400, 'Not a list')
     try:
-        states = lists['states']  # list of state ids
-    except Exception:
-        states = []
-    try:
-        cities = lists['cities']  # list of city ids
-    except Exception:
-        cities = []
-    try:
-        amenities = lists['amenities']  # list of amenity ids
-    except Exception:
-        amenities = []
-
-    if len(lists) == 0 or (len(states) == 0 and len(cities) == 0 and
-       len(amenities) == 0):
-        return jsonify([p.to_dict() for p in storage.all(Place).values()])
-
-    cities_to_search = set()
-    for state_id in states:
-        state = storage.get(State, state_id)
-        if state:
-            for city in state.cities:
-                cities_to_search.add(city.id)
-    for city_id in cities:
-        cities_to_search.add(city_id)
-
-    places = []
-    all_places = storage.all(Place).values()
-    for place in all_places:
-        if place.city_id in cities_to_search:
-            places.append(place)
-
-    # if not states and not cities => filter from all places:
-    if not places:
-        places = all_places
-
-    if amenities:
-        for amenity_id in amenities:
-            for place in places:
-                # get the place's amenities_ids
-                place_amenities_ids = [a.id for a in place.amenities]
-                if amenity_id not in place_amenities_ids:
-                    places.remove(place)
-
-    return jsonify([p.to_dict() for p in places])
+        ranges = parse_ranges(lists)
+        near, bbox = parse_geo(lists)
+    except ValueError as e:
+        abort(400, 'Invalid {}'.format(e))
+
+    limit, after = page_args(args)
+    offset = args.get('offset', 0, type=int)
+    if offset < 0:
+        abort(400, 'Invalid offset')
+    places = PlaceSearch(storage).search(
+        states=lists.get('states') or [], cities=lists.get('cities') or [],
+        amenities=lists.get('amenities') or [], offset=offset, after=after,
+        limit=None if limit is None else limit + 1, ranges=ranges,
+        near=near, bbox=bbox)
+    return places, limit
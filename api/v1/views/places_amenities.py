@@ -3,7 +3,7 @@
 
 from api.v1.views import app_views
 from flask import abort, jsonify, make_response
-from models import storage
+from models import storage, storage_t
 from models.place import Place
 from models.amenity import Amenity
 
@@ -11,12 +11,11 @@ from models.amenity import Amenity
 @app_views.route('/places/<place_id>/amenities', methods=['GET'])
 def get_amenities_by_place_id(place_id):
     """Return the list of all Amenity objects of a Place by place_id"""
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load=["amenities"])
     if place is None:
         abort(404)
 
-    amenities = [amenity.to_dict() for amenity in place.amenities]
-    return jsonify(amenities)
+    return jsonify(list(place.amenities))
 
 
 @app_views.route('/places/<place_id>/amenities/<amenity_id>',
@@ -51,8 +50,11 @@ def link_amenity_to_place(place_id, amenity_id):
         abort(404)
 
     if amenity in place.amenities:
-        return jsonify(amenity.to_dict())
-
-    place.amenities.append(amenity)
-    storage.save()
-    return make_response(jsonify(amenity.to_dict()), 201)
+        return jsonify(amenity)
+
+    if storage_t == 'db':
+        place.amenities.append(amenity)
+    else:
+        place.amenities = amenity
+    place.save()
+    return make_response(jsonify(amenity), 201)
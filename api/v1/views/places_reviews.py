@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """ View module for the link between places and reviews actions """
 
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 from flask import abort, jsonify, make_response, request
 from models import storage
@@ -16,8 +17,7 @@ def get_reviews_by_place_id(place_id):
     if place is None:
         abort(404)
 
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    return paginate(Review, 'place_id', place_id)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'])
@@ -26,7 +26,7 @@ def get_review_by_id(review_id):
     review = storage.get(Review, review_id)
     if review is None:
         abort(404)
-    return jsonify(review.to_dict())
+    return jsonify(review)
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'])
@@ -48,7 +48,7 @@ def create_review(place_id):
         abort(404)
 
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
     if 'user_id' not in attrs:
         abort(400, 'Missing user_id')
@@ -64,7 +64,7 @@ def create_review(place_id):
     review = Review(**attrs)
     storage.new(review)
     storage.save()
-    return make_response(jsonify(review.to_dict()), 201)
+    return make_response(jsonify(review), 201)
 
 
 @app_views.route('/reviews/<review_id>', methods=['PUT'])
@@ -76,7 +76,7 @@ def update_review_by_id(review_id):
 
     # get attributes from request body
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
 
     for key, value in attrs.items():
@@ -85,5 +85,5 @@ def update_review_by_id(review_id):
                        'place_id'}:
             setattr(review, key, value)
 
-    storage.save()
-    return jsonify(review.to_dict())
+    review.save()
+    return jsonify(review)
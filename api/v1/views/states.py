@@ -3,6 +3,7 @@
 view for State objects
 """
 
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 from models.state import State
 from models import storage
@@ -12,10 +13,7 @@ from flask import jsonify, abort, request, make_response
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
 def get_states():
     """Return the list of all State objects."""
-    all_states = []
-    for state in storage.all(State).values():
-        all_states.append(state.to_dict())
-    return jsonify(all_states)
+    return paginate(State)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -24,7 +22,7 @@ def get_state(state_id):
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    return jsonify(state.to_dict())
+    return jsonify(state)
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'])
@@ -42,14 +40,14 @@ def delete_state(state_id):
 def post_state():
     """Create a State."""
     new_state = request.get_json(silent=True)
-    if new_state is None:
+    if type(new_state) is not dict:
         abort(400, 'Not a JSON')
     if 'name' not in new_state.keys():
         abort(400, 'Missing name')
     new_state_ins = State(**new_state)
     storage.new(new_state_ins)
     storage.save()
-    return make_response(jsonify(new_state_ins.to_dict()), 201)
+    return make_response(jsonify(new_state_ins), 201)
 
 
 @app_views.route('/states/<state_id>', methods=['PUT'])
@@ -61,7 +59,7 @@ def update_state_by_id(state_id):
 
     # get attributes from request body
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
 
     for key, value in attrs.items():
@@ -69,5 +67,5 @@ def update_state_by_id(state_id):
         if key not in {'id', 'updated_at', 'created_at'}:
             setattr(state, key, value)
 
-    storage.save()
-    return jsonify(state.to_dict())
+    state.save()
+    return jsonify(state)
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """ View module for users endpoint """
 
+from api.v1.pagination import paginate
 from api.v1.views import app_views
 from flask import abort, jsonify, make_response, request
 from models import storage
@@ -10,8 +11,7 @@ from models.user import User
 @app_views.route('/users', methods=['GET'])
 def get_all_users():
     """Return a list of all User objects"""
-    users = storage.all(User) or {}
-    return jsonify([user.to_dict() for user in users.values()])
+    return paginate(User)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'])
@@ -20,7 +20,7 @@ def get_user_by_id(user_id):
     user = storage.get(User, user_id)
     if not user:
         abort(404)
-    return jsonify(user.to_dict())
+    return jsonify(user)
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'])
@@ -38,7 +38,7 @@ def delete_user_by_id(user_id):
 def create_user():
     """Create an User object."""
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
 
     for field in {'email', 'password'}:
@@ -48,7 +48,7 @@ def create_user():
     user = User(**attrs)
     storage.new(user)
     storage.save()
-    return make_response(jsonify(user.to_dict()), 201)
+    return make_response(jsonify(user), 201)
 
 
 @app_views.route('/users/<user_id>', methods=['PUT'])
@@ -60,7 +60,7 @@ def update_user_by_id(user_id):
 
     # get attributes from request body
     attrs = request.get_json(silent=True)
-    if attrs is None:
+    if type(attrs) is not dict:
         abort(400, 'Not a JSON')
 
     for key, value in attrs.items():
@@ -68,5 +68,5 @@ def update_user_by_id(user_id):
         if key not in {'id', 'updated_at', 'created_at', 'email'}:
             setattr(user, key, value)
 
-    storage.save()
-    return jsonify(user.to_dict())
+    user.save()
+    return jsonify(user)
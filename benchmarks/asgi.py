@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Load benchmark of the Flask app against its ASGI variant: requests per
+second on a mix of list, object, stats and search requests sent by
+concurrent clients, in process so that no server or network is timed.
+The Flask response cache is disabled, the ASGI app having none.
+FileStorage works on a temporary JSON file; with DBStorage the database
+of HBNB_DB_URL, which must be set, is filled.
+
+usage: python3 -m benchmarks.asgi [number of requests] [concurrency]
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import models
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import sys
+import tempfile
+import time
+
+
+def populate(n):
+    """fill the storage with n places spread over 10 cities and return
+    the requests of the mix, as (method, path, query, body) tuples"""
+    user = User(email="bench@hbnb.io", password="bench")
+    state = State(name="Bench")
+    cities = [City(name="City {}".format(i), state_id=state.id)
+              for i in range(10)]
+    places = [Place(name="Place {}".format(i), user_id=user.id,
+                    city_id=cities[i % 10].id) for i in range(n)]
+    models.storage.bulk_new([user, state] + cities + places)
+    return [("GET", "/api/v1/states", "limit=20", None),
+            ("GET", "/api/v1/places/" + places[0].id, "", None),
+            ("GET", "/api/v1/stats", "", None),
+            ("GET", "/api/v1/cities/{}/places".format(cities[0].id),
+             "limit=20", None),
+            ("POST", "/api/v1/places_search", "limit=20",
+             {"cities": [cities[1].id]})]
+
+
+def run_flask(mix, total, concurrency):
+    """return the requests per second of the Flask app served by
+    concurrency threads"""
+    from api.v1.app import app
+    from api.v1.cache import cache
+
+    cache.size = 0
+    client = app.test_client()
+
+    def request(i):
+        """send the i-th request of the mix"""
+        method, path, query, body = mix[i % len(mix)]
+        response = client.open(path, method=method, query_string=query,
+                               json=body)
+        assert response.status_code == 200, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(request, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def run_asgi(mix, total, concurrency):
+    """return the requests per second of the ASGI app with concurrency
+    requests in flight"""
+    from api.v1.asgi import App
+
+    async def request(app, i, slots):
+        """send the i-th request of the mix"""
+        method, path, query, body = mix[i % len(mix)]
+        messages = [{"type": "http.request", "more_body": False,
+                     "body": b"" if body is None else json.dumps(body)
+                     .encode()}]
+        sent = []
+
+        async def receive():
+            """return the request body"""
+            return messages.pop(0)
+
+        async def send(message):
+            """keep the response messages"""
+            sent.append(message)
+
+        async with slots:
+            await app({"type": "http", "method": method, "path": path,
+                       "query_string": query.encode(),
+                       "headers": [(b"host", b"localhost")]}, receive, send)
+        assert sent[0]["status"] == 200, sent[0]["status"]
+
+    async def main():
+        """send every request and return the time it took"""
+        app = App()
+        await app.startup()
+        slots = asyncio.Semaphore(concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(*(request(app, i, slots)
+                               for i in range(total)))
+        elapsed = time.perf_counter() - start
+        await app.storage.close()
+        return elapsed
+
+    return total / asyncio.run(main())
+
+
+def main(total, concurrency):
+    """print the requests per second of both apps"""
+    if models.storage_t == "db":
+        if not os.getenv("HBNB_DB_URL"):
+            sys.exit("set HBNB_DB_URL to the database to fill")
+        bench(total, concurrency)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__journal_path = path + ".log"
+        FileStorage._FileStorage__lock_path = path + ".lock"
+        FileStorage._FileStorage__objects = {}
+        bench(total, concurrency)
+
+
+def bench(total, concurrency):
+    """fill the storage then time both apps"""
+    mix = populate(1000)
+    print("{} requests, {} concurrent, {} storage".format(
+        total, concurrency, models.storage_t or "file"))
+    for name, run in (("flask", run_flask), ("asgi", run_asgi)):
+        print("{:6} {:>10.0f} req/s".format(name, run(mix, total,
+                                                      concurrency)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 16)
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Benchmark of DBStorage on the ORM models, their relationships and the
+place_amenity table, run against the database of HBNB_DB_URL
+
+usage: HBNB_TYPE_STORAGE=db HBNB_DB_URL=sqlite:////tmp/hbnb.db \\
+       python3 -m benchmarks.db [number of places] [number of threads]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.search import PlaceSearch
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import random
+import sys
+import time
+
+
+def populate(n):
+    """fill the storage with n places spread over 10 states of 10 cities,
+    each having 3 of 20 amenities and a review, in a single commit"""
+    storage = models.storage
+    user = User(email="bench@hbnb.io", password="bench")
+    storage.new(user)
+    amenities = [Amenity(name="Amenity {}".format(i)) for i in range(20)]
+    states = [State(name="State {}".format(i)) for i in range(10)]
+    cities = [City(name="City {}".format(i), state_id=states[i % 10].id)
+              for i in range(100)]
+    for obj in amenities + states + cities:
+        storage.new(obj)
+    places = []
+    for i in range(n):
+        place = Place(name="Place {}".format(i), user_id=user.id,
+                      city_id=cities[i % 100].id, number_rooms=i % 5,
+                      price_by_night=i % 300)
+        place.amenities.extend(amenities[j % 20] for j in range(i, i + 3))
+        storage.new(place)
+        storage.new(Review(text="Nice", place_id=place.id, user_id=user.id))
+        places.append(place)
+    storage.save()
+    return states, amenities, [place.id for place in places]
+
+
+def timed(label, func, *args):
+    """run func(*args), print how long it took and return its result"""
+    start = time.perf_counter()
+    result = func(*args)
+    print("{:36} {:>9.3f}s".format(label, time.perf_counter() - start))
+    return result
+
+
+def read(ids):
+    """get the places of ids with their amenities in a thread's session"""
+    for id in ids:
+        models.storage.get(Place, id, load=["amenities"]).amenities
+    models.storage.close()
+    return len(ids)
+
+
+def pages(limit=100):
+    """yield the pages of places of up to limit places"""
+    after = None
+    while True:
+        page = models.storage.page(Place, limit, after)
+        if not page:
+            return
+        yield page
+        after = (page[-1].created_at, page[-1].id)
+
+
+def main(n, threads):
+    """time the writes, the reads and concurrent gets of n places"""
+    if models.storage_t != "db":
+        sys.exit("set HBNB_TYPE_STORAGE=db and HBNB_DB_URL")
+    storage = models.storage
+    print("{}, {} places".format(storage.url(), n))
+    states, amenities, ids = timed("populate + save()", populate, n)
+    storage.close()
+    timed("count() of each class", lambda: [storage.count(cls) for cls in
+                                            (State, City, Place, Review)])
+    timed("all(Place)", storage.all, Place)
+    storage.close()
+    timed("all(State, cities.places)", storage.all, State,
+          ["cities.places"])
+    storage.close()
+    timed("page() of every place", lambda: sum(1 for _ in pages()))
+    search = PlaceSearch()
+    timed("places_search 3 states 2 amenities", search.search,
+          [state.id for state in states[:3]],
+          [], [amenity.id for amenity in amenities[:2]])
+    storage.close()
+    sample = random.sample(ids, min(len(ids), 2000))
+    timed("get() x{}".format(len(sample)), read, sample)
+    chunks = [sample[i::threads] for i in range(threads)]
+    with ThreadPoolExecutor(threads) as executor:
+        timed("get() x{} on {} threads".format(len(sample), threads),
+              lambda: sum(executor.map(read, chunks)))
+    print(storage.pool_stats())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 8)
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Benchmark of the PlaceGrid of the near and bbox filters of places_search
+on synthetic places, most of them around 200 city centers, compared with
+checking the coordinates of every place
+
+usage: python3 -m benchmarks.geo [number of places] [cell degrees]
+"""
+from models.engine import geo
+import random
+import sys
+import time
+import uuid
+
+
+def populate(n, centers):
+    """return the dictionary id: (lat, lng) of n places, 9 of 10 of them
+    within a few kilometers of a center"""
+    rand = random.Random(0)
+    points = {}
+    for i in range(n):
+        if i % 10:
+            lat, lng = rand.choice(centers)
+            lat, lng = rand.gauss(lat, 0.1), rand.gauss(lng, 0.1)
+        else:
+            lat, lng = rand.uniform(-60, 70), rand.uniform(-180, 180)
+        points[str(uuid.UUID(int=rand.getrandbits(128)))] = (lat, lng)
+    return points
+
+
+def timed(label, func, *args):
+    """run func(*args), print how long it took and return its result"""
+    start = time.perf_counter()
+    result = func(*args)
+    print("{:36} {:>9.3f}s".format(label, time.perf_counter() - start))
+    return result
+
+
+def build(points, cell):
+    """return the grid of cell degrees of points"""
+    grid = geo.PlaceGrid(cell=cell)
+    for obj_id, (lat, lng) in points.items():
+        grid.put(obj_id, lat, lng)
+    return grid
+
+
+def sorted_near(grid, near):
+    """return the ids of the places near, closest first, like
+    places_search"""
+    return [obj_id for _, obj_id in sorted(
+        (geo.distance(near["lat"], near["lng"], *point), obj_id)
+        for obj_id, point in grid.select(near).items())]
+
+
+def scan(points, near=None, bbox=None):
+    """return the ids of the points matching the filters, checking each
+    of them"""
+    return {obj_id for obj_id, (lat, lng) in points.items()
+            if geo.within(lat, lng, near, bbox)}
+
+
+def grid_points(grid):
+    """return the dictionary id: (lat, lng) of the places of grid"""
+    return {obj_id: point for cell in grid.cells.values()
+            for obj_id, point in cell.items()}
+
+
+def queries(grid, filters):
+    """run the select() of every filters, return the number of places
+    found per query"""
+    found = 0
+    for near, bbox in filters:
+        found += len(grid.select(near, bbox))
+    return found / len(filters)
+
+
+def main(n, cell):
+    """time building the grid of n places and querying it"""
+    rand = random.Random(1)
+    centers = [(rand.uniform(-50, 60), rand.uniform(-150, 150))
+               for i in range(200)]
+    points = timed("generate {} places".format(n), populate, n, centers)
+    grid = timed("build grid of {} degree cells".format(cell), build,
+                 points, cell)
+    print("{} cells".format(len(grid.cells)))
+    for radius in (1, 5, 25, 100):
+        filters = [({"lat": lat + rand.gauss(0, 0.05),
+                     "lng": lng + rand.gauss(0, 0.05),
+                     "radius_km": radius}, None)
+                   for lat, lng in rand.choices(centers, k=200)]
+        found = timed("near {} km x200".format(radius), queries, grid,
+                      filters)
+        print("  {:.1f} places per query".format(found))
+    filters = [(None, {"min_lat": lat - 0.05, "min_lng": lng - 0.05,
+                       "max_lat": lat + 0.05, "max_lng": lng + 0.05})
+               for lat, lng in rand.choices(centers, k=200)]
+    found = timed("bbox 0.1 x 0.1 degrees x200", queries, grid, filters)
+    print("  {:.1f} places per query".format(found))
+    near = {"lat": centers[0][0], "lng": centers[0][1], "radius_km": 5}
+    timed("near 5 km sorted by distance x200",
+          lambda: [sorted_near(grid, near) for i in range(200)])
+    ids = rand.sample(list(points), min(10000, len(points)))
+    timed("move {} places".format(len(ids)), lambda: [
+        grid.put(obj_id, rand.uniform(-60, 70), rand.uniform(-180, 180))
+        for obj_id in ids])
+    expected = timed("scan near 5 km x1", scan, grid_points(grid), near)
+    assert expected == set(grid.select(near))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else geo.cell_degrees)
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Memory benchmark of FileStorage: bytes per object held once a JSON file
+of reviews is reloaded, objects and indexes included, with the model
+classes then with their slotted subclasses (HBNB_FILE_SLOTS=1)
+
+usage: python3 -m benchmarks.memory [number of reviews]
+"""
+import gc
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.review import Review
+import os
+import sys
+import tempfile
+import tracemalloc
+import uuid
+
+
+def populate(n):
+    """save n reviews of 1000 places by 1000 users"""
+    places = [str(uuid.uuid4()) for i in range(1000)]
+    users = [str(uuid.uuid4()) for i in range(1000)]
+    storage.bulk_new([Review(place_id=places[i % 1000],
+                             user_id=users[i % 1000],
+                             text="Review {} of a cosy place".format(i))
+                      for i in range(n)])
+
+
+def measure(slotted):
+    """return the bytes allocated by reloading the JSON file, with the
+    slotted classes if slotted"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__slotted = slotted
+    gc.collect()
+    tracemalloc.start()
+    storage.reload()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+def main(n):
+    """print the bytes per review of both representations"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__journal_path = path + ".log"
+        FileStorage._FileStorage__lock_path = path + ".lock"
+        FileStorage._FileStorage__objects = {}
+        populate(n)
+        print("{} reviews".format(n))
+        for name, slotted in (("classes", False), ("slotted", True)):
+            print("{:8} {:>8.0f} bytes/object".format(name,
+                                                      measure(slotted) / n))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Benchmark of the JSON backends on FileStorage.save() and on the
+/api/v1/places_search listing of every place
+
+usage: python3 -m benchmarks.serializer [number of places]
+"""
+from models import serializer, storage
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import sys
+import tempfile
+import timeit
+
+
+def populate(n):
+    """fill the storage with n places spread over 100 cities"""
+    user = User(email="bench@hbnb.io", password="bench")
+    state = State(name="Bench")
+    storage.new(user)
+    storage.new(state)
+    cities = [City(name="City {}".format(i), state_id=state.id)
+              for i in range(100)]
+    for city in cities:
+        storage.new(city)
+    for i in range(n):
+        storage.new(Place(name="Place {}".format(i), user_id=user.id,
+                          city_id=cities[i % 100].id, number_rooms=i % 5,
+                          price_by_night=i % 300, latitude=37.77 + i * 1e-6,
+                          longitude=-122.41 - i * 1e-6,
+                          description="A cosy place near the bench"))
+
+
+def main(n):
+    """time save() and places_search with every available backend"""
+    from api.v1.app import app
+
+    client = app.test_client()
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        populate(n)
+        print("{} places".format(n))
+        print("{:8} {:>10} {:>16}".format("backend", "save()",
+                                          "places_search"))
+        for name in serializer.backends:
+            serializer.use(name)
+            save = min(timeit.repeat(storage.save, number=1, repeat=3))
+            search = min(timeit.repeat(
+                lambda: client.post("/api/v1/places_search", json={}),
+                number=1, repeat=3))
+            print("{:8} {:>9.3f}s {:>15.3f}s".format(name, save, search))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
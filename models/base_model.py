@@ -5,13 +5,19 @@ Contains class BaseModel
 
 from datetime import datetime
 import models
+from models import serializer
 from os import getenv
+import re
 import sqlalchemy
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, event
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# the strings of the time format, which datetime.fromisoformat() parses
+# the same way faster
+time_shape = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}T"
+                        r"[0-9]{2}:[0-9]{2}:[0-9]{2}\.[0-9]{1,6}")
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -19,8 +25,28 @@ else:
     Base = object
 
 
+def parse_time(value):
+    """returns the datetime of the string value written in the time format,
+    raising ValueError for any other string like strptime()"""
+    if type(value) is str and time_shape.fullmatch(value):
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            return parsed
+    return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """returns the datetime value as a string in the time format"""
+    if value.tzinfo is None and value.year >= 1000:
+        return value.isoformat(timespec="microseconds")
+    return value.strftime(time)
+
+
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
+    # representations memoized outside of __dict__
+    __slots__ = ("__memo", "__dict__", "__weakref__")
+
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
@@ -33,11 +59,11 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                self.updated_at = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -52,6 +78,30 @@ class BaseModel:
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
                                          self.__dict__)
 
+    def __setattr__(self, name, value):
+        """sets the attribute and forgets the memoized representations"""
+        super().__setattr__(name, value)
+        self.invalidate()
+
+    def __delattr__(self, name):
+        """deletes the attribute and forgets the memoized representations"""
+        super().__delattr__(name)
+        self.invalidate()
+
+    def invalidate(self, *args):
+        """forgets the memoized dictionary and JSON of the instance, to be
+        called after modifying one of its attributes in place
+        The generation of the memo is incremented, so that a
+        representation computed from the previous attributes, by another
+        thread meanwhile, is never used."""
+        try:
+            memo = self.__memo
+        except AttributeError:
+            return
+        memo["generation"] = memo.get("generation", 0) + 1
+        memo.pop("dict", None)
+        memo.pop("json", None)
+
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
         self.updated_at = datetime.utcnow()
@@ -59,17 +109,54 @@ class BaseModel:
         models.storage.save()
 
     def to_dict(self):
-        """returns a dictionary containing all keys/values of the instance"""
+        """returns a dictionary containing all keys/values of the instance
+        The dictionary is memoized until an attribute of the instance is
+        set, it is shared between the calls and must not be modified."""
+        memo = self.__memos()
+        generation = memo.get("generation", 0)
+        cached = memo.get("dict")
+        if cached is not None and cached[0] == generation:
+            return cached[1]
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = self.__format("created_at", new_dict)
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = self.__format("updated_at", new_dict)
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+        memo["dict"] = (generation, new_dict)
         return new_dict
 
+    def to_json(self):
+        """returns to_dict() encoded as JSON bytes with sorted keys,
+        memoized like to_dict()"""
+        memo = self.__memos()
+        generation = memo.get("generation", 0)
+        cached = memo.get("json")
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        data = serializer.dumps(self.to_dict(), sort_keys=True)
+        memo["json"] = (generation, data)
+        return data
+
+    def __memos(self):
+        """returns the dictionary of the memoized representations"""
+        try:
+            return self.__memo
+        except AttributeError:
+            self.__memo = {}
+            return self.__memo
+
+    def __format(self, name, attrs):
+        """returns the datetime attrs[name] formatted in the time format,
+        cached on the instance until the attribute is given a new value"""
+        memo = self.__memos()
+        cached = memo.get(name)
+        if cached is None or cached[0] is not attrs[name]:
+            cached = memo[name] = (attrs[name], format_time(attrs[name]))
+        return cached[1]
+
     def delete(self):
         """delete the current instance from the storage"""
         models.storage.delete(self)
@@ -88,3 +175,8 @@ class BaseModel:
                     cls.__dict__.keys()))
         return [c.name for c in table.columns
                 if (not c.primary_key and not c.nullable and not c.default)]
+
+
+if models.storage_t == "db":
+    for name in ("expire", "refresh", "refresh_flush"):
+        event.listen(Base, name, BaseModel.invalidate, propagate=True)
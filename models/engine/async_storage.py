@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+"""
+Contains the asynchronous interfaces of the storage engines
+
+An AsyncStorage runs functions of the synchronous storage API through
+its run() coroutine: a ThreadedStorage in a worker thread, an
+AsyncDBStorage in a session of an asynchronous SQLAlchemy engine, where
+they wait on the database without blocking the event loop.
+"""
+
+import abc
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import models
+from models.base_model import Base
+from models.engine.db_storage import DBStorage, TimedQueuePool
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+# asynchronous driver replacing the driver of each database backend
+async_drivers = {"mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
+
+
+class AsyncStorage(abc.ABC):
+    """asynchronous interface of a storage, every call running through
+    run() the synchronous storage method of the same name"""
+
+    @abc.abstractmethod
+    async def run(self, fn, *args, **kwargs):
+        """return fn(storage, *args, **kwargs), storage being the
+        synchronous storage to work with"""
+
+    async def reload(self):
+        """load the storage, creating the database tables if needed"""
+        await self.run(lambda storage: storage.reload())
+
+    async def close(self):
+        """release the resources of the storage"""
+
+    async def all(self, cls=None, load=None):
+        """return the dictionary of the objects of cls, or of every class"""
+        return await self.run(lambda storage: storage.all(cls, load))
+
+    async def get(self, cls, id, load=None):
+        """return the cls object of id, or None if not found"""
+        return await self.run(lambda storage: storage.get(cls, id, load))
+
+    async def count(self, cls=None):
+        """return the number of objects of cls, or of every class"""
+        return await self.run(lambda storage: storage.count(cls))
+
+    async def counts(self):
+        """return the dictionary <class name>: number of objects"""
+        return await self.run(lambda storage: storage.counts())
+
+    async def page(self, cls, limit=None, after=None, attr=None, value=None):
+        """return a page of cls objects, see the storage page()"""
+        return await self.run(lambda storage: storage.page(cls, limit, after,
+                                                           attr, value))
+
+    async def bulk_new(self, objs):
+        """store and save the objects of objs at once"""
+        await self.run(lambda storage: storage.bulk_new(objs))
+
+    async def bulk_update(self, changes):
+        """update and save the (obj, attrs) pairs of changes at once"""
+        await self.run(lambda storage: storage.bulk_update(changes))
+
+    async def bulk_delete(self, objs):
+        """delete the objects of objs and save it at once"""
+        await self.run(lambda storage: storage.bulk_delete(objs))
+
+
+class ThreadedStorage(AsyncStorage):
+    """AsyncStorage running the calls on a synchronous storage in worker
+    threads, a single one by default so that the calls of FileStorage,
+    whose state is shared, never overlap"""
+
+    def __init__(self, storage, workers=1):
+        """Instantiate a ThreadedStorage over storage"""
+        self.storage = storage
+        self.executor = ThreadPoolExecutor(workers,
+                                           thread_name_prefix="storage")
+
+    async def run(self, fn, *args, **kwargs):
+        """return fn(storage, *args, **kwargs) run in a worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(fn, self.storage, *args,
+                                             **kwargs))
+
+    async def close(self):
+        """stop the worker threads once their calls are done"""
+        self.executor.shutdown(wait=False)
+
+
+class AsyncDBStorage(AsyncStorage):
+    """AsyncStorage running the calls in a session of an asynchronous
+    SQLAlchemy engine on the database of DBStorage, through a DBStorage
+    bound to the synchronous side of that session"""
+
+    def __init__(self, url=None):
+        """Instantiate an AsyncDBStorage on url, the database of DBStorage
+        if None, with the asynchronous driver of its backend, which must
+        be installed along with greenlet"""
+        from sqlalchemy.ext.asyncio import (async_sessionmaker,
+                                            create_async_engine)
+
+        url = make_url(url or DBStorage.url())
+        url = url.set(drivername=async_drivers[url.get_backend_name()])
+        options = DBStorage.engine_options(url)
+        if options.get("poolclass") is TimedQueuePool:
+            del options["poolclass"]
+        self.engine = create_async_engine(url, **options)
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine.sync_engine, "connect",
+                         DBStorage.pragmas)
+        session_class = type("TrackedSession", (Session,), {})
+        DBStorage.bound(None).track(session_class)
+        self.sessionmaker = async_sessionmaker(
+            self.engine, expire_on_commit=False,
+            sync_session_class=session_class)
+
+    async def run(self, fn, *args, **kwargs):
+        """return fn(storage, *args, **kwargs) run in a new session, the
+        changes it did not save() being rolled back"""
+        async with self.sessionmaker() as session:
+            return await session.run_sync(
+                lambda sync_session: fn(DBStorage.bound(sync_session),
+                                        *args, **kwargs))
+
+    async def reload(self):
+        """create the tables missing from the database"""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def close(self):
+        """close the connections of the engine"""
+        await self.engine.dispose()
+
+
+def async_storage():
+    """return the AsyncStorage of the storage type of models.storage"""
+    if models.storage_t == "db":
+        return AsyncDBStorage()
+    return ThreadedStorage(models.storage)
@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceMirror and PlaceColumns classes
+
+The numeric attributes of the places of a FileStorage are copied into one
+array of floats per attribute, row i of every array holding the values of
+the place ids[i], so that a filter on them is evaluated a column at a
+time over every place at once, as NumPy masks when NumPy is installed,
+instead of going through each place object.
+"""
+
+import abc
+from array import array
+import math
+from models.engine.file_storage import FileStorage
+from models.place import Place
+import threading
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# numeric attributes of Place kept as columns
+place_columns = ("number_rooms", "number_bathrooms", "max_guest",
+                 "price_by_night", "latitude", "longitude")
+
+
+class PlaceMirror(abc.ABC):
+    """in-memory structure derived from the places of a storage
+
+    It is built from storage.all(Place) on first use and then kept in sync
+    by subscribing to the storage: the ids of the places written are
+    marked dirty and passed again to store() before the next query, which
+    calls refresh() then holds the lock. The places are read from the
+    storage without the lock, which changed() takes, so that it is never
+    held while waiting on the locks of the storage. Without a storage it
+    is only filled through store()."""
+    # dictionary - <subclass>: its instance over the FileStorage objects
+    shared = {}
+    shared_lock = threading.Lock()
+
+    def __init__(self, storage=None):
+        """Instantiate the structure of the places of storage"""
+        self.storage = storage
+        self.dirty = set()
+        self.built = storage is None
+        self.lock = threading.Lock()
+        self.refreshing = threading.Lock()
+        if storage is not None:
+            storage.subscribe(self.changed)
+
+    @classmethod
+    def of(cls, storage):
+        """return the instance of cls over storage, None if it is not a
+        FileStorage, whose objects are all in memory anyway"""
+        if not isinstance(storage, FileStorage):
+            return None
+        with cls.shared_lock:
+            mirror = cls.shared.get(cls)
+            if mirror is None:
+                mirror = cls.shared[cls] = cls(storage)
+            return mirror
+
+    def changed(self, name, obj_id):
+        """Mark the place obj_id dirty"""
+        if name == "Place":
+            with self.lock:
+                self.dirty.add(obj_id)
+
+    def refresh(self):
+        """Build the structure or store the dirty places again, one thread
+        at a time, the places being read without the lock"""
+        with self.refreshing:
+            with self.lock:
+                built = self.built
+                if not built:
+                    self.dirty.clear()
+            if not built:
+                places = list(self.storage.all(Place).values())
+                with self.lock:
+                    for place in places:
+                        self.store(place.id, place)
+                    self.built = True
+            with self.lock:
+                ids, self.dirty = self.dirty, set()
+            places = [(obj_id, self.storage.get(Place, obj_id))
+                      for obj_id in ids]
+            with self.lock:
+                for obj_id, place in places:
+                    self.store(obj_id, place)
+
+    @abc.abstractmethod
+    def store(self, obj_id, place):
+        """Update the structure with place, of id obj_id, or remove that
+        id if place is None"""
+
+
+class PlaceColumns(PlaceMirror):
+    """columnar copy of the numeric attributes of the places of a storage,
+    kept in sync like every PlaceMirror"""
+
+    def __init__(self, storage=None):
+        """Instantiate the columns of the places of storage"""
+        self.ids = []
+        self.rows = {}
+        self.columns = {name: array('d') for name in place_columns}
+        super().__init__(storage)
+
+    def store(self, obj_id, place):
+        """Set the row of obj_id to the values of place, or remove it if
+        place is None"""
+        row = self.rows.get(obj_id)
+        if place is None:
+            if row is not None:
+                self.remove(row)
+            return
+        if row is None:
+            row = self.rows[obj_id] = len(self.ids)
+            self.ids.append(obj_id)
+            for column in self.columns.values():
+                column.append(0.0)
+        for name, column in self.columns.items():
+            column[row] = number(getattr(place, name, None))
+
+    def remove(self, row):
+        """Remove row, moving the last row in its place"""
+        last = len(self.ids) - 1
+        del self.rows[self.ids[row]]
+        if row != last:
+            self.ids[row] = self.ids[last]
+            self.rows[self.ids[row]] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.ids.pop()
+        for column in self.columns.values():
+            column.pop()
+
+    def select(self, ranges):
+        """return the set of the ids of the places whose attributes are
+        within ranges, a dictionary <attribute>: (low, high) of inclusive
+        bounds, None for no bound"""
+        self.refresh()
+        with self.lock:
+            if numpy is not None:
+                return self.select_numpy(ranges)
+            rows = range(len(self.ids))
+            for name, (low, high) in ranges.items():
+                column = self.columns[name]
+                if low is not None:
+                    rows = [i for i in rows if column[i] >= low]
+                if high is not None:
+                    rows = [i for i in rows if column[i] <= high]
+            ids = self.ids
+            return {ids[i] for i in rows}
+
+    def select_numpy(self, ranges):
+        """select() evaluated as NumPy masks over views of the columns"""
+        mask = numpy.ones(len(self.ids), dtype=bool)
+        for name, (low, high) in ranges.items():
+            column = numpy.frombuffer(self.columns[name], dtype=numpy.float64)
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+            del column
+        ids = self.ids
+        return {ids[i] for i in numpy.flatnonzero(mask).tolist()}
+
+
+def number(value):
+    """return value as a float, NaN if it is not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def matches(place, ranges):
+    """return True if the attributes of place are within ranges"""
+    for name, (low, high) in ranges.items():
+        value = number(getattr(place, name, None))
+        if low is not None and not value >= low:
+            return False
+        if high is not None and not value <= high:
+            return False
+    return True
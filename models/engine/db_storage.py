@@ -3,6 +3,8 @@
 Contains the class DBStorage
 """
 
+from contextlib import contextmanager
+from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
@@ -13,39 +15,172 @@ from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, event, func, literal, or_
+from sqlalchemy import select
+from sqlalchemy import union_all
+from sqlalchemy.orm import joinedload, scoped_session, selectinload
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+import threading
+from time import monotonic, perf_counter
+from types import SimpleNamespace
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+loaders = {"selectin": selectinload, "joined": joinedload}
+pool_options = {"pool_size": ("HBNB_MYSQL_POOL_SIZE", int),
+                "max_overflow": ("HBNB_MYSQL_MAX_OVERFLOW", int),
+                "pool_recycle": ("HBNB_MYSQL_POOL_RECYCLE", int),
+                "pool_pre_ping": ("HBNB_MYSQL_POOL_PRE_PING",
+                                  lambda value: value == "1"),
+                "pool_timeout": ("HBNB_MYSQL_POOL_TIMEOUT", float),
+                "isolation_level": ("HBNB_MYSQL_ISOLATION_LEVEL", str)}
+sqlite_pragmas = {"journal_mode": "WAL", "synchronous": "NORMAL",
+                  "foreign_keys": "ON", "busy_timeout": 5000,
+                  "cache_size": -65536, "temp_store": "MEMORY",
+                  "mmap_size": 1 << 28}
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long the checkouts wait for a connection
+
+    stats holds the number of checkouts, of those which timed out, and
+    the total and longest time in seconds spent waiting for them."""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool with zeroed stats"""
+        super().__init__(*args, **kwargs)
+        self.stats = {"checkouts": 0, "timeouts": 0, "wait": 0.0,
+                      "max_wait": 0.0}
+
+    def connect(self):
+        """check a connection out of the pool, timing the wait"""
+        start = perf_counter()
+        try:
+            return super().connect()
+        except sqlalchemy.exc.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        finally:
+            wait = perf_counter() - start
+            self.stats["checkouts"] += 1
+            self.stats["wait"] += wait
+            self.stats["max_wait"] = max(self.stats["max_wait"], wait)
+
+    def recreate(self):
+        """return a new pool with the same settings, keeping the stats"""
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
 
 
 class DBStorage:
-    """interaacts with the MySQL database"""
+    """interaacts with the MySQL database, or the one of HBNB_DB_URL"""
     __engine = None
     __session = None
+    # list - callbacks called with the class name and id of the objects
+    # passed to new() or delete() or written by a commit
+    __subscribers = []
+    # dictionary - <class name>: number of rows, maintained by the commits
+    # of the process since the last count at __counted
+    __counts = {}
+    __counted = None
+    # float - seconds after which the counts are read again from the
+    # database, to take in the writes of the other processes
+    __counts_ttl = float(getenv("HBNB_DB_COUNTS_TTL") or 10)
+    __counts_lock = threading.Lock()
+    # thread-local - depth of the unit of work of the thread, and whether
+    # save() was called or a nested unit failed
+    __unit = threading.local()
 
     def __init__(self):
         """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        url = self.url()
+        self.__engine = create_engine(url, **self.engine_options(url))
+        if self.__engine.dialect.name == "sqlite":
+            event.listen(self.__engine, "connect", self.pragmas)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    @staticmethod
+    def url():
+        """
+        Return the database URL: HBNB_DB_URL, like sqlite:///hbnb.db, if
+        set, else the MySQL database HBNB_MYSQL_DB of HBNB_MYSQL_HOST
+        accessed as HBNB_MYSQL_USER with the password HBNB_MYSQL_PWD.
+        """
+        HBNB_DB_URL = getenv('HBNB_DB_URL')
+        if HBNB_DB_URL:
+            return HBNB_DB_URL
+        return 'mysql+mysqldb://{}:{}@{}/{}'.format(getenv('HBNB_MYSQL_USER'),
+                                                    getenv('HBNB_MYSQL_PWD'),
+                                                    getenv('HBNB_MYSQL_HOST'),
+                                                    getenv('HBNB_MYSQL_DB'))
+
+    @staticmethod
+    def engine_options(url=None):
+        """
+        Return the arguments of create_engine for url, the MySQL database
+        if None. The pool settings are read from the environment:
+        HBNB_MYSQL_POOL_SIZE, HBNB_MYSQL_MAX_OVERFLOW, HBNB_MYSQL_POOL_TIMEOUT,
+        HBNB_MYSQL_POOL_RECYCLE (3600 seconds by default, below the MySQL
+        wait_timeout), HBNB_MYSQL_POOL_PRE_PING ("1" by default, "0" turns
+        it off) and HBNB_MYSQL_ISOLATION_LEVEL, like "READ COMMITTED".
+        The unset ones keep the SQLAlchemy defaults.
+        SQLite connections are shared between threads, through a single
+        connection for an in-memory database.
+        """
+        options = {"poolclass": TimedQueuePool, "pool_recycle": 3600,
+                   "pool_pre_ping": True}
+        for option, (name, convert) in pool_options.items():
+            value = getenv(name)
+            if value:
+                options[option] = convert(value)
+        if url is None or make_url(url).get_backend_name() != "sqlite":
+            return options
+        options["connect_args"] = {"check_same_thread": False}
+        if make_url(url).database in (None, "", ":memory:"):
+            options = {"poolclass": StaticPool,
+                       "connect_args": options["connect_args"]}
+        return options
+
+    @staticmethod
+    def pragmas(dbapi_connection, connection_record):
+        """set the sqlite_pragmas on a new SQLite connection: write-ahead
+        logging, so that readers do not block the writer, fewer fsyncs,
+        enforced foreign keys like on MySQL and a larger page cache"""
+        cursor = dbapi_connection.cursor()
+        for pragma, value in sqlite_pragmas.items():
+            cursor.execute("PRAGMA {}={}".format(pragma, value))
+        cursor.close()
+
+    def pool_stats(self):
+        """
+        Return the state of the connection pool: its size, the number of
+        connections checked in and out of it and of overflow connections,
+        along with the checkout counts and wait times of TimedQueuePool.
+        """
+        pool = self.__engine.pool
+        stats = {}
+        if isinstance(pool, QueuePool):
+            stats = {"size": pool.size(), "checked_in": pool.checkedin(),
+                     "checked_out": pool.checkedout(),
+                     "overflow": pool.overflow()}
+        stats.update(getattr(pool, "stats", {}))
+        return stats
+
+    def all(self, cls=None, load=None):
+        """query on the current database session
+        load lists the relationships to load eagerly, see loading()"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if load:
+                    query = query.options(*self.loading(classes[clss], load))
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
@@ -54,44 +189,297 @@ class DBStorage:
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
+        self.__notify([obj])
 
     def save(self):
-        """commit all changes of the current database session"""
-        self.__session.commit()
+        """commit all changes of the current database session
+        Within a unit of work the commit is deferred to its end."""
+        if self.__in_unit():
+            self.__unit.saved = True
+            return
+        self.__commit()
+
+    def begin(self):
+        """start a unit of work of the thread, nested in the current one
+        if any: until it ends save() only records that a commit is due"""
+        unit = self.__unit
+        if not self.__in_unit():
+            unit.depth, unit.saved, unit.failed = 0, False, False
+        unit.depth += 1
+
+    def commit(self):
+        """end the unit of work, the outermost one committing the session
+        if save() was called, or rolling it back like rollback() if a
+        nested unit was rolled back"""
+        self.__end(True)
+
+    def rollback(self):
+        """end the unit of work, the outermost one rolling back the
+        session"""
+        self.__end(False)
+
+    @contextmanager
+    def unit_of_work(self):
+        """context manager running its block in a unit of work, committed
+        at the end of the block or rolled back if it raises"""
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def __in_unit(self):
+        """tell if the thread is in a unit of work"""
+        return getattr(self.__unit, "depth", 0) > 0
+
+    def __end(self, success):
+        """leave the current unit of work, committing or rolling back the
+        session if it is the outermost one"""
+        unit = self.__unit
+        if not self.__in_unit():
+            return
+        unit.depth -= 1
+        unit.failed = unit.failed or not success
+        if unit.depth:
+            return
+        if unit.failed:
+            self.__session.rollback()
+        elif unit.saved:
+            self.__commit()
+
+    def bulk_new(self, objs):
+        """add every object of objs to the session and commit them in one
+        transaction, the flush inserting the rows of a table in batches"""
+        for obj in objs:
+            self.new(obj)
+        self.__commit()
+
+    def bulk_update(self, changes):
+        """set on each object of the (obj, attrs) pairs of changes the
+        attributes of the dictionary attrs, refresh its updated_at and
+        commit them all in one transaction like bulk_new()"""
+        now = datetime.utcnow()
+        for obj, attrs in changes:
+            for key, value in attrs.items():
+                setattr(obj, key, value)
+            obj.updated_at = now
+            self.new(obj)
+        self.__commit()
+
+    def bulk_delete(self, objs):
+        """delete every object of objs from the database in one
+        transaction like bulk_new()"""
+        for obj in objs:
+            self.delete(obj)
+        self.__commit()
+
+    def __commit(self):
+        """commit the session, rolling it back if the commit fails
+        Within a unit of work the commit is deferred to its end."""
+        if self.__in_unit():
+            self.__unit.saved = True
+            return
+        try:
+            self.__session.commit()
+        except BaseException:
+            self.__session.rollback()
+            raise
+
+    @classmethod
+    def bound(cls, session):
+        """Return a DBStorage working in session instead of a scoped
+        session of its own, like the synchronous session an AsyncSession
+        gives to run_sync(). Its units of work are its own, the sessions
+        of an event loop sharing the thread. It has no engine: it is not
+        to be reloaded, closed or asked for statements() or pool_stats()."""
+        storage = cls.__new__(cls)
+        storage.__session = session
+        storage.__unit = SimpleNamespace()
+        return storage
+
+    def track(self, target):
+        """register on target, a sessionmaker or a Session class, the
+        events maintaining the counts and notifying the subscribers of the
+        objects committed by its sessions"""
+        event.listen(target, "after_flush", self.__flushed)
+        event.listen(target, "after_commit", self.__committed)
+        event.listen(target, "after_rollback", self.__rolled_back)
+
+    def __flushed(self, session, flush_context):
+        """record in the session the objects a flush inserted, updated and
+        deleted until the transaction ends"""
+        flushed = session.info.setdefault("flushed", ([], [], []))
+        flushed[0].extend(session.new)
+        flushed[1].extend(session.dirty)
+        flushed[2].extend(session.deleted)
+
+    def __committed(self, session):
+        """update the counts and notify the subscribers of the objects the
+        committed transaction wrote"""
+        inserted, updated, deleted = session.info.pop("flushed",
+                                                      ([], [], []))
+        with self.__counts_lock:
+            if DBStorage.__counted is not None:
+                for obj in inserted:
+                    name = obj.__class__.__name__
+                    self.__counts[name] = self.__counts.get(name, 0) + 1
+                for obj in deleted:
+                    name = obj.__class__.__name__
+                    self.__counts[name] = self.__counts.get(name, 0) - 1
+        self.__notify(inserted + updated + deleted)
+
+    def __rolled_back(self, session, *args):
+        """forget the objects written by the rolled back transaction"""
+        session.info.pop("flushed", None)
+
+    def subscribe(self, callback):
+        """call callback(name, id) with the class name and id of every
+        object passed to new() or delete(), and again once committed,
+        from now on"""
+        self.__subscribers.append(callback)
+
+    def __notify(self, objs):
+        """call the subscribers with the class name and id of objs"""
+        for obj in objs:
+            for callback in self.__subscribers:
+                callback(obj.__class__.__name__, obj.id)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
+            self.__notify([obj])
 
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        self.track(sess_factory)
         Session = scoped_session(sess_factory)
         self.__session = Session
+        DBStorage.__counted = None
 
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
-        """Return the object by its class and ID, or None if not found."""
+    def share(self):
+        """prepare the storage to be shared by processes forked from now
+        on, closing the connections of the pool so that each process
+        opens its own"""
+        self.__session.remove()
+        self.__engine.dispose()
+
+    def get(self, cls, id, load=None):
+        """Return the object by its class and ID, or None if not found.
+        The lookup goes through the session identity map first and only
+        queries the database by primary key on a miss, loading eagerly the
+        relationships listed by load, see loading()."""
         if not cls or not id:
             return None
 
-        all_objs_dict = self.all(cls)
-        obj_key = cls.__name__ + '.' + id
-        if obj_key in all_objs_dict:
-            return all_objs_dict[obj_key]
-        return None
+        cls = classes.get(cls, cls)
+        if cls not in classes.values():
+            return None
+        if load:
+            return self.__session.get(cls, id,
+                                      options=self.loading(cls, load))
+        return self.__session.get(cls, id)
+
+    @staticmethod
+    def loading(cls, load):
+        """
+        Return the loader options of the relationships of cls in load.
+        load is a list of dotted relationship paths, like "cities.places",
+        loaded with SELECT ... IN, or a dictionary mapping such paths to
+        "selectin" or "joined".
+        """
+        if not isinstance(load, dict):
+            load = dict.fromkeys(load, "selectin")
+        options = []
+        for path, strategy in load.items():
+            option, owner = None, cls
+            for name in path.split("."):
+                attr = getattr(owner, name)
+                loader = loaders[strategy]
+                option = loader(attr) if option is None else getattr(
+                    option, loader.__name__)(attr)
+                owner = attr.property.mapper.class_
+            options.append(option)
+        return options
+
+    @contextmanager
+    def statements(self):
+        """
+        Context manager giving the list of the SQL statements executed
+        by the storage within it, to bound the queries of an operation.
+        """
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, many):
+            """append the statement to executed"""
+            executed.append(statement)
+
+        event.listen(self.__engine, "before_cursor_execute", record)
+        try:
+            yield executed
+        finally:
+            event.remove(self.__engine, "before_cursor_execute", record)
 
     def count(self, cls=None):
         """
         Return the number of objects in storage matching the given class.
         If no class is passed, return the count of all objects in storage.
+        The counts are the ones maintained by counts().
         """
         if not cls:
-            return len(self.all())
+            return sum(self.counts().values())
 
-        return len(self.all(cls))
+        cls = classes.get(cls, cls)
+        if cls not in classes.values():
+            return 0
+        return self.counts()[cls.__name__]
+
+    def counts(self):
+        """
+        Return the dictionary <class name>: number of objects of every
+        class. The counts are read from the database with a single query
+        by reload() and every HBNB_DB_COUNTS_TTL seconds (10 by default),
+        and kept up to date by the commits in between.
+        """
+        with self.__counts_lock:
+            counted = DBStorage.__counted
+            if counted is None or monotonic() - counted > self.__counts_ttl:
+                queries = [select(literal(name), func.count())
+                           .select_from(clss.__table__)
+                           for name, clss in classes.items()]
+                rows = self.__session.execute(union_all(*queries)).all()
+                self.__counts.clear()
+                self.__counts.update((name, count) for name, count in rows)
+                DBStorage.__counted = monotonic()
+            return dict(self.__counts)
+
+    def page(self, cls, limit=None, after=None, attr=None, value=None):
+        """
+        Return up to limit cls objects ordered by creation date then id,
+        coming after the (created_at datetime, id) pair after if given, and
+        only those whose attribute attr equals value if attr is given.
+        The filters and the limit are applied by the database.
+        """
+        cls = classes.get(cls, cls)
+        if cls not in classes.values():
+            return []
+        query = self.__session.query(cls)
+        if attr is not None:
+            query = query.filter(getattr(cls, attr) == value)
+        if after is not None:
+            created_at, id = after
+            query = query.filter(or_(cls.created_at > created_at,
+                                     and_(cls.created_at == created_at,
+                                          cls.id > id)))
+        query = query.order_by(cls.created_at, cls.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
@@ -3,18 +3,38 @@
 Contains the FileStorage class
 """
 
-import json
+import bisect
+from contextlib import contextmanager
+from datetime import datetime
+from models import serializer
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, format_time
 from models.city import City
+from models.engine.journal import Journal
+from models.engine.slotted import slotted
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from os import getenv
+import os
+import shutil
+import tempfile
+import threading
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# foreign keys kept indexed for each class name, a list of ids being
+# indexed under each of its elements
+foreign_keys = {"City": ("state_id",),
+                "Place": ("city_id", "user_id", "amenity_ids"),
+                "Review": ("place_id", "user_id")}
+
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
@@ -23,66 +43,609 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - <class name>: {<class name>.id: obj}
+    __classes = {}
+    # dictionary - (<class name>, <foreign key>, <value>): {<key>: obj}
+    __relations = {}
+    # dictionary - <class name>.id: relations the object is indexed under
+    __entries = {}
+    # dictionary - each key of __relations by itself, shared by __entries
+    __relation_keys = {}
+    # dictionary - <class name>: sorted list of (created_at, id), built on
+    # the first page() of the class
+    __orders = {}
+    # dictionary - <class name>.id: (created_at, id) in __orders
+    __order_keys = {}
+    # dictionary - the __objects the indexes above were built from
+    __indexed = None
+    # boolean - append mutations to a journal instead of rewriting the file
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # string - path to the journal of the JSON file
+    __journal_path = __file_path + ".log"
+    # integer - journal size in bytes past which it is compacted
+    __journal_limit = int(getenv("HBNB_FILE_JOURNAL_LIMIT") or 16 << 20)
+    # dictionary - <class name>.id: obj, or None once deleted, not saved
+    # yet
+    __pending = {}
+    # thread - background compaction of the journal into the JSON file
+    __compactor = None
+    # integer - previous versions of the JSON file kept as file.json.<n>
+    __generations = int(getenv("HBNB_FILE_GENERATIONS") or 2)
+    # lock - serializes the writers of the JSON file and its generations
+    __write_lock = threading.Lock()
+    # lock - serializes the changes to __objects and its indexes, the
+    # readers working on snapshots of them, only taking it to build an
+    # index or, in lazy mode, an object
+    __mutex = threading.RLock()
+    # string - path to the file locked by the writers of every process
+    __lock_path = __file_path + ".lock"
+    # thread-local - depth and file descriptor of the lock held by the
+    # thread
+    __locks = threading.local()
+    # tuple - the __objects last synchronized with the saved state, and
+    # the signature of that state
+    __synced = (None, None)
+    # float - seconds between two checks of the watcher thread for
+    # changes saved by other processes, None to check on close() instead
+    __watch = float(getenv("HBNB_FILE_WATCH") or 0) or None
+    # tuple - watcher thread, event stopping it and process it runs in
+    __watcher = None
+    # boolean - keep reloaded objects as dictionaries until accessed
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
+    # boolean - reload objects as instances of slotted classes
+    __slotted = getenv("HBNB_FILE_SLOTS") == "1"
+    # list - callbacks called with the class name and id of the objects
+    # passed to new() or delete()
+    __subscribers = []
+    # thread-local - depth of the unit of work of the thread, whether
+    # save() was called, new() or delete() changed an object or a nested
+    # unit failed, and the keys it changed
+    __unit = threading.local()
+    # dictionary - thread ident: keys changed by the open unit of work of
+    # the thread, which the saves of the other threads leave as saved
+    __units = {}
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def all(self, cls=None, load=None):
+        """returns the dictionary __objects
+        With cls, a new dictionary of its objects is returned, which other
+        threads do not change while it is iterated, unlike __objects.
+        load is accepted for compatibility with DBStorage, the related
+        objects being in memory already"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            name = cls if type(cls) is str else cls.__name__
+            bucket = self.__index().get(name, {})
+            return {key: self.__hydrate(key, obj)
+                    for key, obj in list(bucket.items())}
+        if self.__lazy:
+            self.__index()
+            for key, obj in list(self.__objects.items()):
+                self.__hydrate(key, obj)
         return self.__objects
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__mutex:
+                if self.__in_unit():
+                    self.__unit.changed = True
+                    self.__unit.keys.add(key)
+                self.__put(key, obj)
+                self.__pending[key] = obj
+            self.__notify(key)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path)
+        In journal mode only the objects passed to new() or delete() since
+        the last save are appended to the journal.
+        Within a unit of work the write is deferred to its end, the
+        objects changed by the open units of the other threads being left
+        as saved until theirs.
+        The writers of every process take turns through the write lock,
+        each one applying the changes saved by the others first so that
+        it never overwrites them."""
+        if self.__in_unit():
+            self.__unit.saved = True
+            return
+        with self.__locked(), self.__mutex:
+            changed = self.__sync(load=False)
+            owned = self.__owned()
+            journal = Journal(self.__journal_path)
+            if self.__journal:
+                journal.append([(key, None if obj is None else
+                                 self.__to_dict(obj))
+                                for key, obj in self.__pending.items()
+                                if key not in owned])
+            else:
+                self.__write({key: self.__to_dict(obj) for key, obj
+                              in self.__saved_state(owned)})
+                journal.discard()
+            for key in list(self.__pending):
+                if key not in owned:
+                    del self.__pending[key]
+            self.__bump()
+            if self.__journal and journal.size() > self.__journal_limit:
+                self.compact()
+        self.__notify(*changed)
+
+    def share(self):
+        """prepare the storage to be shared by processes forked from now
+        on, every one of them applying the changes saved by the others:
+        the watcher thread is stopped, so that no fork happens while it
+        holds a lock, each process starting its own"""
+        watcher = self.__watcher
+        if watcher is not None:
+            watcher[1].set()
+            watcher[0].join()
+            FileStorage.__watcher = None
+
+    def __sync(self, force=False, load=True):
+        """apply to __objects the changes saved since it was last
+        synchronized, none if the signature of the saved state did not
+        change unless force, keeping the changes not saved yet, and return
+        the keys of the objects it changed, for the caller to notify once
+        __mutex is released
+        An __objects never synchronized is loaded from the saved state if
+        load, or taken as the new saved state otherwise."""
+        with self.__mutex:
+            return self.__apply(force, load)
+
+    def __apply(self, force, load):
+        """synchronize __objects like __sync(), __mutex being held"""
+        objects, seen = self.__synced
+        signature = self.__signature()
+        changed = []
+        if objects is not self.__objects and not load:
+            return changed
+        if objects is not self.__objects:
+            self.__index()
+            self.__orders.clear()
+            self.__order_keys.clear()
+            removed = set()
+            try:
+                for key, value in self.__read(removed).items():
+                    self.__put(key, self.__load(value))
+            except Exception:
+                pass
+            for key in removed:
+                self.__remove(key)
+        elif force or signature != seen:
+            changed = self.__merge(seen, signature)
+        FileStorage.__synced = (self.__objects, signature)
+        return changed
+
+    def __merge(self, seen, signature):
+        """apply to __objects the objects saved or deleted since the saved
+        state of signature seen, reading only the end of the journal if
+        nothing else changed, and return the keys of those it changed"""
+        journal = None if seen is None else seen[2]
+        if (seen is not None and seen[1] == signature[1] and
+                signature[2] is not None and
+                (journal is None or (journal[0] == signature[2][0] and
+                                     journal[1] <= signature[2][1]))):
+            changes = Journal(self.__journal_path).replay(
+                0 if journal is None else journal[1])
+        else:
+            saved = self.__read()
+            changes = [(key, None) for key in self.__objects
+                       if key not in saved]
+            changes += saved.items()
+        changed = []
+        for key, value in changes:
+            if key in self.__pending:
+                continue
+            current = self.__objects.get(key)
+            if value is None:
+                if current is None:
+                    continue
+                self.__remove(key)
+            elif value.get("__class__") not in classes or (
+                    current is not None and self.__to_dict(current) == value):
+                continue
+            else:
+                self.__put(key, self.__load(value))
+            changed.append(key)
+        return changed
+
+    def __signature(self):
+        """return the signature of the saved state, which changes with
+        every write of any process: the number of writes counted in
+        file.json.lock, then the inode, modification time and size of
+        the JSON file, then the inode and size of its journal"""
+        try:
+            with open(self.__lock_path, 'rb') as f:
+                generation = int(f.read() or 0)
+        except (OSError, ValueError):
+            generation = 0
+        stats = [generation]
+        for path in (self.__file_path, self.__journal_path):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stats.append(None)
+                continue
+            if path == self.__file_path:
+                stats.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            else:
+                stats.append((stat.st_ino, stat.st_size))
+        return tuple(stats)
+
+    def __bump(self):
+        """count a write in file.json.lock and record that __objects is in
+        the new saved state, the write lock being held"""
+        fd = getattr(self.__locks, "fd", None)
+        if fd is not None:
+            generation = os.pread(fd, 32, 0)
+            try:
+                generation = int(generation or 0) + 1
+            except ValueError:
+                generation = 1
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, str(generation).encode(), 0)
+        FileStorage.__synced = (self.__objects, self.__signature())
+
+    @contextmanager
+    def __locked(self, shared=False):
+        """hold the lock of the JSON file: the lock of the threads of this
+        process and an fcntl lock on file.json.lock for the other
+        processes, exclusive for the writers or shared for the readers,
+        reentrant within a thread"""
+        if getattr(self.__locks, "depth", 0):
+            self.__locks.depth += 1
+            try:
+                yield
+            finally:
+                self.__locks.depth -= 1
+            return
+        with self.__write_lock:
+            fd = None
+            if fcntl is not None:
+                fd = os.open(self.__lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fd is not None:
+                    fcntl.flock(fd, fcntl.LOCK_SH if shared else
+                                fcntl.LOCK_EX)
+                self.__locks.depth, self.__locks.fd = 1, fd
+                yield
+            finally:
+                self.__locks.depth, self.__locks.fd = 0, None
+                if fd is not None:
+                    os.close(fd)
+
+    def bulk_new(self, objs):
+        """sets every object of objs in __objects then saves them with a
+        single rewrite of the JSON file, or a single journal append"""
+        for obj in objs:
+            self.new(obj)
+        self.save()
+
+    def bulk_update(self, changes):
+        """sets on each object of the (obj, attrs) pairs of changes the
+        attributes of the dictionary attrs, refreshes its updated_at and
+        saves them all at once like bulk_new()"""
+        now = datetime.utcnow()
+        for obj, attrs in changes:
+            for key, value in attrs.items():
+                setattr(obj, key, value)
+            obj.updated_at = now
+            self.new(obj)
+        self.save()
+
+    def bulk_delete(self, objs):
+        """deletes every object of objs from __objects then saves the
+        deletions at once like bulk_new()"""
+        for obj in objs:
+            self.delete(obj)
+        self.save()
+
+    def subscribe(self, callback):
+        """call callback(name, id) with the class name and id of every
+        object passed to new() or delete() from now on"""
+        self.__subscribers.append(callback)
+
+    def __notify(self, *keys):
+        """call the subscribers with the class name and id of each key,
+        never with __mutex held since they may wait on locks of their own
+        held by threads waiting for it"""
+        for key in keys:
+            name, id = key.split('.', 1)
+            for callback in self.__subscribers:
+                callback(name, id)
+
+    def begin(self):
+        """start a unit of work of the thread, nested in the current one
+        if any: until it ends save() only records that a write is due"""
+        unit = self.__unit
+        if not self.__in_unit():
+            unit.depth, unit.saved, unit.failed = 0, False, False
+            unit.changed, unit.keys = False, set()
+            with self.__mutex:
+                self.__units[threading.get_ident()] = unit.keys
+        unit.depth += 1
+
+    def commit(self):
+        """end the unit of work, the outermost one writing its changes
+        with a single save() if one was called, or undoing them like
+        rollback() if a nested unit was rolled back"""
+        self.__end(True)
+
+    def rollback(self):
+        """end the unit of work, the outermost one undoing its changes:
+        the objects it passed to new() or delete() are reloaded from the
+        JSON file, which neither it nor the saves of the other threads
+        wrote, or dropped if not saved there, the unsaved changes of the
+        other threads being kept"""
+        self.__end(False)
+
+    @contextmanager
+    def unit_of_work(self):
+        """context manager running its block in a unit of work, committed
+        at the end of the block or rolled back if it raises"""
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def __in_unit(self):
+        """tell if the thread is in a unit of work"""
+        return getattr(self.__unit, "depth", 0) > 0
+
+    def __end(self, success):
+        """leave the current unit of work, writing or undoing its changes
+        if it is the outermost one"""
+        unit = self.__unit
+        if not self.__in_unit():
+            return
+        unit.depth -= 1
+        unit.failed = unit.failed or not success
+        if unit.depth:
+            return
+        try:
+            if unit.failed:
+                if unit.changed or unit.saved:
+                    self.__undo(unit.keys)
+            elif unit.saved:
+                try:
+                    self.save()
+                except BaseException:
+                    self.__undo(unit.keys)
+                    raise
+        finally:
+            with self.__mutex:
+                self.__units.pop(threading.get_ident(), None)
+
+    def __owned(self):
+        """return the keys changed by the open units of work of the other
+        threads, __mutex being held"""
+        ident = threading.get_ident()
+        return set().union(*[keys for thread, keys in self.__units.items()
+                             if thread != ident])
+
+    def __saved_state(self, owned):
+        """return the (key, object) pairs of __objects to save, those of
+        the owned keys being replaced by their saved dictionary, or
+        dropped if not saved, __mutex being held"""
+        if not owned:
+            return list(self.__objects.items())
+        saved = self.__read()
+        return ([(key, obj) for key, obj in self.__objects.items()
+                 if key not in owned] +
+                [(key, saved[key]) for key in owned if key in saved])
+
+    def __undo(self, keys):
+        """drop the unsaved changes of the keys, reloading their objects
+        from the JSON file and its journal or removing those not saved"""
+        changed = []
+        with self.__locked(shared=True), self.__mutex:
+            saved = self.__read()
+            for key in keys:
+                self.__pending.pop(key, None)
+                value = saved.get(key)
+                if value is None or value.get("__class__") not in classes:
+                    if key not in self.__objects:
+                        continue
+                    self.__remove(key)
+                else:
+                    self.__put(key, self.__load(value))
+                changed.append(key)
+        self.__notify(*changed)
+
+    def compact(self):
+        """snapshot __objects into the JSON file in a background thread
+        and drop the part of the journal the snapshot covers, the objects
+        changed by open units of work of other threads being snapshot as
+        saved"""
+        if self.__compactor is not None and self.__compactor.is_alive():
+            return
+        with self.__locked(), self.__mutex:
+            changed = self.__sync(load=False)
+            journal = Journal(self.__journal_path)
+            journal.rotate()
+            objects = self.__saved_state(self.__owned())
+            self.__bump()
+        self.__notify(*changed)
+        FileStorage.__compactor = threading.Thread(
+            target=self.__compact, args=(objects, journal), daemon=True)
+        FileStorage.__compactor.start()
+
+    def __compact(self, objects, journal):
+        """write the snapshot of objects then remove the rotated journal"""
+        self.__write({key: self.__to_dict(obj) for key, obj in objects})
+        journal.discard(rotated_only=True)
+
+    def __write(self, json_objects):
+        """write json_objects to a temporary file, fsync it and rename it
+        over the JSON file so that a crash or a concurrent reader never
+        sees a partially written file"""
+        directory = os.path.dirname(os.path.abspath(self.__file_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                serializer.dump(json_objects, f)
+                f.flush()
+                os.fsync(f.fileno())
+            with self.__locked():
+                if os.path.exists(self.__file_path):
+                    shutil.copymode(self.__file_path, tmp_path)
+                    self.__rotate()
+                else:
+                    os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, self.__file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def __rotate(self):
+        """shift the generations of the JSON file, the current file
+        becoming file.json.1 while staying in place until replaced"""
+        paths = self.__snapshots()
+        if len(paths) < 2:
+            return
+        for i in range(len(paths) - 1, 1, -1):
+            if os.path.exists(paths[i - 1]):
+                os.replace(paths[i - 1], paths[i])
+        if os.path.exists(paths[1]):
+            os.remove(paths[1])
+        try:
+            os.link(paths[0], paths[1])
+        except OSError:
+            shutil.copyfile(paths[0], paths[1])
+
+    def __snapshots(self):
+        """return the path of the JSON file followed by its generations,
+        newest first"""
+        return [self.__file_path] + [self.__file_path + "." + str(i)
+                                     for i in range(1, self.__generations + 1)]
 
     def clear(self):
         """Clear all data in memory"""
         self.__objects = {}
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
-        try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
-            pass
+        """deserializes the JSON file to __objects
+        A missing or corrupted JSON file falls back to its newest readable
+        generation. In lazy mode the file is parsed incrementally and the
+        objects are only built when accessed through all() or get().
+        Once loaded, __objects is only given the changes saved since by
+        any process, nothing being read nor locked if the files did not
+        change."""
+        self.__watching()
+        objects, seen = self.__synced
+        if objects is self.__objects and seen == self.__signature():
+            return
+        with self.__locked(shared=True):
+            changed = self.__sync()
+        self.__notify(*changed)
+
+    def __read(self, removed=None):
+        """return the dictionary <class name>.id: dictionary of the objects
+        of the JSON file, or of its newest readable generation, updated by
+        its journal, adding to the set removed the keys it deleted"""
+        jo = {}
+        for path in self.__snapshots():
+            try:
+                if self.__lazy:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        jo = dict(serializer.iterload(f))
+                else:
+                    with open(path, 'rb') as f:
+                        jo = serializer.load(f)
+            except (OSError, ValueError):
+                continue
+            break
+        for key, value in Journal(self.__journal_path).replay():
+            if value is None:
+                jo.pop(key, None)
+                if removed is not None:
+                    removed.add(key)
+            elif value.get("__class__") in classes:
+                jo[key] = value
+                if removed is not None:
+                    removed.discard(key)
+        return jo
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__mutex:
+                if key not in self.__objects:
+                    return
+                if self.__in_unit():
+                    self.__unit.changed = True
+                    self.__unit.keys.add(key)
+                self.__remove(key)
+                self.__pending[key] = None
+            self.__notify(key)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() method for deserializing the JSON file to objects,
+        which only reads the changes saved by other processes
+        Nothing is read while the watcher thread applies them instead."""
+        if not self.__watching():
+            self.reload()
+
+    def watch(self, interval):
+        """apply the changes saved by the other processes every interval
+        seconds in a watcher thread rather than on close(), which then
+        does nothing; a None interval stops the thread"""
+        with self.__mutex:
+            if self.__watcher is not None:
+                self.__watcher[1].set()
+            FileStorage.__watcher = None
+            FileStorage.__watch = interval
+            if not interval:
+                return
+            stop = threading.Event()
+            thread = threading.Thread(target=self.__poll,
+                                      args=(interval, stop), daemon=True)
+            FileStorage.__watcher = (thread, stop, os.getpid())
+            thread.start()
 
-    def get(self, cls, id):
-        """Return the object by its class and ID, or None if not found."""
+    def __watching(self):
+        """tell if changes are watched for, starting the watcher thread
+        in this process if it is not running here, as after a fork"""
+        if not self.__watch:
+            return False
+        watcher = self.__watcher
+        if watcher is None or watcher[2] != os.getpid():
+            self.watch(self.__watch)
+        return True
+
+    def __poll(self, interval, stop):
+        """apply the saved changes every interval seconds until stop"""
+        while not stop.wait(interval):
+            try:
+                self.reload()
+            except Exception:
+                pass
+
+    def get(self, cls, id, load=None):
+        """Return the object by its class and ID, or None if not found.
+        load is accepted for compatibility with DBStorage."""
         if not cls or not id:
             return None
 
-        all_objs_dict = self.all(cls)
-        obj_key = cls.__name__ + '.' + id
-        if obj_key in all_objs_dict:
-            return all_objs_dict[obj_key]
-        return None
+        key = (cls if type(cls) is str else cls.__name__) + '.' + id
+        obj = self.__objects.get(key)
+        if obj is None:
+            return None
+        self.__index()
+        return self.__hydrate(key, obj)
 
     def count(self, cls=None):
         """
@@ -90,6 +653,196 @@ class FileStorage:
         If no class is passed, return the count of all objects in storage.
         """
         if not cls:
-            return len(self.all())
+            return len(self.__objects)
+
+        name = cls if type(cls) is str else cls.__name__
+        return len(self.__index().get(name, {}))
+
+    def counts(self):
+        """
+        Return the dictionary <class name>: number of objects of every
+        class, read from the class buckets new(), delete() and reload()
+        maintain.
+        """
+        buckets = self.__index()
+        return {name: len(buckets.get(name, {})) for name in classes}
+
+    def related(self, cls, attr, value):
+        """
+        Return the list of cls objects whose attribute attr equals value,
+        or contains it if attr is a list.
+        Indexed foreign keys are served from their index, any other
+        attribute falls back to a scan of the class bucket.
+        """
+        name = cls if type(cls) is str else cls.__name__
+        buckets = self.__index()
+        if attr in foreign_keys.get(name, ()):
+            objs = self.__relations.get((name, attr, value), {})
+        else:
+            objs = buckets.get(name, {})
+        objs = [self.__hydrate(key, obj) for key, obj in list(objs.items())]
+        return [obj for obj in objs if self.__matches(obj, attr, value)]
+
+    def page(self, cls, limit=None, after=None, attr=None, value=None):
+        """
+        Return up to limit cls objects ordered by creation date then id,
+        coming after the (created_at datetime, id) pair after if given, and
+        only those whose attribute attr equals value if attr is given.
+        Whole classes are paged through a sorted index, related objects
+        are sorted on the fly.
+        """
+        name = cls if type(cls) is str else cls.__name__
+        if after is not None and type(after[0]) is not str:
+            after = (format_time(after[0]), after[1])
+        if attr is not None:
+            objs = sorted(self.related(cls, attr, value), key=self.__order)
+            if after is not None:
+                start = bisect.bisect_right([self.__order(obj)
+                                             for obj in objs], tuple(after))
+                objs = objs[start:]
+            return objs if limit is None else objs[:limit]
+        buckets = self.__index()
+        order = self.__orders.get(name)
+        if order is None:
+            with self.__mutex:
+                if name not in self.__orders:
+                    bucket = buckets.get(name, {})
+                    for key, obj in bucket.items():
+                        self.__order_keys[key] = self.__order(obj)
+                    self.__orders[name] = sorted(self.__order_keys[key]
+                                                 for key in bucket)
+                order = self.__orders[name]
+        start = 0 if after is None else bisect.bisect_right(order,
+                                                            tuple(after))
+        end = len(order) if limit is None else start + limit
+        keys = [name + "." + order_key[1] for order_key in order[start:end]]
+        objs = [(key, self.__objects.get(key)) for key in keys]
+        return [self.__hydrate(key, obj) for key, obj in objs
+                if obj is not None]
+
+    @staticmethod
+    def __order(obj):
+        """return the (created_at, id) pair ordering obj, built or not"""
+        if type(obj) is dict:
+            return (obj.get("created_at", ""), obj.get("id", ""))
+        created_at = getattr(obj, "created_at", "")
+        if type(created_at) is not str:
+            created_at = format_time(created_at)
+        return (created_at, obj.id)
+
+    @staticmethod
+    def __matches(obj, attr, value):
+        """tell if the attribute attr of obj equals or contains value"""
+        current = getattr(obj, attr, None)
+        return current == value or (type(current) is list and
+                                    value in current)
+
+    def __load(self, value):
+        """return the instance described by the dictionary value, or value
+        itself in lazy mode"""
+        return value if self.__lazy else self.__build(value)
+
+    def __build(self, value):
+        """return the instance described by the dictionary value, of the
+        slotted subclass of its class in slotted mode"""
+        cls = classes[value["__class__"]]
+        return (slotted(cls) if self.__slotted else cls)(**value)
+
+    def __hydrate(self, key, obj):
+        """return the instance stored under key, building it from its
+        dictionary and storing it back in every index if needed"""
+        if type(obj) is not dict:
+            return obj
+        with self.__mutex:
+            current = self.__objects.get(key)
+            if current is not obj and current is not None:
+                return self.__hydrate(key, current)
+            obj = self.__build(obj)
+            if current is None:
+                return obj
+            self.__objects[key] = obj
+            self.__classes[key.split('.', 1)[0]][key] = obj
+            for relation in self.__entries.get(key, ()):
+                self.__relations[relation][key] = obj
+        return obj
+
+    @staticmethod
+    def __to_dict(obj):
+        """return the dictionary representation of obj, built or not"""
+        return obj if type(obj) is dict else obj.to_dict()
+
+    def __put(self, key, obj):
+        """store obj under key in __objects and (re)index it"""
+        self.__index()
+        if key in self.__objects:
+            self.__unindex(key)
+        self.__objects[key] = obj
+        name = key.split('.', 1)[0]
+        self.__classes.setdefault(name, {})[key] = obj
+        entries = []
+        for attr in foreign_keys.get(name, ()):
+            if type(obj) is dict:
+                values = obj.get(attr, "")
+            else:
+                values = getattr(obj, attr, None)
+            if type(values) is not list:
+                values = [values]
+            for value in values:
+                try:
+                    relation = self.__relation_keys.setdefault(
+                        (name, attr, value), (name, attr, value))
+                except TypeError:
+                    continue
+                self.__relations.setdefault(relation, {})[key] = obj
+                entries.append(relation)
+        self.__entries[key] = tuple(entries)
+        if name in self.__orders:
+            order_key = self.__order(obj)
+            bisect.insort(self.__orders[name], order_key)
+            self.__order_keys[key] = order_key
+
+    def __remove(self, key):
+        """remove key from __objects and from the indexes"""
+        self.__index()
+        self.__unindex(key)
+        self.__objects.pop(key, None)
+
+    def __unindex(self, key):
+        """drop key from the class, foreign key and order indexes"""
+        name = key.split('.', 1)[0]
+        self.__classes.get(name, {}).pop(key, None)
+        order_key = self.__order_keys.pop(key, None)
+        if order_key is not None and name in self.__orders:
+            order = self.__orders[name]
+            i = bisect.bisect_left(order, order_key)
+            if i < len(order) and order[i] == order_key:
+                del order[i]
+        for relation in self.__entries.pop(key, ()):
+            bucket = self.__relations.get(relation)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self.__relations[relation]
+                    self.__relation_keys.pop(relation, None)
+
+    def __index(self):
+        """return the class buckets, rebuilding every index first if
+        __objects was replaced since they were built"""
+        if FileStorage.__indexed is not self.__objects:
+            with self.__mutex:
+                if FileStorage.__indexed is not self.__objects:
+                    self.__rebuild()
+        return self.__classes
 
-        return len(self.all(cls))
+    def __rebuild(self):
+        """rebuild every index from __objects, __mutex being held"""
+        objects = self.__objects
+        FileStorage.__indexed = objects
+        self.__classes.clear()
+        self.__relations.clear()
+        self.__relation_keys.clear()
+        self.__entries.clear()
+        self.__orders.clear()
+        self.__order_keys.clear()
+        for key, obj in list(objects.items()):
+            self.__put(key, obj)
@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceGrid class
+
+The places of a FileStorage having a latitude and a longitude are
+bucketed into the cells of a grid of cell degrees by cell degrees, so
+that the places near a point or within a bounding box are found among
+those of the few cells overlapping it instead of among every place.
+
+A near filter is a dictionary {"lat", "lng", "radius_km"} of the places
+within radius_km kilometers of the point (great-circle distance), a bbox
+filter a dictionary {"min_lat", "min_lng", "max_lat", "max_lng"} of the
+places within those bounds, min_lng being greater than max_lng for a box
+crossing the antimeridian.
+"""
+
+import math
+from models.engine.columns import PlaceMirror, number
+
+# mean radius of the Earth in kilometers
+earth_radius = 6371.0088
+# side of the cells of the grid in degrees
+cell_degrees = 0.1
+
+
+class PlaceGrid(PlaceMirror):
+    """grid index of the coordinates of the places of a storage, kept in
+    sync like every PlaceMirror"""
+
+    def __init__(self, storage=None, cell=cell_degrees):
+        """Instantiate the grid of the places of storage"""
+        self.cell = cell
+        self.cells = {}
+        self.where = {}
+        super().__init__(storage)
+
+    def store(self, obj_id, place):
+        """Move obj_id to the cell of the coordinates of place, or remove it
+        if place is None or has no coordinates"""
+        if place is None:
+            self.put(obj_id, math.nan, math.nan)
+        else:
+            self.put(obj_id, number(getattr(place, "latitude", None)),
+                     number(getattr(place, "longitude", None)))
+
+    def put(self, obj_id, lat, lng):
+        """Move obj_id to the cell of (lat, lng), removing it if either is
+        NaN"""
+        key = self.where.pop(obj_id, None)
+        if key is not None:
+            cell = self.cells[key]
+            del cell[obj_id]
+            if not cell:
+                del self.cells[key]
+        if lat == lat and lng == lng:
+            key = (math.floor(lat / self.cell), math.floor(lng / self.cell))
+            self.where[obj_id] = key
+            self.cells.setdefault(key, {})[obj_id] = (lat, lng)
+
+    def select(self, near=None, bbox=None):
+        """return the dictionary id: (lat, lng) of the places matching the
+        near and bbox filters"""
+        self.refresh()
+        with self.lock:
+            lats, lngs = bounds(near, bbox)
+            if lats is None:
+                return {}
+            rows = range(math.floor(lats[0] / self.cell),
+                         math.floor(lats[1] / self.cell) + 1)
+            columns = [range(math.floor(low / self.cell),
+                             math.floor(high / self.cell) + 1)
+                       for low, high in lngs]
+            if len(rows) * sum(map(len, columns)) > len(self.cells):
+                cells = [cell for (row, column), cell in self.cells.items()
+                         if row in rows and
+                         any(column in c for c in columns)]
+            else:
+                cells = [self.cells[key] for key in
+                         ((row, column) for row in rows
+                          for c in columns for column in c)
+                         if key in self.cells]
+            return {obj_id: point for cell in cells
+                    for obj_id, point in cell.items()
+                    if within(point[0], point[1], near, bbox)}
+
+
+def distance(lat1, lng1, lat2, lng2):
+    """return the great-circle distance in kilometers between two points"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    h = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) *
+         math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * earth_radius * math.asin(min(1.0, math.sqrt(h)))
+
+
+def lng_ranges(low, high):
+    """return the list of the (low, high) longitude ranges within
+    [-180, 180] covering low to high eastward"""
+    if high - low >= 360:
+        return [(-180.0, 180.0)]
+    if not -180 <= low <= 180:
+        low = (low + 180) % 360 - 180
+    if not -180 <= high <= 180:
+        high = (high + 180) % 360 - 180
+    if low <= high:
+        return [(low, high)]
+    return [(low, 180.0), (-180.0, high)]
+
+
+def bounds(near=None, bbox=None):
+    """return the latitude range and the list of the longitude ranges
+    covering the near and bbox filters, (None, None) if nothing can match"""
+    lats, lngs = (-90.0, 90.0), [(-180.0, 180.0)]
+    if near is not None:
+        angle = near["radius_km"] / earth_radius
+        lat = near["lat"]
+        low, high = lat - math.degrees(angle), lat + math.degrees(angle)
+        lats = (max(low, -90.0), min(high, 90.0))
+        if low > -90 and high < 90 and \
+                math.sin(angle) < math.cos(math.radians(lat)):
+            delta = math.degrees(math.asin(math.sin(angle) /
+                                           math.cos(math.radians(lat))))
+            lngs = lng_ranges(near["lng"] - delta, near["lng"] + delta)
+    if bbox is not None:
+        lats = (max(lats[0], bbox["min_lat"]), min(lats[1], bbox["max_lat"]))
+        lngs = [(max(low, other_low), min(high, other_high))
+                for low, high in lngs
+                for other_low, other_high in lng_ranges(bbox["min_lng"],
+                                                        bbox["max_lng"])
+                if max(low, other_low) <= min(high, other_high)]
+    if lats[0] > lats[1] or not lngs:
+        return None, None
+    return lats, lngs
+
+
+def within(lat, lng, near=None, bbox=None):
+    """return True if (lat, lng) matches the near and bbox filters"""
+    if bbox is not None:
+        if not bbox["min_lat"] <= lat <= bbox["max_lat"]:
+            return False
+        if bbox["min_lng"] <= bbox["max_lng"]:
+            if not bbox["min_lng"] <= lng <= bbox["max_lng"]:
+                return False
+        elif bbox["max_lng"] < lng < bbox["min_lng"]:
+            return False
+    if near is not None:
+        return distance(near["lat"], near["lng"], lat, lng) <= \
+            near["radius_km"]
+    return True
+
+
+def center(near=None, bbox=None):
+    """return the (lat, lng) point the places matching the near and bbox
+    filters are sorted by distance from: that of near, else the center of
+    bbox"""
+    if near is not None:
+        return near["lat"], near["lng"]
+    width = (bbox["max_lng"] - bbox["min_lng"]) % 360
+    lng = (bbox["min_lng"] + width / 2 + 180) % 360 - 180
+    return (bbox["min_lat"] + bbox["max_lat"]) / 2, lng
+
+
+def coordinates(place):
+    """return the (lat, lng) coordinates of place, NaN if not numbers"""
+    return (number(getattr(place, "latitude", None)),
+            number(getattr(place, "longitude", None)))
+
+
+def matches(place, near=None, bbox=None):
+    """return True if the coordinates of place match the near and bbox
+    filters"""
+    lat, lng = coordinates(place)
+    return lat == lat and lng == lng and within(lat, lng, near, bbox)
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Contains the Journal class
+"""
+
+from models import serializer
+import os
+import shutil
+
+
+class Journal:
+    """append-only log of the mutations made since the last snapshot
+
+    Every line is a JSON object {"key": <class name>.id, "value": <dict>}
+    where a null value records the deletion of the key."""
+
+    def __init__(self, path):
+        """Instantiate a Journal writing to path"""
+        self.path = path
+        self.rotated = path + ".1"
+
+    def append(self, records):
+        """append the (key, value) records to the log and fsync it"""
+        lines = b"".join(serializer.dumps({"key": k, "value": v}) + b"\n"
+                         for k, v in records)
+        if not lines:
+            return
+        with open(self.path, 'ab') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def replay(self, offset=None):
+        """yield the (key, value) records of the rotated log then the log,
+        or of the log from the byte offset only if given, stopping a file
+        at its first truncated or malformed line"""
+        paths = (self.rotated, self.path) if offset is None else (self.path,)
+        for path in paths:
+            try:
+                f = open(path, 'rb')
+            except OSError:
+                continue
+            with f:
+                if offset is not None:
+                    f.seek(offset)
+                for line in f:
+                    try:
+                        record = serializer.loads(line)
+                        yield record["key"], record["value"]
+                    except (ValueError, KeyError, TypeError):
+                        break
+
+    def size(self):
+        """return the size in bytes of the log"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def rotate(self):
+        """move the log aside so that a snapshot can be taken of it while
+        new records go to a fresh log"""
+        if not os.path.exists(self.path):
+            return
+        if os.path.exists(self.rotated):
+            with open(self.path, 'rb') as src, open(self.rotated, 'ab') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.rotated)
+
+    def discard(self, rotated_only=False):
+        """remove the rotated log, and the log unless rotated_only"""
+        paths = (self.rotated,) if rotated_only else (self.rotated, self.path)
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
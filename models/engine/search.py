@@ -0,0 +1,224 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceSearch class
+"""
+
+import heapq
+import math
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine import columns, geo
+from models.place import Place
+from models.state import State
+
+# dictionary - <places_search key>: (<Place attribute>, index of its bound)
+range_keys = {"price_min": ("price_by_night", 0),
+              "price_max": ("price_by_night", 1),
+              "min_rooms": ("number_rooms", 0),
+              "min_bathrooms": ("number_bathrooms", 0),
+              "min_guests": ("max_guest", 0)}
+# keys of the near and bbox filters of places_search
+near_keys = ("lat", "lng", "radius_km")
+bbox_keys = ("min_lat", "min_lng", "max_lat", "max_lng")
+# smallest number of places read by each storage.page() call of a scan
+scan_chunk = 100
+
+
+def is_number(value):
+    """return True if value is a finite int or float, not a bool"""
+    return type(value) in (int, float) and math.isfinite(value)
+
+
+def parse_ranges(body):
+    """return the dictionary <attribute>: (low, high) of the range keys of
+    the places_search body, raising ValueError with the key of a value
+    that is not a number"""
+    ranges = {}
+    for key, (name, bound) in range_keys.items():
+        value = body.get(key)
+        if value is None:
+            continue
+        if not is_number(value):
+            raise ValueError(key)
+        bounds = list(ranges.get(name, (None, None)))
+        bounds[bound] = value
+        ranges[name] = tuple(bounds)
+    return ranges
+
+
+def parse_geo(body):
+    """return the near and bbox filters of the places_search body (see
+    models.engine.geo), None when absent, raising ValueError with the key
+    of an invalid one"""
+    filters = []
+    for key, names in (("near", near_keys), ("bbox", bbox_keys)):
+        value = body.get(key)
+        if value is not None:
+            if type(value) is not dict or \
+                    not all(is_number(value.get(name)) for name in names):
+                raise ValueError(key)
+            value = {name: value[name] for name in names}
+            lats = [v for name, v in value.items() if "lat" in name]
+            lngs = [v for name, v in value.items() if "lng" in name]
+            if not all(-90 <= lat <= 90 for lat in lats) or \
+                    not all(-180 <= lng <= 180 for lng in lngs) or \
+                    value.get("radius_km", 0) < 0 or \
+                    value.get("min_lat", 0) > value.get("max_lat", 0):
+                raise ValueError(key)
+        filters.append(value)
+    return tuple(filters)
+
+
+class PlaceSearch:
+    """resolves the places_search filters through the storage indexes
+
+    The places of the states and cities come from the city and place
+    foreign key indexes and every amenity maps to the set of the places
+    having it, so the filters are resolved by intersecting those sets
+    instead of scanning every place. The ranges of numeric attributes and
+    the near and bbox filters are evaluated over the columns and the grid
+    of every place with a file storage, on the places selected by the
+    other filters otherwise."""
+
+    def __init__(self, storage=None):
+        """Instantiate a PlaceSearch over storage, models.storage if None"""
+        self.storage = storage if storage is not None else models.storage
+
+    def search(self, states=(), cities=(), amenities=(), offset=0,
+               limit=None, after=None, ranges=None, near=None, bbox=None):
+        """return the places of the cities and of the cities of the states,
+        or of every city if both are empty, having all the amenities, their
+        attributes within ranges (see parse_ranges()) and matching the near
+        and bbox filters, ordered by creation date then id, coming after
+        the (created_at datetime, id) pair after if given, from offset and
+        up to limit of them
+
+        With near or bbox, the places are ordered by their distance from
+        the point of near, else from the center of bbox, and after is that
+        of the last place of the previous page, nothing following it if
+        that place no longer matches.
+
+        Without filters, or with ranges only when no PlaceColumns covers
+        the storage, the places are read in order through storage.page()
+        from the cursor on, so that the database applies the limit. The
+        places of the other filters are only partially sorted, for the
+        first offset + limit of them."""
+        stop = None if limit is None else offset + limit
+        if near is None and bbox is None and not (
+                states or cities or amenities) and (
+                not ranges or columns.PlaceColumns.of(self.storage) is None):
+            return self.scan(ranges, after, stop)[offset:]
+        places = self.places(states, cities, amenities, ranges, near, bbox)
+        if near is None and bbox is None:
+            keys = ((place.created_at, place.id) for place in places.values())
+            if after is not None:
+                after = tuple(after)
+                keys = (key for key in keys if key > after)
+        else:
+            lat, lng = geo.center(near, bbox)
+            keys = [(geo.distance(lat, lng, *geo.coordinates(place)),
+                     place.created_at, place.id)
+                    for place in places.values()]
+            if after is not None:
+                last = next((key for key in keys if key[-1] == after[1]),
+                            None)
+                keys = [] if last is None else [key for key in keys
+                                                if key > last]
+        order = sorted(keys) if stop is None else heapq.nsmallest(stop, keys)
+        return [places[key[-1]] for key in order[offset:]]
+
+    def scan(self, ranges=None, after=None, limit=None):
+        """return up to limit places whose attributes are within ranges,
+        ordered by creation date then id and coming after the
+        (created_at datetime, id) pair after if given, read from
+        storage.page() a chunk at a time"""
+        if not ranges:
+            return self.storage.page(Place, limit, after)
+        size = None if limit is None else max(2 * limit, scan_chunk)
+        places = []
+        while limit is None or len(places) < limit:
+            chunk = self.storage.page(Place, size, after)
+            places += [place for place in chunk
+                       if columns.matches(place, ranges)]
+            if size is None or len(chunk) < size:
+                break
+            after = (chunk[-1].created_at, chunk[-1].id)
+        return places if limit is None else places[:limit]
+
+    def places(self, states=(), cities=(), amenities=(), ranges=None,
+               near=None, bbox=None):
+        """return the dictionary id: place of the places matching the
+        filters, in no particular order"""
+        sets = [self.amenity_places(amenity_id) for amenity_id in amenities]
+        if states or cities:
+            sets.append(self.city_places(states, cities))
+        selected = []
+        checks = []
+        if ranges:
+            place_columns = columns.PlaceColumns.of(self.storage)
+            if place_columns is None:
+                checks.append(lambda place: columns.matches(place, ranges))
+            else:
+                selected.append(place_columns.select(ranges))
+        if near is not None or bbox is not None:
+            grid = geo.PlaceGrid.of(self.storage)
+            if grid is None:
+                checks.append(lambda place: geo.matches(place, near, bbox))
+            else:
+                selected.append(grid.select(near, bbox))
+        if not sets and not selected:
+            places = {place.id: place
+                      for place in self.storage.all(Place).values()}
+        else:
+            sets = sorted(sets + selected, key=len)
+            smallest, others = sets[0], sets[1:]
+            if any(smallest is ids for ids in selected):
+                smallest = self.get_places(smallest)
+            places = {place_id: place for place_id, place in smallest.items()
+                      if all(place_id in other for other in others)}
+        for check in checks:
+            places = {place_id: place for place_id, place in places.items()
+                      if check(place)}
+        return places
+
+    def get_places(self, ids):
+        """return the dictionary id: place of the places of ids"""
+        places = {}
+        for place_id in ids:
+            place = self.storage.get(Place, place_id)
+            if place is not None:
+                places[place_id] = place
+        return places
+
+    def city_places(self, states=(), cities=()):
+        """return the dictionary id: place of the places of the cities and
+        of the cities of the states, each state or city being loaded with
+        its cities and places at once, ids that are not strings matching
+        nothing"""
+        places = {}
+        for state_id in states:
+            if type(state_id) is not str:
+                continue
+            state = self.storage.get(State, state_id, load=["cities.places"])
+            if state is not None:
+                for city in state.cities:
+                    places.update((place.id, place) for place in city.places)
+        for city_id in cities:
+            if type(city_id) is not str:
+                continue
+            city = self.storage.get(City, city_id, load=["places"])
+            if city is not None:
+                places.update((place.id, place) for place in city.places)
+        return places
+
+    def amenity_places(self, amenity_id):
+        """return the dictionary id: place of the places having the
+        amenity, none if its id is not a string"""
+        if type(amenity_id) is not str:
+            return {}
+        amenity = self.storage.get(Amenity, amenity_id,
+                                   load=["place_amenities"])
+        if amenity is None:
+            return {}
+        return {place.id: place for place in amenity.place_amenities}
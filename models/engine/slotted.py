@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Contains the SlottedModel class
+
+In slotted mode (HBNB_FILE_SLOTS=1) FileStorage loads every object as an
+instance of slotted(<its class>), a subclass of the same name keeping
+the attributes declared by the class in slots rather than in a
+dictionary, the id as its 16 bytes and the foreign keys interned, so
+that the objects referring to the same one share its id. Attributes the
+class does not declare still go to the instance dictionary.
+"""
+
+from models.base_model import BaseModel
+import sys
+import uuid
+
+# attributes kept in the slots of every slotted class
+base_slots = ("_id", "created_at", "updated_at")
+# dictionary - <class>: its slotted subclass
+slotted_classes = {}
+
+
+class SlottedModel:
+    """mixin of the slotted subclasses of the models, presenting their
+    slots and instance dictionary as __dict__ so that to_dict() and
+    __str__ are those of BaseModel"""
+    __slots__ = ()
+    # dictionary - <slot>: default value of the model class
+    defaults = {}
+
+    @property
+    def id(self):
+        """the id, stored as the 16 bytes of its UUID when it is one"""
+        value = self._id
+        return value if type(value) is str else str(uuid.UUID(bytes=value))
+
+    @id.setter
+    def id(self, value):
+        """store the id as the 16 bytes of its UUID if it is one"""
+        try:
+            parsed = uuid.UUID(value)
+        except (TypeError, ValueError, AttributeError):
+            self._id = value
+            return
+        self._id = parsed.bytes if str(parsed) == value else value
+
+    @property
+    def __dict__(self):
+        """the attributes set on the instance, slots then dictionary"""
+        attrs = {"id": self.id}
+        for name in type(self).__slots__:
+            if name != "_id":
+                try:
+                    attrs[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        attrs.update(instance_dict(self))
+        return attrs
+
+    def __getattr__(self, name):
+        """return the class default of the declared attribute name, which
+        was never set on the instance"""
+        try:
+            return type(self).defaults[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        """set the attribute, interning the ids of foreign keys"""
+        if name.endswith("_id") and type(value) is str:
+            value = sys.intern(value)
+        elif name.endswith("_ids") and type(value) is list:
+            value = [sys.intern(v) if type(v) is str else v for v in value]
+        super().__setattr__(name, value)
+
+
+# descriptor of the actual instance dictionary, shadowed by __dict__
+instance_dict = vars(BaseModel)["__dict__"].__get__
+
+
+def slotted(cls):
+    """return the slotted subclass of the model class cls"""
+    subclass = slotted_classes.get(cls)
+    if subclass is None:
+        defaults = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if (not name.startswith("_") and
+                        type(value) in (str, int, float, bool, list)):
+                    defaults[name] = value
+        subclass = type(cls.__name__, (SlottedModel, cls), {
+            "__slots__": base_slots + tuple(defaults),
+            "__module__": cls.__module__, "__qualname__": cls.__qualname__,
+            "__doc__": cls.__doc__, "defaults": defaults})
+        slotted_classes[cls] = subclass
+    return subclass
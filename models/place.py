@@ -61,12 +61,7 @@ class Place(BaseModel, Base):
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return models.storage.related(Review, "place_id", self.id)
 
         @property
         def amenities(self):
@@ -76,6 +71,6 @@ class Place(BaseModel, Base):
         @amenities.setter
         def amenities(self, new_amenity):
             """append new Amenity's id to the attribute amenity_ids."""
-            if type(new_amenity) == Amenity:
+            if isinstance(new_amenity, Amenity):
                 if new_amenity.id not in self.amenity_ids:
-                    self.amenity_ids.append(new_amenity.id)
+                    self.amenity_ids = self.amenity_ids + [new_amenity.id]
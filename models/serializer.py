@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+"""
+JSON encoding shared by the storage engines and the API
+
+The fastest installed backend is used: orjson, then ujson, then the
+standard library json module. Every backend produces the same compact
+UTF-8 output so files and responses do not depend on the one in use,
+with one exception: the floats of magnitude below 1e-4 or from 1e16 are
+written in the notation of the backend (orjson writes 0.00001 and 1e16
+where json writes 1e-05 and 1e+16), which every backend decodes to the
+same value. NaN and infinities, which the backends would write
+differently or as null, are rejected by all of them with ValueError.
+The HBNB_JSON_BACKEND environment variable forces a backend.
+"""
+
+import json
+import math
+from json.decoder import WHITESPACE, scanstring
+from os import getenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+backends = [name for name, module in (("orjson", orjson), ("ujson", ujson))
+            if module is not None] + ["json"]
+backend = None
+# types of the values holding no float
+scalars = {str, int, bool, type(None)}
+
+
+def use(name):
+    """select the backend called name, which must be installed"""
+    global backend
+    if name not in backends:
+        raise ValueError("JSON backend {} is not available".format(name))
+    backend = name
+
+
+def dumps(obj, sort_keys=False, default=None):
+    """return obj encoded as compact UTF-8 JSON bytes"""
+    if backend == "orjson":
+        option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME |
+                  orjson.OPT_PASSTHROUGH_DATACLASS)
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            data = orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            pass
+        else:
+            if b"null" in data and not finite(obj, default):
+                raise ValueError("Out of range float values are not JSON "
+                                 "compliant")
+            return data
+    elif backend == "ujson" and default is None:
+        try:
+            return ujson.dumps(obj, ensure_ascii=False, sort_keys=sort_keys,
+                               escape_forward_slashes=False,
+                               allow_nan=False).encode()
+        except (TypeError, OverflowError):
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"),
+                      sort_keys=sort_keys, default=default,
+                      allow_nan=False).encode()
+
+
+def finite(obj, default=None):
+    """return False if obj, or the objects default encodes it as, is or
+    contains a NaN or infinite float, which orjson writes as null"""
+    stack = [[obj]]
+    while stack:
+        for value in stack.pop():
+            kind = type(value)
+            if kind is float:
+                if value - value != 0:
+                    return False
+            elif kind is dict:
+                stack.append(value.values())
+            elif kind is list or kind is tuple:
+                stack.append(value)
+            elif kind not in scalars:
+                if isinstance(value, float):
+                    if not math.isfinite(value):
+                        return False
+                elif isinstance(value, dict):
+                    stack.append(value.values())
+                elif isinstance(value, (list, tuple)):
+                    stack.append(value)
+                elif default is not None and not isinstance(value,
+                                                            (str, int)):
+                    try:
+                        stack.append([default(value)])
+                    except TypeError:
+                        pass
+    return True
+
+
+def reject_constant(name):
+    """reject the NaN, Infinity and -Infinity the json module accepts,
+    like the other backends"""
+    raise ValueError("Invalid JSON constant {}".format(name))
+
+
+def loads(data):
+    """return the object decoded from the JSON str or bytes data"""
+    if backend == "orjson":
+        return orjson.loads(data)
+    if backend == "ujson":
+        return ujson.loads(data)
+    return json.loads(data, parse_constant=reject_constant)
+
+
+def dump(obj, f):
+    """write obj encoded as JSON to the binary file f"""
+    f.write(dumps(obj))
+
+
+def load(f):
+    """return the object decoded from the JSON in the binary file f"""
+    return loads(f.read())
+
+
+def iterload(f, chunk_size=1 << 20):
+    """yield the (key, value) pairs of the JSON object in the text file f
+    one at a time, reading it by chunks instead of as a whole"""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    expected = "{"
+    while True:
+        match = WHITESPACE.match(buf, pos)
+        pos = match.end()
+        try:
+            if pos == len(buf):
+                raise IndexError
+            if expected == "{":
+                if buf[pos] != "{":
+                    raise ValueError("Expecting '{' at the start of the file")
+                pos, expected = pos + 1, "key"
+            elif expected == "key" and buf[pos] == "}":
+                return
+            elif expected == "key":
+                if buf[pos] != '"':
+                    raise ValueError("Expecting a key at {}".format(pos))
+                key, end = scanstring(buf, pos + 1)
+                end = WHITESPACE.match(buf, end).end()
+                if buf[end] != ":":
+                    raise ValueError("Expecting ':' at {}".format(end))
+                end = WHITESPACE.match(buf, end + 1).end()
+                value, end = decoder.raw_decode(buf, end)
+                end = WHITESPACE.match(buf, end).end()
+                if buf[end] not in ",}":
+                    raise ValueError("Expecting ',' at {}".format(end))
+                pos = end if buf[end] == "}" else end + 1
+                yield key, value
+        except (IndexError, ValueError):
+            if eof:
+                raise ValueError("Truncated or malformed JSON object")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+
+
+use(getenv("HBNB_JSON_BACKEND") or backends[0])
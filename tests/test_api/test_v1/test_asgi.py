@@ -0,0 +1,260 @@
+#!/usr/bin/python3
+"""
+Contains the TestAsgiDocs and TestAsgi classes
+"""
+
+from api.v1 import asgi
+from api.v1.app import app
+import asyncio
+from datetime import datetime
+import inspect
+import models
+from models import serializer
+from models.amenity import Amenity
+from models.city import City
+from models.engine.async_storage import async_storage
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+App = asgi.App
+
+
+class TestAsgiDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the ASGI app"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.asgi_f = inspect.getmembers(asgi, inspect.isfunction)
+        cls.app_f = inspect.getmembers(App, inspect.isfunction)
+
+    def test_pep8_conformance_asgi(self):
+        """Test that api/v1/asgi.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/asgi.py',
+                                    'tests/test_api/test_v1/test_asgi.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_asgi_module_docstring(self):
+        """Test for the asgi.py module docstring"""
+        self.assertIsNot(asgi.__doc__, None,
+                         "asgi.py needs a docstring")
+        self.assertTrue(len(asgi.__doc__) >= 1,
+                        "asgi.py needs a docstring")
+
+    def test_app_class_docstring(self):
+        """Test for the App class docstring"""
+        self.assertIsNot(App.__doc__, None,
+                         "App class needs a docstring")
+        self.assertTrue(len(App.__doc__) >= 1,
+                        "App class needs a docstring")
+
+    def test_asgi_func_docstrings(self):
+        """Test for the presence of docstrings in asgi.py functions and
+        App methods"""
+        for func in self.asgi_f + self.app_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestAsgi(unittest.TestCase):
+    """Test that the ASGI app answers like the Flask app"""
+    @classmethod
+    def setUpClass(cls):
+        """Create the ASGI app on the AsyncStorage of models.storage,
+        skipping the tests when its asynchronous driver is missing"""
+        try:
+            cls.app = App(async_storage())
+        except ImportError as e:
+            raise unittest.SkipTest(str(e))
+        cls.loop = asyncio.new_event_loop()
+        cls.loop.run_until_complete(cls.app.storage.reload())
+
+    @classmethod
+    def tearDownClass(cls):
+        """Close the storage of the ASGI app"""
+        cls.loop.run_until_complete(cls.app.storage.close())
+        cls.loop.close()
+
+    def setUp(self):
+        """Save a state, a city, a user, a place and an amenity"""
+        self.client = app.test_client()
+        self.state = State(name="Asgi")
+        self.state.created_at = datetime(1999, 1, 1)
+        self.other = State(name="Other")
+        self.other.created_at = datetime(1999, 1, 2)
+        self.city = City(name="Town", state_id=self.state.id)
+        self.user = User(email="asgi@hbnb.io", password="pwd")
+        self.place = Place(name="Home", city_id=self.city.id,
+                           user_id=self.user.id, price_by_night=100)
+        self.amenity = Amenity(name="Wifi")
+        if models.storage_t == 'db':
+            self.place.amenities.append(self.amenity)
+        else:
+            self.place.amenities = self.amenity
+        self.objs = [self.state, self.other, self.city, self.user,
+                     self.place, self.amenity]
+        for obj in self.objs:
+            models.storage.new(obj)
+        models.storage.save()
+
+    def tearDown(self):
+        """Delete the saved objects"""
+        models.storage.close()
+        for obj in reversed(self.objs):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def asgi(self, method, path, body=None):
+        """Return the (status, JSON, Link header) response of the ASGI app
+        to the request"""
+        path, _, query = path.partition('?')
+        scope = {'type': 'http', 'method': method, 'scheme': 'http',
+                 'path': path, 'query_string': query.encode(),
+                 'headers': [(b'host', b'localhost')]}
+        messages = []
+
+        async def receive():
+            """return the request body"""
+            return {'type': 'http.request', 'body': body or b''}
+
+        async def send(message):
+            """keep the response message"""
+            messages.append(message)
+
+        self.loop.run_until_complete(self.app(scope, receive, send))
+        headers = dict(messages[0]['headers'])
+        link = headers.get(b'link')
+        return (messages[0]['status'], serializer.loads(messages[1]['body']),
+                None if link is None else link.decode())
+
+    def flask(self, method, path, body=None):
+        """Return the (status, JSON, Link header) response of the Flask
+        app to the request"""
+        response = self.client.open(path, method=method, data=body,
+                                    content_type='application/json')
+        return (response.status_code, response.get_json(),
+                response.headers.get('Link'))
+
+    def assertSameResponses(self, requests):
+        """Assert that both apps answer the (method, path, body) requests
+        alike, returning the responses"""
+        responses = []
+        for method, path, body in requests:
+            with self.subTest(method=method, path=path, body=body):
+                response = self.flask(method, '/api/v1' + path, body)
+                self.assertEqual(self.asgi(method, '/api/v1' + path, body),
+                                 response)
+                responses.append(response)
+        return responses
+
+    def test_reads(self):
+        """Test the responses of the GET endpoints"""
+        self.assertSameResponses([('GET', path, None) for path in (
+            '/status', '/stats', '/states', '/states/',
+            '/states?fields=name,id', '/states?limit=x',
+            '/states/' + self.state.id, '/states/' + self.state.id +
+            '/cities', '/cities/' + self.city.id + '/places',
+            '/places/' + self.place.id + '/amenities',
+            '/places/' + self.place.id, '/users/' + self.user.id,
+            '/amenities/' + self.amenity.id)])
+
+    def test_not_found(self):
+        """Test the 404 errors"""
+        responses = self.assertSameResponses([
+            ('GET', '/nowhere', None), ('GET', '/states/nope', None),
+            ('GET', '/states/nope/cities', None),
+            ('PUT', '/cities/nope', b'{}'),
+            ('DELETE', '/places/nope', None),
+            ('POST', '/cities/{}/places'.format(self.city.id),
+             b'{"user_id": "nope", "name": "x"}'),
+            ('POST', '/places/{}/amenities/nope'.format(self.place.id),
+             None)])
+        for status, body, _ in responses:
+            self.assertEqual((status, body), (404, {"error": "Not found"}))
+
+    def test_bad_requests(self):
+        """Test the 400 errors, which change nothing"""
+        count = models.storage.count()
+        responses = self.assertSameResponses([
+            ('POST', '/states', b'not json'), ('POST', '/states', b'[]'),
+            ('POST', '/states', b'{}'),
+            ('POST', '/states/{}/cities'.format(self.state.id), b'{}'),
+            ('POST', '/cities/{}/places'.format(self.city.id),
+             b'{"name": "x"}'),
+            ('PUT', '/states/' + self.state.id, b'not json'),
+            ('POST', '/states/batch', b'{"create": {"name": "x"}}'),
+            ('GET', '/states?limit=0', None),
+            ('GET', '/states?cursor=!', None),
+            ('POST', '/places_search', b'[]'),
+            ('POST', '/places_search?offset=-1', b'{}'),
+            ('POST', '/places_search?cursor=!', b'{}'),
+            ('POST', '/places_search', b'{"price_min": "x"}')])
+        self.assertEqual([body for _, body, _ in responses], [
+            {"error": error} for error in (
+                "Not a JSON", "Not a JSON", "Missing name", "Missing name",
+                "Missing user_id", "Not a JSON", "Not a list",
+                "Invalid limit", "Invalid cursor", "Not a JSON",
+                "Invalid offset", "Invalid cursor", "Invalid price_min")])
+        self.assertEqual({status for status, _, _ in responses}, {400})
+        models.storage.close()
+        self.assertEqual(models.storage.count(), count)
+
+    def test_cursor_pagination(self):
+        """Test that the pages and their Link headers are the same"""
+        link = self.assertSameResponses([('GET', '/states?limit=1', None)])
+        while link[0][2] is not None:
+            path = link[0][2].split('<', 1)[1].split('>', 1)[0]
+            link = self.assertSameResponses([
+                ('GET', path.split('/api/v1', 1)[1], None)])
+        search = '/places_search?limit=1'
+        link = self.assertSameResponses([('POST', search, b'{}')])
+        while link[0][2] is not None:
+            path = link[0][2].split('<', 1)[1].split('>', 1)[0]
+            link = self.assertSameResponses([
+                ('POST', path.split('/api/v1', 1)[1], b'{}')])
+
+    def test_places_search(self):
+        """Test the responses of places_search"""
+        responses = self.assertSameResponses([
+            ('POST', '/places_search', body.encode()) for body in (
+                '{}', '{{"states": ["{}"]}}'.format(self.state.id),
+                '{{"cities": ["{}"], "amenities": ["{}"]}}'.format(
+                    self.city.id, self.amenity.id),
+                '{"price_min": 50, "price_max": 150}',
+                '{"price_min": 150}')])
+        self.assertIn(self.place.id, [p["id"] for p in responses[1][1]])
+        self.assertEqual(responses[2][1], responses[1][1])
+        self.assertIn(self.place.id, [p["id"] for p in responses[3][1]])
+        self.assertNotIn(self.place.id, [p["id"] for p in responses[4][1]])
+
+    def test_crud(self):
+        """Test that creating, updating and deleting an object gives the
+        same responses but for the id and times of the object"""
+        results = []
+        for call in (self.flask, self.asgi):
+            status, state, _ = call('POST', '/api/v1/states',
+                                    b'{"name": "Crud"}')
+            id = state["id"]
+            path = '/api/v1/states/' + id
+            responses = [(status, state), call(
+                'PUT', path, b'{"name": "Renamed", "id": "x"}')[:2]]
+            responses += [call('GET', path)[:2], call('DELETE', path)[:2],
+                          call('GET', path)[:2]]
+            for _, body in responses:
+                if body.get("id") == id:
+                    for key in ("id", "created_at", "updated_at"):
+                        del body[key]
+            results.append(responses)
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[0], [
+            (201, {"__class__": "State", "name": "Crud"}),
+            (200, {"__class__": "State", "name": "Renamed"}),
+            (200, {"__class__": "State", "name": "Renamed"}),
+            (200, {}), (404, {"error": "Not found"})])
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Contains the TestResponseCacheDocs and TestResponseCache classes
+"""
+
+from api.v1 import cache
+from api.v1.app import app
+import inspect
+import models
+from models.state import State
+import os
+import pep8
+import time
+import unittest
+ResponseCache = cache.ResponseCache
+
+
+class TestResponseCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ResponseCache class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = inspect.getmembers(ResponseCache, inspect.isfunction)
+
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/cache.py',
+                                    'tests/test_api/test_v1/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_cache_class_docstring(self):
+        """Test for the ResponseCache class docstring"""
+        self.assertIsNot(ResponseCache.__doc__, None,
+                         "ResponseCache class needs a docstring")
+        self.assertTrue(len(ResponseCache.__doc__) >= 1,
+                        "ResponseCache class needs a docstring")
+
+    def test_cache_func_docstrings(self):
+        """Test for the presence of docstrings in ResponseCache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the response cache of the app"""
+    def setUp(self):
+        """Save a state"""
+        self.client = app.test_client()
+        self.ttl = cache.cache.ttl
+        self.state = State(name="Cached")
+        models.storage.new(self.state)
+        models.storage.save()
+        self.url = '/api/v1/states/' + self.state.id
+
+    def tearDown(self):
+        """Delete the state and restore the TTL"""
+        cache.cache.ttl = self.ttl
+        models.storage.close()
+        state = models.storage.get(State, self.state.id)
+        if state is not None:
+            models.storage.delete(state)
+            models.storage.save()
+
+    def name(self):
+        """Return the name of the state served by the app"""
+        return self.client.get(self.url).get_json()["name"]
+
+    def rename(self, name):
+        """Rename the state from another process, working on the storage
+        shared by share() before the fork, and wait for it"""
+        pid = os.fork()
+        if pid == 0:
+            try:
+                models.storage.close()
+                state = models.storage.get(State, self.state.id)
+                state.name = name
+                models.storage.bulk_update([(state, {})])
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+
+    def test_local_write_invalidates(self):
+        """Test that a write of the process drops its cached responses"""
+        self.assertEqual(self.name(), "Cached")
+        etag = self.client.get(self.url).headers["ETag"]
+        self.assertEqual(self.client.get(self.url, headers={
+            "If-None-Match": etag}).status_code, 304)
+        self.state.name = "Renamed"
+        models.storage.new(self.state)
+        models.storage.save()
+        self.assertEqual(self.client.get(self.url, headers={
+            "If-None-Match": etag}).status_code, 200)
+        self.assertEqual(self.name(), "Renamed")
+
+    def test_other_process_write_invalidates(self):
+        """Test that a write of another process, through its own storage,
+        drops the cached responses, at once with the file storage and
+        after the shared TTL with DBStorage"""
+        cache.share(1)
+        self.assertEqual(cache.cache.ttl, self.ttl)
+        shared_ttl, cache.shared_ttl = cache.shared_ttl, 0.2
+        try:
+            cache.share(2)
+        finally:
+            cache.shared_ttl = shared_ttl
+        self.assertEqual(self.name(), "Cached")
+        self.assertEqual(self.name(), "Cached")
+        models.storage.share()
+        self.rename("Elsewhere")
+        if models.storage_t == 'db':
+            self.assertEqual(cache.cache.ttl, 0.2)
+            time.sleep(0.25)
+        self.assertEqual(self.name(), "Elsewhere")
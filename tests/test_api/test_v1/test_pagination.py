@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+from api.v1 import pagination
+from api.v1.app import app
+import base64
+from datetime import datetime
+import inspect
+import models
+from models.state import State
+import pep8
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pagination_f = inspect.getmembers(pagination, inspect.isfunction)
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/pagination.py',
+                                    'tests/test_api/test_v1/'
+                                    'test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_module_docstring(self):
+        """Test for the pagination.py module docstring"""
+        self.assertIsNot(pagination.__doc__, None,
+                         "pagination.py needs a docstring")
+        self.assertTrue(len(pagination.__doc__) >= 1,
+                        "pagination.py needs a docstring")
+
+    def test_pagination_func_docstrings(self):
+        """Test for the presence of docstrings in pagination functions"""
+        for func in self.pagination_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+def token(text):
+    """Return the cursor encoding text"""
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+class TestPagination(unittest.TestCase):
+    """Test the cursor pagination of the list endpoints"""
+    def setUp(self):
+        """Save three states created one second apart"""
+        self.client = app.test_client()
+        self.states = []
+        for i in range(3):
+            state = State(name="Page {}".format(i))
+            state.created_at = datetime(1999, 1, 1, 0, 0, i)
+            models.storage.new(state)
+            self.states.append(state)
+        models.storage.save()
+
+    def tearDown(self):
+        """Delete the states"""
+        for state in self.states:
+            models.storage.delete(state)
+        models.storage.save()
+
+    def test_cursor(self):
+        """Test that the Link header leads to the next page"""
+        response = self.client.get('/api/v1/states?limit=2')
+        self.assertEqual([state["id"] for state in response.get_json()],
+                         [state.id for state in self.states[:2]])
+        link = response.headers["Link"].split("<", 1)[1].split(">", 1)[0]
+        response = self.client.get(link)
+        self.assertEqual(response.get_json()[0]["id"], self.states[2].id)
+
+    def test_decode_cursor(self):
+        """Test that a cursor decodes to the datetime and id it encodes"""
+        with app.test_request_context():
+            self.assertEqual(pagination.decode_cursor(
+                pagination.encode_cursor(self.states[1])),
+                (self.states[1].created_at, self.states[1].id))
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor, or one whose date is not in the
+        time format, is a 400 error"""
+        for cursor in ("!", token("no-space"), token("yesterday abc"),
+                       token("2017-01-01T00:00:00.000000+05:00 abc")):
+            with self.subTest(cursor=cursor):
+                for response in (
+                        self.client.get('/api/v1/states?cursor=' + cursor),
+                        self.client.post('/api/v1/places_search?limit=1&'
+                                         'cursor=' + cursor, json={})):
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn(b"Invalid cursor", response.data)
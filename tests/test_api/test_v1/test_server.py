@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Contains the TestServerDocs and TestServer classes
+"""
+
+from api.v1 import server
+import inspect
+import pep8
+import signal
+import unittest
+from unittest import mock
+
+
+class TestServerDocs(unittest.TestCase):
+    """Tests to check the documentation and style of server module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.server_f = inspect.getmembers(server, inspect.isfunction)
+
+    def test_pep8_conformance_server(self):
+        """Test that api/v1/server.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/server.py',
+                                    'tests/test_api/test_v1/test_server.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_server_module_docstring(self):
+        """Test for the server.py module docstring"""
+        self.assertIsNot(server.__doc__, None,
+                         "server.py needs a docstring")
+        self.assertTrue(len(server.__doc__) >= 1,
+                        "server.py needs a docstring")
+
+    def test_server_func_docstrings(self):
+        """Test for the presence of docstrings in server functions"""
+        for func in self.server_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestServer(unittest.TestCase):
+    """Test the server of the app"""
+    def setUp(self):
+        """Save the signal handlers"""
+        self.handlers = {signum: signal.getsignal(signum)
+                         for signum in (signal.SIGINT, signal.SIGTERM)}
+
+    def tearDown(self):
+        """Restore the signal handlers"""
+        for signum, handler in self.handlers.items():
+            signal.signal(signum, handler)
+
+    def test_single_process_keeps_sigint(self):
+        """Test that without workers Ctrl+C still stops the server"""
+        with mock.patch.object(server, "make_server") as make_server:
+            server.serve("127.0.0.1", 0, 1)
+        make_server.return_value.serve_forever.assert_called_once_with()
+        self.assertIs(signal.getsignal(signal.SIGINT),
+                      self.handlers[signal.SIGINT])
+        self.assertIsNot(signal.getsignal(signal.SIGTERM),
+                         self.handlers[signal.SIGTERM])
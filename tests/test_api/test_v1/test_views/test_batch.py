@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatchDocs and TestBatch classes
+"""
+
+from api.v1.app import app
+from api.v1.views import batch
+import inspect
+import models
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of batch module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.batch_f = inspect.getmembers(batch, inspect.isfunction)
+
+    def test_pep8_conformance_batch(self):
+        """Test that api/v1/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/batch.py',
+                                    'tests/test_api/test_v1/test_views/'
+                                    'test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_batch_module_docstring(self):
+        """Test for the batch.py module docstring"""
+        self.assertIsNot(batch.__doc__, None,
+                         "batch.py needs a docstring")
+        self.assertTrue(len(batch.__doc__) >= 1,
+                        "batch.py needs a docstring")
+
+    def test_batch_func_docstrings(self):
+        """Test for the presence of docstrings in batch functions"""
+        for func in self.batch_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestBatch(unittest.TestCase):
+    """Test the batch endpoint"""
+    def setUp(self):
+        """Save a state and one of its cities"""
+        self.client = app.test_client()
+        self.state = State(name="Batch")
+        self.city = City(name="Old", state_id=self.state.id)
+        models.storage.new(self.state)
+        models.storage.new(self.city)
+        models.storage.save()
+
+    def tearDown(self):
+        """Delete the state and its cities"""
+        for city in models.storage.all(City).values():
+            if city.state_id == self.state.id:
+                models.storage.delete(city)
+        models.storage.delete(self.state)
+        models.storage.save()
+
+    def post(self, body):
+        """Return the response of the batch of cities body"""
+        return self.client.post('/api/v1/cities/batch', json=body)
+
+    def test_batch(self):
+        """Test that the changes of a batch are applied at once"""
+        response = self.post({
+            "create": [{"name": "New", "state_id": self.state.id}],
+            "update": [{"id": self.city.id, "name": "Renamed"}]})
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body["created"][0]["name"], "New")
+        self.assertEqual(body["updated"][0]["name"], "Renamed")
+        self.assertEqual(models.storage.get(City, self.city.id).name,
+                         "Renamed")
+        response = self.post({"delete": [self.city.id]})
+        self.assertEqual(response.get_json()["deleted"], [self.city.id])
+        self.assertIsNone(models.storage.get(City, self.city.id))
+
+    def test_invalid_entries(self):
+        """Test that invalid entries are 400 or 404 errors changing
+        nothing, ids and foreign keys of another type included"""
+        for body, status in (
+                ({"update": [{"id": 5}]}, 404),
+                ({"update": [{"name": "x"}]}, 404),
+                ({"create": [{"name": "x", "state_id": 5}]}, 404),
+                ({"create": [{"name": "x", "state_id": "unknown"}]}, 404),
+                ({"create": [{"name": "x"}]}, 400),
+                ({"delete": [["list"]]}, 404),
+                ({"create": {"name": "x"}}, 400),
+                ({"create": [{"name": "x", "state_id": self.state.id}],
+                  "update": [{"id": 5}]}, 404)):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, status)
+        self.assertEqual([city.name for city in
+                          models.storage.all(City).values()
+                          if city.state_id == self.state.id], ["Old"])
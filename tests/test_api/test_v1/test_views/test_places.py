@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs, TestPlacesSearch and TestPlacesStatements
+classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of places module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.places_f = inspect.getmembers(places, inspect.isfunction)
+
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py',
+                                    'tests/test_api/test_v1/test_views/'
+                                    'test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_module_docstring(self):
+        """Test for the places.py module docstring"""
+        self.assertIsNot(places.__doc__, None,
+                         "places.py needs a docstring")
+        self.assertTrue(len(places.__doc__) >= 1,
+                        "places.py needs a docstring")
+
+    def test_places_func_docstrings(self):
+        """Test for the presence of docstrings in places functions"""
+        for func in self.places_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestPlacesSearch(unittest.TestCase):
+    """Test the places_search endpoint"""
+    def setUp(self):
+        """Save a place in a city of a state"""
+        self.client = app.test_client()
+        self.state = State(name="Search")
+        self.city = City(name="Town", state_id=self.state.id)
+        self.user = User(email="search@hbnb.io", password="pwd")
+        self.place = Place(name="Home", city_id=self.city.id,
+                           user_id=self.user.id)
+        self.objs = [self.state, self.city, self.user, self.place]
+        for obj in self.objs:
+            models.storage.new(obj)
+        models.storage.save()
+
+    def tearDown(self):
+        """Delete the saved objects"""
+        models.storage.close()
+        for obj in reversed(self.objs):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def search(self, body):
+        """Return the response of places_search to body"""
+        return self.client.post('/api/v1/places_search', json=body)
+
+    def test_ids_not_strings(self):
+        """Test that ids that are not strings match nothing"""
+        for body in ({"states": [1]}, {"cities": [1]}, {"amenities": [1]},
+                     {"cities": [{"id": self.city.id}]},
+                     {"cities": [None], "amenities": [[]]}):
+            with self.subTest(body=body):
+                response = self.search(body)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.get_json(), [])
+        response = self.search({"cities": [1, self.city.id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p["id"] for p in response.get_json()],
+                         [self.place.id])
+
+    def test_ids_not_a_list(self):
+        """Test that states, cities or amenities that are not a list are
+        a 400 error"""
+        for body in ({"states": 1}, {"cities": self.city.id},
+                     {"amenities": {"id": 1}}):
+            with self.subTest(body=body):
+                response = self.search(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.get_json(),
+                                 {"error": "Not a list"})
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestPlacesStatements(unittest.TestCase):
+    """Test that the queries of the place views do not grow with the
+    number of places and amenities they return"""
+    def setUp(self):
+        """Save amenities, and places linked to all of them in cities of
+        a state"""
+        self.client = app.test_client()
+        self.state = State(name="Statements")
+        self.user = User(email="statements@hbnb.io", password="pwd")
+        self.amenities = [Amenity(name="A{}".format(i)) for i in range(3)]
+        self.objs = [self.state, self.user] + self.amenities
+        for obj in self.objs:
+            models.storage.new(obj)
+        self.places = []
+        self.add_places(2)
+
+    def tearDown(self):
+        """Delete the saved objects"""
+        models.storage.close()
+        for obj in reversed(self.objs):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def add_places(self, n):
+        """Save n more places, each in a city of its own, linked to every
+        amenity"""
+        for i in range(n):
+            city = City(name="C{}".format(i), state_id=self.state.id)
+            place = Place(name="P{}".format(i), city_id=city.id,
+                          user_id=self.user.id)
+            place.amenities.extend(self.amenities)
+            self.places.append(place)
+            self.objs += [city, place]
+            models.storage.new(city)
+            models.storage.new(place)
+        models.storage.save()
+        models.storage.close()
+
+    def statements(self, method, path, body=None):
+        """Return the number of SQL statements the request executes,
+        checking that it succeeds"""
+        models.storage.close()
+        with models.storage.statements() as executed:
+            response = self.client.open(path, method=method, json=body)
+        self.assertEqual(response.status_code, 200)
+        return len(executed)
+
+    def test_place_amenities(self):
+        """Test that the amenities of a place are loaded with the place
+        in two queries"""
+        path = '/api/v1/places/{}/amenities'.format(self.places[0].id)
+        self.assertEqual(self.statements('GET', path), 2)
+        self.add_places(3)
+        path = '/api/v1/places/{}/amenities'.format(self.places[-1].id)
+        self.assertEqual(self.statements('GET', path), 2)
+
+    def test_places_search(self):
+        """Test that places_search runs as many queries whatever the
+        number of cities and places it returns"""
+        ids = [amenity.id for amenity in self.amenities]
+        bodies = [{}, {"states": [self.state.id]}, {"amenities": ids},
+                  {"states": [self.state.id], "amenities": ids[:2]},
+                  {"cities": [self.places[0].city_id]}]
+        before = [self.statements('POST', '/api/v1/places_search', body)
+                  for body in bodies]
+        self.add_places(3)
+        after = [self.statements('POST', '/api/v1/places_search', body)
+                 for body in bodies]
+        self.assertEqual(after, before)
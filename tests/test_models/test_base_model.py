@@ -2,6 +2,7 @@
 """Test BaseModel for expected behavior and documentation"""
 from datetime import datetime
 import inspect
+import json
 import models
 import pep8 as pycodestyle
 import time
@@ -158,3 +159,78 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    def test_time_codec(self):
+        """Test that parse_time and format_time match strptime/strftime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for value in ["2017-09-28T21:05:54.119427",
+                      "2017-09-28T21:05:54.000000",
+                      "2017-09-28T21:05:54.5"]:
+            with self.subTest(value=value):
+                expected = datetime.strptime(value, t_format)
+                parsed = models.base_model.parse_time(value)
+                self.assertEqual(parsed, expected)
+                self.assertEqual(models.base_model.format_time(parsed),
+                                 expected.strftime(t_format))
+
+    def test_parse_time_rejects_other_formats(self):
+        """Test that parse_time rejects what strptime rejects, like an
+        offset, a date alone or a missing fraction"""
+        for value in ["2017-01-01T00:00:00.000000+05:00",
+                      "2017-01-01T00:00:00.000000Z", "2017-01-01",
+                      "2017-01-01T00:00:00", "2017-01-01 00:00:00.000000"]:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    models.base_model.parse_time(value)
+
+    def test_to_dict_time_cache(self):
+        """Test that the formatted dates follow a new updated_at and are
+        not kept in the instance __dict__"""
+        inst = BaseModel()
+        first = inst.to_dict()
+        self.assertEqual(inst.to_dict(), first)
+        self.assertIn("created_at", inst._BaseModel__memo)
+        self.assertNotIn("_BaseModel__memo", inst.__dict__)
+        inst.updated_at = datetime(2017, 9, 28, 21, 5, 54)
+        self.assertEqual(inst.to_dict()["updated_at"],
+                         "2017-09-28T21:05:54.000000")
+        self.assertEqual(inst.to_dict()["created_at"], first["created_at"])
+
+    def test_to_dict_memoized(self):
+        """Test that to_dict and to_json are memoized until an attribute
+        is set or deleted"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        d = inst.to_dict()
+        self.assertIs(inst.to_dict(), d)
+        self.assertEqual(json.loads(inst.to_json()), d)
+        self.assertIs(inst.to_json(), inst.to_json())
+        inst.name = "Betty"
+        self.assertIsNot(inst.to_dict(), d)
+        self.assertEqual(inst.to_dict()["name"], "Betty")
+        self.assertEqual(json.loads(inst.to_json())["name"], "Betty")
+        del inst.name
+        self.assertNotIn("name", inst.to_dict())
+        inst.tags = []
+        inst.to_json()
+        inst.tags.append("a")
+        inst.invalidate()
+        self.assertEqual(json.loads(inst.to_json())["tags"], ["a"])
+
+    def test_to_dict_not_memoized_when_changed(self):
+        """Test that a dictionary built while an attribute is set, as by
+        another thread, is not memoized"""
+        inst = BaseModel()
+        inst.name = "old"
+
+        class Moment(datetime):
+            """datetime setting the name while to_dict() formats it"""
+            def isoformat(self, *args, **kwargs):
+                """set the name of inst then format the datetime"""
+                inst.name = "new"
+                return super().isoformat(*args, **kwargs)
+
+        inst.updated_at = Moment(2017, 9, 28, 21, 5, 54)
+        self.assertEqual(inst.to_dict()["name"], "old")
+        self.assertEqual(inst.to_dict()["name"], "new")
+        self.assertEqual(json.loads(inst.to_json())["name"], "new")
@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""
+Contains the TestAsyncStorageDocs, TestAsyncStorage and
+TestThreadedStorage classes
+"""
+
+import asyncio
+import inspect
+import models
+from models.engine import async_storage
+from models.state import State
+import pep8
+import threading
+import unittest
+ThreadedStorage = async_storage.ThreadedStorage
+
+
+class TestAsyncStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the async storages"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.classes = [async_storage.AsyncStorage, ThreadedStorage,
+                       async_storage.AsyncDBStorage]
+
+    def test_pep8_conformance_async_storage(self):
+        """Test that models/engine/async_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/async_storage.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_async_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_async_storage_module_docstring(self):
+        """Test for the async_storage.py module docstring"""
+        self.assertIsNot(async_storage.__doc__, None,
+                         "async_storage.py needs a docstring")
+        self.assertTrue(len(async_storage.__doc__) >= 1,
+                        "async_storage.py needs a docstring")
+
+    def test_async_storage_docstrings(self):
+        """Test for the docstrings of the classes and their methods"""
+        for cls in self.classes:
+            self.assertTrue(cls.__doc__, "{} needs a docstring".format(cls))
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(func.__doc__,
+                                "{:s} method needs a docstring".format(name))
+
+
+class TestAsyncStorage(unittest.TestCase):
+    """Test the AsyncStorage base class"""
+    def test_storage_is_abstract(self):
+        """Test that an AsyncStorage must define run()"""
+        with self.assertRaises(TypeError):
+            async_storage.AsyncStorage()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestThreadedStorage(unittest.TestCase):
+    """Test the ThreadedStorage class over FileStorage"""
+    def setUp(self):
+        """Create a ThreadedStorage over models.storage"""
+        self.storage = ThreadedStorage(models.storage)
+
+    def tearDown(self):
+        """Stop the worker thread"""
+        asyncio.run(self.storage.close())
+
+    def test_calls(self):
+        """Test that the calls reach the synchronous storage"""
+        state = State(name="Async")
+
+        async def calls():
+            """create, read and delete state"""
+            await self.storage.bulk_new([state])
+            found = await self.storage.get(State, state.id)
+            count = await self.storage.count(State)
+            await self.storage.bulk_delete([state])
+            return found, count, await self.storage.get(State, state.id)
+
+        found, count, deleted = asyncio.run(calls())
+        self.assertIs(found, state)
+        self.assertEqual(count, models.storage.count(State) + 1)
+        self.assertIsNone(deleted)
+
+    def test_run_in_worker_thread(self):
+        """Test that the calls run in a single worker thread"""
+        async def threads():
+            """return the threads of concurrent calls"""
+            return await asyncio.gather(*(self.storage.run(
+                lambda storage: threading.current_thread())
+                for _ in range(4)))
+
+        threads = asyncio.run(threads())
+        self.assertEqual(len(set(threads)), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
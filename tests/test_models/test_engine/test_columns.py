@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceColumnsDocs and TestPlaceColumns classes
+"""
+
+import inspect
+import math
+import models
+from models.engine import columns
+from models.engine.file_storage import FileStorage
+from models.place import Place
+import pep8
+import unittest
+PlaceColumns = columns.PlaceColumns
+
+
+class TestPlaceColumnsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PlaceColumns class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.columns_f = inspect.getmembers(PlaceColumns, inspect.isfunction)
+
+    def test_pep8_conformance_columns(self):
+        """Test that models/engine/columns.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/columns.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_columns.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_columns_module_docstring(self):
+        """Test for the columns.py module docstring"""
+        self.assertIsNot(columns.__doc__, None,
+                         "columns.py needs a docstring")
+        self.assertTrue(len(columns.__doc__) >= 1,
+                        "columns.py needs a docstring")
+
+    def test_columns_class_docstring(self):
+        """Test for the PlaceColumns class docstring"""
+        self.assertIsNot(PlaceColumns.__doc__, None,
+                         "PlaceColumns class needs a docstring")
+        self.assertTrue(len(PlaceColumns.__doc__) >= 1,
+                        "PlaceColumns class needs a docstring")
+
+    def test_columns_func_docstrings(self):
+        """Test for the presence of docstrings in PlaceColumns methods"""
+        for func in self.columns_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPlaceColumns(unittest.TestCase):
+    """Test the PlaceColumns class"""
+    def setUp(self):
+        """Build the columns of three places"""
+        self.storage = FileStorage()
+        self.places = [Place(name="P{}".format(i), max_guest=i,
+                             latitude=0.5 * i) for i in range(3)]
+        for place in self.places:
+            self.storage.new(place)
+        self.columns = PlaceColumns(self.storage)
+        self.columns.select({})
+
+    def tearDown(self):
+        """Remove the places and the subscription of the columns"""
+        for place in self.places:
+            self.storage.delete(place)
+        FileStorage._FileStorage__subscribers.remove(self.columns.changed)
+
+    def row(self, place):
+        """Return the values of the row of place"""
+        row = self.columns.rows[place.id]
+        self.assertEqual(self.columns.ids[row], place.id)
+        return [self.columns.columns[name][row]
+                for name in ("max_guest", "latitude")]
+
+    def test_rows(self):
+        """Test that every place has its row of floats"""
+        for i, place in enumerate(self.places):
+            self.assertEqual(self.row(place), [i, 0.5 * i])
+
+    def test_remove_moves_last_row(self):
+        """Test that the last row takes the place of a removed one"""
+        self.storage.delete(self.places[0])
+        self.columns.select({})
+        self.assertNotIn(self.places[0].id, self.columns.rows)
+        self.assertEqual(len(self.columns.ids),
+                         len(self.columns.columns["max_guest"]))
+        for i, place in enumerate(self.places[1:], 1):
+            self.assertEqual(self.row(place), [i, 0.5 * i])
+
+    def test_not_a_number(self):
+        """Test that a value that is not a number matches no range"""
+        self.places[1].max_guest = "many"
+        self.storage.new(self.places[1])
+        ids = self.columns.select({"max_guest": (0, None)})
+        self.assertIn(self.places[0].id, ids)
+        self.assertNotIn(self.places[1].id, ids)
+        self.assertTrue(math.isnan(self.row(self.places[1])[0]))
+        self.assertFalse(columns.matches(self.places[1],
+                                         {"max_guest": (0, None)}))
+        self.assertTrue(columns.matches(self.places[2],
+                                        {"max_guest": (2, 2)}))
+
+    def test_mirror_is_abstract(self):
+        """Test that a PlaceMirror must define store()"""
+        with self.assertRaises(TypeError):
+            columns.PlaceMirror()
@@ -7,6 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import db_storage
+from models.engine.file_storage import FileStorage
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -18,6 +19,7 @@ import json
 import os
 import pep8
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -91,6 +93,7 @@ class TestDBStorage(unittest.TestCase):
     def test_get_state(self):
         """Test that get method properly gets the object from storage."""
         storage = DBStorage()
+        storage.reload()
         state = State(name="Egypt")
         state.save()
         self.assertEqual(storage.get(State, state.id).id, state.id)
@@ -99,6 +102,7 @@ class TestDBStorage(unittest.TestCase):
     def test_get_None_cls(self):
         """Test that get method properly gets the object from storage."""
         storage = DBStorage()
+        storage.reload()
         state = State(name="New York")
         self.assertEqual(storage.get(None, state.id), None)
 
@@ -106,24 +110,185 @@ class TestDBStorage(unittest.TestCase):
     def test_get_None_id(self):
         """Test that get method properly gets the object from storage."""
         storage = DBStorage()
+        storage.reload()
         self.assertEqual(storage.get(State, None), None)
 
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_get_not_found(self):
         """Test that get method properly gets the object from storage."""
         storage = DBStorage()
+        storage.reload()
         self.assertEqual(storage.get(State, '0'), None)
 
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_get_undefined_class(self):
         """Test that get method properly gets the object from storage."""
         storage = DBStorage()
+        storage.reload()
         self.assertEqual(storage.get(FileStorage, '0'), None)
 
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_count_state(self):
         """Test count method of storage on State."""
         storage = DBStorage()
+        storage.reload()
         state = State(name="Egypt")
         state.save()
         self.assertNotEqual(storage.count(State), 0)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_uses_identity_map(self):
+        """Test that get returns the session's instance for a known id"""
+        state = State(name="Egypt")
+        state.save()
+        self.assertIs(models.storage.get(State, state.id), state)
+        self.assertIs(models.storage.get("State", state.id), state)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_all(self):
+        """Test that count without a class sums the count of every class"""
+        State(name="Egypt").save()
+        total = sum(models.storage.count(cls) for cls in classes.values())
+        self.assertEqual(models.storage.count(), total)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page(self):
+        """Test that page returns the states in creation order"""
+        for i in range(3):
+            State(name="State {}".format(i)).save()
+        states = models.storage.page(State)
+        order = [(s.created_at, s.id) for s in states]
+        self.assertEqual(order, sorted(order))
+        after = (states[0].created_at, states[0].id)
+        self.assertEqual(models.storage.page(State, 2, after), states[1:3])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_eager_loading(self):
+        """Test that all loads the listed relationships in one query"""
+        for i in range(3):
+            state = State(name="State {}".format(i))
+            state.save()
+            City(name="City {}".format(i), state_id=state.id).save()
+        models.storage.close()
+        with models.storage.statements() as executed:
+            states = models.storage.all(State, load=["cities"]).values()
+            sum(len(state.cities) for state in states)
+        self.assertEqual(len(executed), 2)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_eager_loading(self):
+        """Test that get loads nested relationships in one query each"""
+        state = State(name="Egypt")
+        state.save()
+        City(name="Cairo", state_id=state.id).save()
+        models.storage.close()
+        with models.storage.statements() as executed:
+            state = models.storage.get(State, state.id,
+                                       load={"cities": "joined"})
+            [city.name for city in state.cities]
+        self.assertEqual(len(executed), 1)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_operations(self):
+        """Test that the bulk operations commit all the objects at once"""
+        states = [State(name="S{}".format(i)) for i in range(3)]
+        before = models.storage.count(State)
+        models.storage.bulk_new(states)
+        models.storage.close()
+        self.assertEqual(models.storage.count(State), before + 3)
+        states = [models.storage.get(State, state.id) for state in states]
+        models.storage.bulk_update([(state, {"name": "Renamed"})
+                                    for state in states[:2]])
+        models.storage.close()
+        self.assertEqual(models.storage.get(State, states[0].id).name,
+                         "Renamed")
+        models.storage.bulk_delete([models.storage.get(State, state.id)
+                                    for state in states])
+        models.storage.close()
+        self.assertEqual(models.storage.count(State), before)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_unit_of_work(self):
+        """Test that a unit of work commits once or rolls back"""
+        before = models.storage.count(State)
+        with models.storage.unit_of_work():
+            State(name="Nevada").save()
+            State(name="Utah").save()
+        models.storage.close()
+        self.assertEqual(models.storage.count(State), before + 2)
+        with self.assertRaises(ValueError):
+            with models.storage.unit_of_work():
+                State(name="Oregon").save()
+                raise ValueError
+        models.storage.close()
+        self.assertEqual(models.storage.count(State), before + 2)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Test that counts follows the commits without querying"""
+        counts = models.storage.counts()
+        self.assertEqual(sorted(counts), sorted(classes))
+        state = State(name="California")
+        with models.storage.statements() as executed:
+            models.storage.new(state)
+            models.storage.save()
+            self.assertEqual(models.storage.counts()["State"],
+                             counts["State"] + 1)
+            models.storage.delete(state)
+            models.storage.save()
+            self.assertEqual(models.storage.counts(), counts)
+        self.assertFalse([statement for statement in executed
+                          if "count" in statement.lower()])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_subscribe(self):
+        """Test that the subscribers are told about the written objects"""
+        calls = []
+        models.storage.subscribe(lambda name, id: calls.append((name, id)))
+        try:
+            state = State(name="California")
+            models.storage.new(state)
+            models.storage.save()
+        finally:
+            DBStorage._DBStorage__subscribers.pop()
+        self.assertEqual(calls, [("State", state.id)] * 2)
+
+
+class TestDBStorageEngine(unittest.TestCase):
+    """Test the engine and connection pool settings of DBStorage"""
+    def test_engine_options_defaults(self):
+        """Test that the pool pings and recycles its connections by default"""
+        with mock.patch.dict(os.environ):
+            for name, _ in db_storage.pool_options.values():
+                os.environ.pop(name, None)
+            self.assertEqual(DBStorage.engine_options(),
+                             {"poolclass": db_storage.TimedQueuePool,
+                              "pool_recycle": 3600, "pool_pre_ping": True})
+
+    def test_engine_options_environment(self):
+        """Test that the pool settings are read from the environment"""
+        env = {"HBNB_MYSQL_POOL_SIZE": "20", "HBNB_MYSQL_MAX_OVERFLOW": "5",
+               "HBNB_MYSQL_POOL_RECYCLE": "600",
+               "HBNB_MYSQL_POOL_PRE_PING": "0",
+               "HBNB_MYSQL_POOL_TIMEOUT": "2.5",
+               "HBNB_MYSQL_ISOLATION_LEVEL": "READ COMMITTED"}
+        with mock.patch.dict(os.environ, env):
+            self.assertEqual(DBStorage.engine_options(),
+                             {"poolclass": db_storage.TimedQueuePool,
+                              "pool_size": 20, "max_overflow": 5,
+                              "pool_recycle": 600, "pool_pre_ping": False,
+                              "pool_timeout": 2.5,
+                              "isolation_level": "READ COMMITTED"})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that pool_stats counts the checkouts of the pool"""
+        models.storage.close()
+        if "checkouts" not in models.storage.pool_stats():
+            self.skipTest("the database has a single connection")
+        before = models.storage.pool_stats()["checkouts"]
+        models.storage.all(State)
+        models.storage.close()
+        stats = models.storage.pool_stats()
+        self.assertGreater(stats["checkouts"], before)
+        self.assertEqual(stats["checked_out"], 0)
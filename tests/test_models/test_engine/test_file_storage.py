@@ -6,7 +6,7 @@ Contains the TestFileStorageDocs classes
 from datetime import datetime
 import inspect
 import models
-from models.engine import file_storage
+from models.engine import file_storage, slotted
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,7 +17,14 @@ from models.user import User
 import json
 import os
 import pep8
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -122,6 +129,16 @@ class TestFileStorage(unittest.TestCase):
         state.save()
         self.assertEqual(storage.get(State, state.id).id, state.id)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_class_name(self):
+        """Test that get accepts the name of the class like all()"""
+        storage = FileStorage()
+        state = State(name="Oregon")
+        storage.new(state)
+        self.assertIs(storage.get("State", state.id), state)
+        self.assertIsNone(storage.get("City", state.id))
+        self.assertIsNone(storage.get("Unknown", state.id))
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_get_None_cls(self):
         """Test that get method properly gets the object from storage."""
@@ -154,3 +171,756 @@ class TestFileStorage(unittest.TestCase):
         state = State(name="California")
         state.save()
         self.assertNotEqual(storage.count(State), 0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls_uses_class_bucket(self):
+        """Test that all(cls) only returns objects of cls"""
+        storage = FileStorage()
+        state = State(name="California")
+        city = City(name="Fresno", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        states = storage.all(State)
+        self.assertIn("State." + state.id, states)
+        self.assertNotIn("City." + city.id, states)
+        self.assertEqual(storage.all("State"), states)
+        self.assertEqual(storage.count(State), len(states))
+        storage.delete(state)
+        storage.delete(city)
+        self.assertNotIn("State." + state.id, storage.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related_foreign_key_index(self):
+        """Test that related follows the foreign key indexes"""
+        storage = FileStorage()
+        state = State(name="California")
+        other = State(name="Nevada")
+        city = City(name="Fresno", state_id=state.id)
+        for obj in (state, other, city):
+            storage.new(obj)
+        self.assertEqual(storage.related(City, "state_id", state.id), [city])
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        storage.new(city)
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        storage.delete(city)
+        self.assertEqual(other.cities, [])
+        storage.delete(state)
+        storage.delete(other)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_indexes_follow_replaced_objects(self):
+        """Test that the indexes are rebuilt when __objects is replaced"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        state = State(name="California")
+        FileStorage._FileStorage__objects = {"State." + state.id: state}
+        try:
+            self.assertEqual(storage.count(State), 1)
+            self.assertEqual(storage.count(City), 0)
+        finally:
+            FileStorage._FileStorage__objects = save
+        self.assertNotIn("State." + state.id, storage.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts follows new and delete for every class"""
+        storage = FileStorage()
+        counts = storage.counts()
+        self.assertEqual(sorted(counts), sorted(classes))
+        state = State(name="California")
+        storage.new(state)
+        self.assertEqual(storage.counts()["State"], counts["State"] + 1)
+        storage.delete(state)
+        self.assertEqual(storage.counts(), counts)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_subscribe(self):
+        """Test that the subscribers are told about new and delete"""
+        storage = FileStorage()
+        calls = []
+        storage.subscribe(lambda name, id: calls.append((name, id)))
+        try:
+            state = State(name="California")
+            storage.new(state)
+            storage.delete(state)
+            storage.delete(state)
+        finally:
+            FileStorage._FileStorage__subscribers.pop()
+        self.assertEqual(calls, [("State", state.id)] * 2)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageJournal(unittest.TestCase):
+    """Test the journal mode of the FileStorage class"""
+    def setUp(self):
+        """Switch FileStorage to journal mode on an empty store"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage().save()
+        FileStorage._FileStorage__journal = True
+        self.log = FileStorage._FileStorage__journal_path
+
+    def tearDown(self):
+        """Restore the plain JSON file mode"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__objects = self.saved
+        FileStorage._FileStorage__pending.clear()
+        FileStorage().save()
+
+    def test_save_appends_to_journal(self):
+        """Test that save only journals the objects passed to new/delete"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f), {})
+        with open(self.log, "r") as f:
+            self.assertEqual(len(f.readlines()), 1)
+        storage.delete(state)
+        storage.save()
+        with open(self.log, "r") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_reload_replays_journal(self):
+        """Test that reload applies the journal on top of the JSON file"""
+        storage = FileStorage()
+        kept = State(name="California")
+        gone = State(name="Nevada")
+        storage.new(kept)
+        storage.new(gone)
+        storage.save()
+        storage.delete(gone)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(list(storage.all(State)), ["State." + kept.id])
+        self.assertEqual(storage.get(State, kept.id).name, "California")
+
+    def test_bulk_new_appends_once(self):
+        """Test that bulk_new journals every object in one append"""
+        storage = FileStorage()
+        storage.bulk_new([State(name="S{}".format(i)) for i in range(3)])
+        with open(self.log, "r") as f:
+            self.assertEqual(len(f.readlines()), 3)
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f), {})
+
+    def test_compaction(self):
+        """Test that a journal past its limit is compacted into the file"""
+        storage = FileStorage()
+        limit = FileStorage._FileStorage__journal_limit
+        FileStorage._FileStorage__journal_limit = 0
+        try:
+            state = State(name="California")
+            storage.new(state)
+            storage.save()
+            FileStorage._FileStorage__compactor.join()
+        finally:
+            FileStorage._FileStorage__journal_limit = limit
+        self.assertFalse(os.path.exists(self.log))
+        with open("file.json", "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+
+    def test_compaction_skips_open_units(self):
+        """Test that neither the journal nor the compaction of another
+        thread writes the changes of an open unit of work"""
+        storage = FileStorage()
+        limit = FileStorage._FileStorage__journal_limit
+        storage.begin()
+        try:
+            state = State(name="California")
+            storage.new(state)
+            FileStorage._FileStorage__journal_limit = 0
+            thread = threading.Thread(target=State(name="Nevada").save)
+            thread.start()
+            thread.join()
+            FileStorage._FileStorage__compactor.join()
+        finally:
+            FileStorage._FileStorage__journal_limit = limit
+            storage.rollback()
+        with open("file.json", "r") as f:
+            self.assertEqual([obj["name"] for obj in json.load(f).values()],
+                             ["Nevada"])
+        self.assertIsNone(storage.get(State, state.id))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageGenerations(unittest.TestCase):
+    """Test the rotated generations of the JSON file"""
+    def setUp(self):
+        """Start from an empty store"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        """Restore the objects and remove the generations"""
+        FileStorage._FileStorage__objects = self.saved
+        FileStorage().save()
+        for path in FileStorage()._FileStorage__snapshots()[1:]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_save_rotates_generations(self):
+        """Test that save keeps the previous file as file.json.1"""
+        storage = FileStorage()
+        storage.save()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        with open("file.json.1", "r") as f:
+            self.assertEqual(json.load(f), {})
+        with open("file.json", "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+
+    def test_reload_falls_back_on_corruption(self):
+        """Test that reload uses file.json.1 when file.json is truncated"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        storage.save()
+        with open("file.json", "w") as f:
+            f.write('{"State.')
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "California")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageLazy(unittest.TestCase):
+    """Test the lazy reload mode of the FileStorage class"""
+    def setUp(self):
+        """Save a state and a city then reload them lazily"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        self.state = State(name="California")
+        self.city = City(name="Fresno", state_id=self.state.id)
+        storage.new(self.state)
+        storage.new(self.city)
+        storage.save()
+        FileStorage._FileStorage__lazy = True
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+
+    def tearDown(self):
+        """Restore the eager mode and the objects"""
+        FileStorage._FileStorage__lazy = False
+        FileStorage._FileStorage__objects = self.saved
+        FileStorage().save()
+
+    def test_reload_keeps_dictionaries(self):
+        """Test that reload builds no instance until one is accessed"""
+        storage = FileStorage()
+        objects = FileStorage._FileStorage__objects
+        self.assertTrue(all(type(v) is dict for v in objects.values()))
+        self.assertEqual(storage.count(State), 1)
+        storage.save()
+        self.assertTrue(all(type(v) is dict for v in objects.values()))
+
+    def test_access_builds_instances(self):
+        """Test that get, related and all return built instances"""
+        storage = FileStorage()
+        state = storage.get(State, self.state.id)
+        self.assertIsInstance(state, State)
+        self.assertEqual(state.created_at, self.state.created_at)
+        self.assertIs(storage.get(State, self.state.id), state)
+        cities = state.cities
+        self.assertEqual([c.id for c in cities], [self.city.id])
+        self.assertIsInstance(cities[0], City)
+        self.assertIs(storage.all(City)["City." + self.city.id], cities[0])
+        for obj in storage.all().values():
+            self.assertNotEqual(type(obj), dict)
+
+    def test_mirror_during_rollback(self):
+        """Test that a PlaceMirror refreshing a lazily loaded place while
+        another thread rolls back a change, its subscribers being slow,
+        does not deadlock, the scenario running in a child process killed
+        if it does not end in time"""
+        tmp = tempfile.mkdtemp()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                path = os.path.join(tmp, "file.json")
+                FileStorage._FileStorage__file_path = path
+                FileStorage._FileStorage__journal_path = path + ".log"
+                FileStorage._FileStorage__lock_path = path + ".lock"
+                FileStorage._FileStorage__objects = {}
+                status = 0 if self.mirror_during_rollback() else 1
+            finally:
+                os._exit(status)
+        try:
+            deadline = time.monotonic() + 20
+            done, status = os.waitpid(pid, os.WNOHANG)
+            while not done and time.monotonic() < deadline:
+                time.sleep(0.05)
+                done, status = os.waitpid(pid, os.WNOHANG)
+            if not done:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            self.assertTrue(done, "deadlock")
+            self.assertEqual(status, 0)
+        finally:
+            shutil.rmtree(tmp)
+
+    def mirror_during_rollback(self):
+        """run the scenario of test_mirror_during_rollback, returning True
+        if it ends with the columns up to date"""
+        from models.engine.columns import PlaceColumns
+
+        storage = FileStorage()
+        places = [Place(name="Home", max_guest=2) for _ in range(2)]
+        storage.bulk_new(places)
+        columns = PlaceColumns(storage)
+        columns.select({})
+        notifying, go = threading.Event(), threading.Event()
+        calls = []
+
+        def rollback(place):
+            """change place in a unit of work rolled back, which leaves it
+            as a dictionary to build"""
+            storage.begin()
+            storage.new(Place(**dict(place.to_dict(), max_guest=3)))
+            storage.rollback()
+
+        def slow(name, obj_id):
+            """hold the notification of the rollback of the second place,
+            which follows the one of new()"""
+            if obj_id == places[1].id:
+                calls.append(obj_id)
+                if len(calls) == 2:
+                    notifying.set()
+                    go.wait(10)
+
+        rollback(places[0])
+        FileStorage._FileStorage__subscribers.insert(0, slow)
+        threads = [threading.Thread(target=rollback, args=(places[1],),
+                                    daemon=True),
+                   threading.Thread(target=columns.select,
+                                    args=({"max_guest": (2, 2)},),
+                                    daemon=True)]
+        threads[0].start()
+        if not notifying.wait(10):
+            return False
+        threads[1].start()
+        threads[1].join(0.2)
+        go.set()
+        for thread in threads:
+            thread.join(10)
+        if any(thread.is_alive() for thread in threads):
+            return False
+        return columns.select({"max_guest": (2, 2)}) == {
+            place.id for place in places}
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageSlotted(unittest.TestCase):
+    """Test the slotted mode of the FileStorage class"""
+    def setUp(self):
+        """Save a state and a city on an empty store"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.state = State(name="California")
+        self.cities = [City(name="C{}".format(i), state_id=self.state.id)
+                       for i in range(2)]
+        FileStorage().bulk_new([self.state] + self.cities)
+        FileStorage._FileStorage__slotted = True
+
+    def tearDown(self):
+        """Restore the objects and the plain mode"""
+        FileStorage._FileStorage__slotted = False
+        FileStorage._FileStorage__objects = self.saved
+        FileStorage().save()
+
+    def test_reload_builds_slotted_instances(self):
+        """Test that reload() builds slotted instances equal to the
+        saved objects, sharing their foreign keys"""
+        storage = FileStorage()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        state = storage.get(State, self.state.id)
+        self.assertIsInstance(state, slotted.SlottedModel)
+        self.assertEqual(state.to_dict(), self.state.to_dict())
+        cities = storage.related(City, "state_id", state.id)
+        self.assertEqual(sorted(city.to_dict()["name"] for city in cities),
+                         ["C0", "C1"])
+        self.assertIs(cities[0].state_id, cities[1].state_id)
+        cities[0].name = "Fresno"
+        storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["City." + cities[0].id]["name"], "Fresno")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageBulk(unittest.TestCase):
+    """Test the bulk operations of the FileStorage class"""
+    def setUp(self):
+        """Start from an empty store"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        """Restore the objects"""
+        FileStorage._FileStorage__objects = self.saved
+        FileStorage().save()
+
+    def test_bulk_new(self):
+        """Test that bulk_new stores and saves every object at once"""
+        storage = FileStorage()
+        states = [State(name="S{}".format(i)) for i in range(3)]
+        storage.bulk_new(states)
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(sorted(saved), sorted("State." + state.id
+                                               for state in states))
+
+    def test_bulk_update(self):
+        """Test that bulk_update sets the attributes and updated_at"""
+        storage = FileStorage()
+        states = [State(name="S{}".format(i)) for i in range(2)]
+        storage.bulk_new(states)
+        updated_at = states[0].updated_at
+        storage.bulk_update([(states[0], {"name": "Nevada"}),
+                             (states[1], {"name": "Utah"})])
+        self.assertGreater(states[0].updated_at, updated_at)
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["State." + states[0].id]["name"], "Nevada")
+        self.assertEqual(saved["State." + states[1].id]["name"], "Utah")
+
+    def test_bulk_delete(self):
+        """Test that bulk_delete removes the objects and their indexes"""
+        storage = FileStorage()
+        state = State(name="California")
+        cities = [City(name="C{}".format(i), state_id=state.id)
+                  for i in range(3)]
+        storage.bulk_new([state] + cities)
+        storage.bulk_delete(cities[:2])
+        self.assertEqual(storage.related(City, "state_id", state.id),
+                         cities[2:])
+        with open("file.json", "r") as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+
+@unittest.skipIf(models.storage_t == 'db' or not hasattr(os, "fork"),
+                 "not testing file storage")
+class TestFileStorageShared(unittest.TestCase):
+    """Test the FileStorage class shared by forked processes"""
+    def setUp(self):
+        """Start from a saved store holding a state, shared"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.state = State(name="California")
+        self.storage.bulk_new([self.state])
+        self.storage.share()
+
+    def tearDown(self):
+        """Restore the objects and the plain JSON file mode"""
+        self.storage.watch(None)
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__pending.clear()
+        FileStorage._FileStorage__objects = self.saved
+        FileStorage().save()
+
+    def in_child(self, fn):
+        """Run fn in a forked process and wait for it"""
+        pid = os.fork()
+        if pid == 0:
+            try:
+                fn()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+
+    def test_save_keeps_other_processes_objects(self):
+        """Test that save() merges the objects saved by another process"""
+        other = State(name="Nevada")
+        self.in_child(lambda: self.storage.bulk_new([other]))
+        mine = State(name="Utah")
+        self.storage.bulk_new([mine])
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(sorted(saved), sorted("State." + state.id for state
+                                               in (self.state, other, mine)))
+        self.assertEqual(self.storage.get(State, other.id).name, "Nevada")
+
+    def test_save_keeps_other_processes_deletions(self):
+        """Test that save() drops the objects another process deleted"""
+        self.in_child(lambda: self.storage.bulk_delete([self.state]))
+        self.storage.bulk_new([State(name="Utah")])
+        with open("file.json", "r") as f:
+            self.assertNotIn("State." + self.state.id, json.load(f))
+        self.assertIsNone(self.storage.get(State, self.state.id))
+
+    def test_reload_unchanged(self):
+        """Test that reload() reads nothing if no process saved anything"""
+        with mock.patch.object(FileStorage, "_FileStorage__read") as read:
+            self.storage.reload()
+            self.storage.close()
+        self.assertFalse(read.called)
+
+    def test_reload_applies_changes(self):
+        """Test that reload() only applies the changes other processes
+        saved, the other objects staying the same instances"""
+        other = State(name="Nevada")
+        kept = State(name="Utah")
+        self.storage.bulk_new([kept])
+        self.in_child(lambda: (self.storage.bulk_new([other]),
+                               self.storage.bulk_delete([self.state])))
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, other.id).name, "Nevada")
+        self.assertIsNone(self.storage.get(State, self.state.id))
+        self.assertIs(self.storage.get(State, kept.id), kept)
+
+    def test_watch_close_reads_nothing(self):
+        """Test that close() leaves the changes to the watcher thread"""
+        self.storage.watch(3600)
+        other = State(name="Nevada")
+        self.in_child(lambda: self.storage.bulk_new([other]))
+        with mock.patch.object(FileStorage, "_FileStorage__read") as read:
+            self.storage.close()
+        self.assertFalse(read.called)
+        self.assertIsNone(self.storage.get(State, other.id))
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, other.id).name, "Nevada")
+
+    def test_watch_applies_changes(self):
+        """Test that the watcher thread applies the changes other
+        processes save"""
+        self.storage.watch(0.01)
+        other = State(name="Nevada")
+        self.in_child(lambda: self.storage.bulk_new([other]))
+        for _ in range(500):
+            if self.storage.get(State, other.id) is not None:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.storage.get(State, other.id).name, "Nevada")
+
+    def test_reload_replays_journal_end(self):
+        """Test that reload() replays only the records other processes
+        appended to the journal"""
+        FileStorage._FileStorage__journal = True
+        other = State(name="Nevada")
+        self.storage.bulk_new([State(name="Utah")])
+        self.in_child(lambda: self.storage.bulk_new([other]))
+        with mock.patch.object(FileStorage, "_FileStorage__read") as read:
+            self.storage.reload()
+        self.assertFalse(read.called)
+        self.assertEqual(self.storage.get(State, other.id).name, "Nevada")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageThreads(unittest.TestCase):
+    """Test the FileStorage class used by concurrent threads"""
+    def setUp(self):
+        """Start from an empty store"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage().save()
+
+    def tearDown(self):
+        """Restore the objects"""
+        FileStorage._FileStorage__objects = self.saved
+        FileStorage().save()
+
+    def test_concurrent_writers_and_readers(self):
+        """Test that threads writing, reading and reloading at once lose
+        no object and never see a dictionary change during iteration"""
+        storage = FileStorage()
+        storage.bulk_new([City(name="C{}".format(i)) for i in range(2000)])
+        states = [[State(name="S{}-{}".format(i, j)) for j in range(20)]
+                  for i in range(8)]
+        errors = []
+
+        def work(mine):
+            """save the states of mine one by one, reading meanwhile"""
+            try:
+                for state in mine:
+                    storage.new(state)
+                    storage.save()
+                    storage.all(State)
+                    storage.page(State, 5)
+                    storage.close()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(mine,))
+                   for mine in states]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+        self.assertEqual(storage.count(State), 160)
+        with open("file.json", "r") as f:
+            self.assertEqual(len(json.load(f)), 2160)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageUnitOfWork(unittest.TestCase):
+    """Test the units of work of the FileStorage class"""
+    def setUp(self):
+        """Start from a saved store holding a state"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.state = State(name="California")
+        self.state.save()
+
+    def tearDown(self):
+        """Restore the objects"""
+        FileStorage._FileStorage__objects = self.saved
+        FileStorage().save()
+
+    def saved_names(self):
+        """return the sorted names of the states in the JSON file"""
+        with open("file.json", "r") as f:
+            return sorted(obj["name"] for obj in json.load(f).values())
+
+    def test_commit_writes_once(self):
+        """Test that the saves of a unit of work are deferred to its end"""
+        storage = FileStorage()
+        with storage.unit_of_work():
+            State(name="Nevada").save()
+            with storage.unit_of_work():
+                State(name="Utah").save()
+            self.assertEqual(self.saved_names(), ["California"])
+        self.assertEqual(self.saved_names(), ["California", "Nevada", "Utah"])
+
+    def test_rollback(self):
+        """Test that a failed unit of work leaves the storage unchanged"""
+        storage = FileStorage()
+        with self.assertRaises(ValueError):
+            with storage.unit_of_work():
+                State(name="Nevada").save()
+                self.state.name = "Oregon"
+                self.state.save()
+                raise ValueError
+        self.assertEqual(self.saved_names(), ["California"])
+        self.assertEqual([state.name for state in storage.all(State).values()],
+                         ["California"])
+
+    def test_nested_rollback(self):
+        """Test that a rolled back nested unit rolls back the outer one"""
+        storage = FileStorage()
+        storage.begin()
+        State(name="Nevada").save()
+        storage.begin()
+        storage.rollback()
+        storage.commit()
+        self.assertEqual(self.saved_names(), ["California"])
+        self.assertEqual(storage.count(State), 1)
+
+    def test_rollback_keeps_other_threads(self):
+        """Test that a rollback leaves the unsaved changes of the unit of
+        work of another thread, which its commit then writes"""
+        storage = FileStorage()
+        added, rolled_back = threading.Event(), threading.Event()
+        errors = []
+
+        def commit():
+            """Add a state, then commit once the other unit rolled back"""
+            try:
+                with storage.unit_of_work():
+                    State(name="Nevada").save()
+                    added.set()
+                    rolled_back.wait(10)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=commit)
+        thread.start()
+        added.wait(10)
+        storage.begin()
+        State(name="Utah").save()
+        self.state.name = "Oregon"
+        self.state.save()
+        storage.rollback()
+        rolled_back.set()
+        thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.saved_names(), ["California", "Nevada"])
+        self.assertEqual(sorted(state.name for state in
+                                storage.all(State).values()),
+                         ["California", "Nevada"])
+
+    def test_rollback_after_other_threads_save(self):
+        """Test that the save of another thread leaves the changes of an
+        open unit of work as saved, so that its rollback undoes them"""
+        storage = FileStorage()
+        storage.begin()
+        self.state.name = "Oregon"
+        self.state.save()
+        utah = State(name="Utah")
+        storage.new(utah)
+        nevada = State(name="Nevada")
+        thread = threading.Thread(target=nevada.save)
+        thread.start()
+        thread.join()
+        self.assertEqual(self.saved_names(), ["California", "Nevada"])
+        storage.rollback()
+        self.assertEqual(self.saved_names(), ["California", "Nevada"])
+        self.assertEqual(sorted(state.name for state in
+                                storage.all(State).values()),
+                         ["California", "Nevada"])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStoragePage(unittest.TestCase):
+    """Test the keyset pagination of the FileStorage class"""
+    def setUp(self):
+        """Start from five states created one second apart"""
+        self.saved = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.states = []
+        for i in range(5):
+            state = State(name="S{}".format(i))
+            state.created_at = datetime(2017, 9, 28, 21, 5, i)
+            self.states.append(state)
+            FileStorage().new(state)
+
+    def tearDown(self):
+        """Restore the objects"""
+        FileStorage._FileStorage__objects = self.saved
+
+    def test_page(self):
+        """Test that page follows the creation order from the cursor"""
+        storage = FileStorage()
+        self.assertEqual(storage.page(State), self.states)
+        self.assertEqual(storage.page(State, 2), self.states[:2])
+        after = (self.states[1].created_at, self.states[1].id)
+        self.assertEqual(storage.page(State, 2, after), self.states[2:4])
+        self.assertEqual(storage.page(City), [])
+
+    def test_page_follows_writes(self):
+        """Test that the sorted index follows new and delete"""
+        storage = FileStorage()
+        storage.page(State)
+        storage.delete(self.states[2])
+        first = State(name="First")
+        first.created_at = datetime(2017, 1, 1)
+        storage.new(first)
+        self.assertEqual(storage.page(State, 3),
+                         [first, self.states[0], self.states[1]])
+
+    def test_page_related(self):
+        """Test that page restricted to a foreign key is ordered"""
+        storage = FileStorage()
+        cities = []
+        for i in range(3):
+            city = City(name="C{}".format(i), state_id=self.states[0].id)
+            city.created_at = datetime(2017, 9, 28, 21, 5, 10 - i)
+            cities.append(city)
+            storage.new(city)
+        self.assertEqual(storage.page(City, 2, None, "state_id",
+                                      self.states[0].id), cities[:0:-1])
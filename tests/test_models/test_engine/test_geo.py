@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceGridDocs and TestPlaceGrid classes
+"""
+
+import inspect
+from models.engine import geo
+import pep8
+import random
+import unittest
+PlaceGrid = geo.PlaceGrid
+
+
+class TestPlaceGridDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PlaceGrid class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.geo_f = inspect.getmembers(PlaceGrid, inspect.isfunction)
+
+    def test_pep8_conformance_geo(self):
+        """Test that models/engine/geo.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/geo.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_geo.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_geo_module_docstring(self):
+        """Test for the geo.py module docstring"""
+        self.assertIsNot(geo.__doc__, None,
+                         "geo.py needs a docstring")
+        self.assertTrue(len(geo.__doc__) >= 1,
+                        "geo.py needs a docstring")
+
+    def test_geo_class_docstring(self):
+        """Test for the PlaceGrid class docstring"""
+        self.assertIsNot(PlaceGrid.__doc__, None,
+                         "PlaceGrid class needs a docstring")
+        self.assertTrue(len(PlaceGrid.__doc__) >= 1,
+                        "PlaceGrid class needs a docstring")
+
+    def test_geo_func_docstrings(self):
+        """Test for the presence of docstrings in PlaceGrid methods"""
+        for func in self.geo_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestPlaceGrid(unittest.TestCase):
+    """Test the PlaceGrid class"""
+    def setUp(self):
+        """Fill a grid of 1 degree cells with random points, some of them
+        near the poles and the antimeridian"""
+        rand = random.Random(0)
+        self.points = {}
+        for i in range(3000):
+            lat = rand.uniform(-90, 90) if i % 3 else rand.uniform(80, 90)
+            lng = rand.uniform(-180, 180) if i % 2 else \
+                rand.choice((-1, 1)) * rand.uniform(175, 180)
+            self.points[str(i)] = (lat, lng)
+        self.grid = PlaceGrid(cell=1.0)
+        for obj_id, (lat, lng) in self.points.items():
+            self.grid.put(obj_id, lat, lng)
+
+    def scan(self, near=None, bbox=None):
+        """Return the ids of the points matching the filters, checking each
+        of them"""
+        return {obj_id for obj_id, (lat, lng) in self.points.items()
+                if geo.within(lat, lng, near, bbox)}
+
+    def test_distance(self):
+        """Test the great-circle distance"""
+        self.assertAlmostEqual(geo.distance(48.8566, 2.3522,
+                                            51.5074, -0.1278), 343.6, 0)
+        self.assertAlmostEqual(geo.distance(0, 179.5, 0, -179.5), 111.2, 0)
+        self.assertEqual(geo.distance(10, 20, 10, 20), 0)
+
+    def test_near(self):
+        """Test that near finds the points a scan finds"""
+        for near in ({"lat": 10, "lng": 20, "radius_km": 500},
+                     {"lat": 0, "lng": 179.9, "radius_km": 300},
+                     {"lat": 89, "lng": 0, "radius_km": 400},
+                     {"lat": -30, "lng": -60, "radius_km": 30000},
+                     {"lat": 45, "lng": 5, "radius_km": 0}):
+            self.assertEqual(set(self.grid.select(near)), self.scan(near))
+
+    def test_bbox(self):
+        """Test that bbox finds the points a scan finds, also across the
+        antimeridian and with near"""
+        boxes = ({"min_lat": 10, "min_lng": 20, "max_lat": 30, "max_lng": 50},
+                 {"min_lat": -20, "min_lng": 170, "max_lat": 20,
+                  "max_lng": -170},
+                 {"min_lat": 85, "min_lng": -180, "max_lat": 90,
+                  "max_lng": 180})
+        near = {"lat": 20, "lng": 30, "radius_km": 1000}
+        for bbox in boxes:
+            self.assertEqual(set(self.grid.select(bbox=bbox)),
+                             self.scan(bbox=bbox))
+            self.assertEqual(set(self.grid.select(near, bbox)),
+                             self.scan(near, bbox))
+        self.assertEqual(self.grid.select(near, boxes[1]), {})
+
+    def test_put_moves_and_removes(self):
+        """Test that put() moves a point to its new cell and removes it
+        without coordinates"""
+        near = {"lat": 1.5, "lng": 1.5, "radius_km": 10}
+        self.grid.put("0", 1.5, 1.5)
+        self.assertEqual(self.grid.select(near), {"0": (1.5, 1.5)})
+        self.grid.put("0", float("nan"), 1.5)
+        self.assertEqual(self.grid.select(near), {})
+        self.assertNotIn("0", self.grid.where)
+        self.assertEqual(sum(map(len, self.grid.cells.values())), 2999)
+
+    def test_center(self):
+        """Test the point the results are sorted from"""
+        self.assertEqual(geo.center({"lat": 1, "lng": 2, "radius_km": 3}),
+                         (1, 2))
+        self.assertEqual(geo.center(bbox={"min_lat": 0, "min_lng": 160,
+                                          "max_lat": 10, "max_lng": -170}),
+                         (5, 175))
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Contains the TestJournalDocs and TestJournal classes
+"""
+
+import inspect
+from models.engine import journal
+import os
+import pep8
+import tempfile
+import unittest
+Journal = journal.Journal
+
+
+class TestJournalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Journal class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.journal_f = inspect.getmembers(Journal, inspect.isfunction)
+
+    def test_pep8_conformance_journal(self):
+        """Test that models/engine/journal.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/journal.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_journal_module_docstring(self):
+        """Test for the journal.py module docstring"""
+        self.assertIsNot(journal.__doc__, None,
+                         "journal.py needs a docstring")
+        self.assertTrue(len(journal.__doc__) >= 1,
+                        "journal.py needs a docstring")
+
+    def test_journal_class_docstring(self):
+        """Test for the Journal class docstring"""
+        self.assertIsNot(Journal.__doc__, None,
+                         "Journal class needs a docstring")
+        self.assertTrue(len(Journal.__doc__) >= 1,
+                        "Journal class needs a docstring")
+
+    def test_journal_func_docstrings(self):
+        """Test for the presence of docstrings in Journal methods"""
+        for func in self.journal_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestJournal(unittest.TestCase):
+    """Test the Journal class"""
+    def setUp(self):
+        """Create a journal in a temporary directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = Journal(os.path.join(self.tmp.name, "file.json.log"))
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp.cleanup()
+
+    def test_append_replay(self):
+        """Test that replay yields the appended records in order"""
+        self.journal.append([("State.1", {"name": "A"})])
+        self.journal.append([("State.1", None), ("City.2", {"name": "B"})])
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"name": "A"}), ("State.1", None),
+                          ("City.2", {"name": "B"})])
+        self.assertGreater(self.journal.size(), 0)
+
+    def test_replay_truncated_line(self):
+        """Test that replay stops at a partially written record"""
+        self.journal.append([("State.1", {"name": "A"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('{"key": "State.2", "val')
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"name": "A"})])
+
+    def test_rotate(self):
+        """Test that rotate keeps the records and empties the log"""
+        self.journal.append([("State.1", {"name": "A"})])
+        self.journal.rotate()
+        self.journal.append([("State.2", {"name": "B"})])
+        self.journal.rotate()
+        self.assertEqual(self.journal.size(), 0)
+        self.assertEqual([key for key, _ in self.journal.replay()],
+                         ["State.1", "State.2"])
+        self.journal.discard(rotated_only=True)
+        self.assertEqual(list(self.journal.replay()), [])
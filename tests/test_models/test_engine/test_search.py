@@ -0,0 +1,265 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceSearchDocs, TestPlaceSearch and TestPlaceSearchScan
+classes
+"""
+
+from datetime import datetime
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine import search
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+PlaceSearch = search.PlaceSearch
+
+
+class TestPlaceSearchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PlaceSearch class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.search_f = inspect.getmembers(PlaceSearch, inspect.isfunction)
+
+    def test_pep8_conformance_search(self):
+        """Test that models/engine/search.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/search.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_search_module_docstring(self):
+        """Test for the search.py module docstring"""
+        self.assertIsNot(search.__doc__, None,
+                         "search.py needs a docstring")
+        self.assertTrue(len(search.__doc__) >= 1,
+                        "search.py needs a docstring")
+
+    def test_search_class_docstring(self):
+        """Test for the PlaceSearch class docstring"""
+        self.assertIsNot(PlaceSearch.__doc__, None,
+                         "PlaceSearch class needs a docstring")
+        self.assertTrue(len(PlaceSearch.__doc__) >= 1,
+                        "PlaceSearch class needs a docstring")
+
+    def test_search_func_docstrings(self):
+        """Test for the presence of docstrings in PlaceSearch methods"""
+        for func in self.search_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPlaceSearch(unittest.TestCase):
+    """Test the PlaceSearch class"""
+    def setUp(self):
+        """Create two states, three cities, two amenities and six places"""
+        self.states = [State(name="S0"), State(name="S1")]
+        self.cities = [City(name="C{}".format(i),
+                            state_id=self.states[i // 2].id)
+                       for i in range(3)]
+        self.amenities = [Amenity(name="Wifi"), Amenity(name="Pool")]
+        user = User(email="a@b.c", password="pwd")
+        self.places = []
+        for i in range(6):
+            place = Place(name="P{}".format(i), user_id=user.id,
+                          city_id=self.cities[i % 3].id)
+            place.created_at = datetime(2017, 9, 28, 21, 5, i)
+            place.price_by_night = 100000 + 10 * i
+            place.number_rooms = i
+            place.latitude = -45.0
+            place.longitude = 170.0 + 0.01 * (5 - i)
+            place.amenities = self.amenities[0]
+            if i % 2:
+                place.amenities = self.amenities[1]
+            self.places.append(place)
+        self.objs = (self.states + self.cities + self.amenities +
+                     self.places + [user])
+        for obj in self.objs:
+            models.storage.new(obj)
+
+    def tearDown(self):
+        """Remove the objects created by setUp"""
+        for obj in self.objs:
+            models.storage.delete(obj)
+
+    def names(self, **filters):
+        """Return the names of the places found with filters"""
+        return [place.name for place in PlaceSearch().search(**filters)]
+
+    def test_states_and_cities(self):
+        """Test that states and cities select the places of their cities"""
+        self.assertEqual(self.names(states=[self.states[1].id]),
+                         ["P2", "P5"])
+        self.assertEqual(self.names(states=[self.states[1].id],
+                                    cities=[self.cities[0].id]),
+                         ["P0", "P2", "P3", "P5"])
+        self.assertEqual(self.names(cities=["unknown"]), [])
+
+    def test_amenities(self):
+        """Test that the places must have every amenity"""
+        wifi, pool = (amenity.id for amenity in self.amenities)
+        self.assertEqual(self.names(amenities=[pool, wifi]),
+                         ["P1", "P3", "P5"])
+        self.assertEqual(self.names(cities=[self.cities[1].id],
+                                    amenities=[pool]), ["P1"])
+        self.assertEqual(self.names(amenities=["unknown"]), [])
+
+    def test_pagination(self):
+        """Test that offset and limit slice the ordered results"""
+        cities = [city.id for city in self.cities]
+        self.assertEqual(self.names(cities=cities, offset=1, limit=2),
+                         ["P1", "P2"])
+        self.assertEqual(self.names(cities=cities, offset=5), ["P5"])
+        after = (self.places[1].created_at, self.places[1].id)
+        self.assertEqual(self.names(cities=cities, after=after, limit=2),
+                         ["P2", "P3"])
+        self.assertEqual(self.names(ranges={"number_rooms": (1, None)},
+                                    after=after, offset=1, limit=2),
+                         ["P3", "P4"])
+
+    def test_ranges(self):
+        """Test that the places must have their attributes within the
+        ranges, alone or with the other filters"""
+        self.assertEqual(self.names(ranges={
+            "price_by_night": (100010, 100030)}), ["P1", "P2", "P3"])
+        self.assertEqual(self.names(ranges={
+            "price_by_night": (100010, None), "number_rooms": (None, 1)}),
+            ["P1"])
+        self.assertEqual(self.names(cities=[self.cities[0].id], ranges={
+            "price_by_night": (100000, None), "number_rooms": (2, None)}),
+            ["P3"])
+        wifi, pool = (amenity.id for amenity in self.amenities)
+        self.assertEqual(self.names(amenities=[pool], ranges={
+            "price_by_night": (100020, 100040)}), ["P3"])
+
+    def test_ranges_follow_writes(self):
+        """Test that the ranges see the places created, updated and
+        deleted since the previous search"""
+        ranges = {"price_by_night": (100000, 100050)}
+        self.assertEqual(len(self.names(ranges=ranges)), 6)
+        self.places[0].price_by_night = 1
+        models.storage.new(self.places[0])
+        models.storage.delete(self.places[1])
+        extra = Place(name="P6", price_by_night=100050)
+        models.storage.new(extra)
+        self.objs.append(extra)
+        self.assertEqual(self.names(ranges=ranges),
+                         ["P2", "P3", "P4", "P5", "P6"])
+
+    def test_parse_ranges(self):
+        """Test the ranges of a places_search body"""
+        self.assertEqual(search.parse_ranges({
+            "price_min": 10, "price_max": 20.5, "min_guests": 3,
+            "states": []}),
+            {"price_by_night": (10, 20.5), "max_guest": (3, None)})
+        self.assertEqual(search.parse_ranges({"min_rooms": None}), {})
+        with self.assertRaises(ValueError) as e:
+            search.parse_ranges({"price_max": "20"})
+        self.assertEqual(str(e.exception), "price_max")
+        with self.assertRaises(ValueError):
+            search.parse_ranges({"min_rooms": True})
+
+    def test_near(self):
+        """Test that near selects the places within the radius, closest
+        first, the cursor being the last place of the previous page"""
+        near = {"lat": -45, "lng": 170, "radius_km": 3}
+        self.assertEqual(self.names(near=near), ["P5", "P4", "P3", "P2"])
+        self.assertEqual(self.names(near=near, limit=2), ["P5", "P4"])
+        after = (self.places[4].created_at, self.places[4].id)
+        self.assertEqual(self.names(near=near, after=after), ["P3", "P2"])
+        after = (self.places[0].created_at, self.places[0].id)
+        self.assertEqual(self.names(near=near, after=after), [])
+        self.assertEqual(self.names(near=near, cities=[self.cities[0].id],
+                                    ranges={"number_rooms": (None, 4)}),
+                         ["P3"])
+
+    def test_bbox_follows_writes(self):
+        """Test that bbox selects the places within the box, closest to
+        its center first, and sees the places moved since"""
+        bbox = {"min_lat": -45.1, "min_lng": 170.015, "max_lat": -44.9,
+                "max_lng": 170.06}
+        self.assertEqual(self.names(bbox=bbox), ["P1", "P2", "P0", "P3"])
+        self.places[1].latitude = 45.0
+        models.storage.new(self.places[1])
+        models.storage.delete(self.places[2])
+        self.assertEqual(self.names(bbox=bbox), ["P0", "P3"])
+
+    def test_parse_geo(self):
+        """Test the near and bbox filters of a places_search body"""
+        near = {"lat": 1, "lng": -2.5, "radius_km": 10}
+        bbox = {"min_lat": 0, "min_lng": 170, "max_lat": 1, "max_lng": -170}
+        self.assertEqual(search.parse_geo({}), (None, None))
+        self.assertEqual(search.parse_geo({"near": near, "bbox": bbox}),
+                         (near, bbox))
+        for body in ({"near": [1, 2, 3]},
+                     {"near": dict(near, lat=91)},
+                     {"near": dict(near, radius_km=-1)},
+                     {"near": dict(near, lng="2")},
+                     {"bbox": dict(bbox, min_lat=2)},
+                     {"bbox": dict(bbox, max_lng=181)}):
+            with self.assertRaises(ValueError) as e:
+                search.parse_geo(body)
+            self.assertEqual(str(e.exception), list(body)[0])
+
+
+class PagedStorage:
+    """storage of places only served through page(), recording its calls"""
+
+    def __init__(self, places):
+        """Instantiate a storage of places"""
+        self.places = sorted(places, key=lambda p: (p.created_at, p.id))
+        self.calls = []
+
+    def page(self, cls, limit=None, after=None, attr=None, value=None):
+        """return the page of the places like the storage engines"""
+        self.calls.append((limit, after))
+        places = [place for place in self.places if after is None or
+                  (place.created_at, place.id) > tuple(after)]
+        return places if limit is None else places[:limit]
+
+    def all(self, cls=None, load=None):
+        """fail, the places having to be read a page at a time"""
+        raise AssertionError("all() called")
+
+
+class TestPlaceSearchScan(unittest.TestCase):
+    """Test that the searches without filters page through the storage"""
+    def setUp(self):
+        """Create a storage of 300 places"""
+        self.places = []
+        for i in range(300):
+            place = Place(name="P{}".format(i), price_by_night=i % 10)
+            place.created_at = datetime(2017, 1, 1, 0, i // 60, i % 60)
+            self.places.append(place)
+        self.storage = PagedStorage(self.places)
+
+    def test_no_filter(self):
+        """Test that a page without filters is a single storage page"""
+        found = PlaceSearch(self.storage).search(offset=2, limit=3)
+        self.assertEqual(found, self.places[2:5])
+        self.assertEqual(self.storage.calls, [(5, None)])
+        after = (self.places[9].created_at, self.places[9].id)
+        found = PlaceSearch(self.storage).search(after=after, limit=3)
+        self.assertEqual(found, self.places[10:13])
+        self.assertEqual(self.storage.calls[-1], (3, after))
+
+    def test_ranges(self):
+        """Test that the ranges are checked on the pages read in order
+        until the page of the search is full"""
+        ranges = {"price_by_night": (9, None)}
+        found = PlaceSearch(self.storage).search(ranges=ranges, limit=15)
+        self.assertEqual(found, self.places[9:150:10])
+        self.assertEqual([call[0] for call in self.storage.calls],
+                         [search.scan_chunk] * 2)
+        self.assertEqual(self.storage.calls[1][1][1], self.places[99].id)
+        found = PlaceSearch(self.storage).search(ranges=ranges)
+        self.assertEqual(found, self.places[9::10])
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Contains the TestSlottedModelDocs and TestSlottedModel classes
+"""
+
+import inspect
+import models
+from models.amenity import Amenity
+from models.engine import slotted
+from models.place import Place
+from models.review import Review
+import pep8
+import unittest
+SlottedModel = slotted.SlottedModel
+
+
+class TestSlottedModelDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SlottedModel class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.slotted_f = inspect.getmembers(SlottedModel, inspect.isfunction)
+
+    def test_pep8_conformance_slotted(self):
+        """Test that models/engine/slotted.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/slotted.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_slotted.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_slotted_module_docstring(self):
+        """Test for the slotted.py module docstring"""
+        self.assertIsNot(slotted.__doc__, None,
+                         "slotted.py needs a docstring")
+        self.assertTrue(len(slotted.__doc__) >= 1,
+                        "slotted.py needs a docstring")
+
+    def test_slotted_class_docstring(self):
+        """Test for the SlottedModel class docstring"""
+        self.assertIsNot(SlottedModel.__doc__, None,
+                         "SlottedModel class needs a docstring")
+        self.assertTrue(len(SlottedModel.__doc__) >= 1,
+                        "SlottedModel class needs a docstring")
+
+    def test_slotted_func_docstrings(self):
+        """Test for the presence of docstrings in SlottedModel methods"""
+        for func in self.slotted_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestSlottedModel(unittest.TestCase):
+    """Test the slotted subclasses of the models"""
+    def setUp(self):
+        """Build a review and its slotted copy"""
+        self.review = Review(place_id="place", user_id="user", text="Nice")
+        self.copy = slotted.slotted(Review)(**self.review.to_dict())
+
+    def test_same_class(self):
+        """Test that the subclass passes for its model class"""
+        self.assertIsInstance(self.copy, Review)
+        self.assertEqual(type(self.copy).__name__, "Review")
+        self.assertIs(slotted.slotted(Review), type(self.copy))
+
+    def test_to_dict_and_str(self):
+        """Test that to_dict() and __str__ are those of the model"""
+        self.assertEqual(self.copy.to_dict(), self.review.to_dict())
+        self.assertEqual(self.copy.__dict__, self.review.__dict__)
+        self.assertEqual(str(self.copy), "[Review] ({}) {}".format(
+            self.review.id, self.copy.__dict__))
+
+    def test_compact_attributes(self):
+        """Test that the id is kept as bytes and the foreign keys are
+        interned"""
+        self.assertEqual(self.copy._id, bytes.fromhex(
+            self.review.id.replace("-", "")))
+        self.assertEqual(self.copy.id, self.review.id)
+        other = slotted.slotted(Review)(place_id="".join(["pla", "ce"]))
+        self.assertIs(other.place_id, self.copy.place_id)
+        self.assertFalse(slotted.instance_dict(self.copy))
+
+    def test_defaults_and_other_attributes(self):
+        """Test that unset attributes are the class defaults and that
+        undeclared attributes are kept too"""
+        place = slotted.slotted(Place)(name="Loft")
+        self.assertEqual(place.number_rooms, 0)
+        self.assertEqual(place.amenity_ids, [])
+        place.amenities = Amenity(name="Wifi")
+        self.assertEqual(len(place.amenity_ids), 1)
+        place.color = "blue"
+        self.assertEqual(place.to_dict()["color"], "blue")
+        place.id = "not-a-uuid"
+        self.assertEqual(place.to_dict()["id"], "not-a-uuid")
+        with self.assertRaises(AttributeError):
+            place.undefined
@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializerDocs and TestSerializer classes
+"""
+
+from datetime import datetime
+import inspect
+import io
+import json
+from models import serializer
+import pep8
+import unittest
+
+
+class TestSerializerDocs(unittest.TestCase):
+    """Tests to check the documentation and style of serializer module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.serializer_f = inspect.getmembers(serializer, inspect.isfunction)
+
+    def test_pep8_conformance_serializer(self):
+        """Test that models/serializer.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/serializer.py',
+                                    'tests/test_models/test_serializer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializer_module_docstring(self):
+        """Test for the serializer.py module docstring"""
+        self.assertIsNot(serializer.__doc__, None,
+                         "serializer.py needs a docstring")
+        self.assertTrue(len(serializer.__doc__) >= 1,
+                        "serializer.py needs a docstring")
+
+    def test_serializer_func_docstrings(self):
+        """Test for the presence of docstrings in serializer functions"""
+        for func in self.serializer_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSerializer(unittest.TestCase):
+    """Test the serializer module"""
+    obj = {"State.1": {"name": "Cé/x", "id": "1", "max_guest": 4,
+                       "latitude": 37.773972, "amenity_ids": ["a", "b"],
+                       "description": None, "__class__": "State",
+                       "floats": [0.0, -0.5, 1e-4, 123456.789, 1e15,
+                                  2 ** 53 + 0.0]}}
+    # floats each backend writes in its own notation
+    exponents = [1e-7, -2.5e-5, 5e-324, 1e16, 1.2345678901234568e17,
+                 1.7976931348623157e308]
+
+    def tearDown(self):
+        """Restore the default backend"""
+        serializer.use(serializer.backends[0])
+
+    def test_backends_are_byte_identical(self):
+        """Test that every available backend encodes the same bytes"""
+        serializer.use("json")
+        expected = serializer.dumps(self.obj, sort_keys=True)
+        for name in serializer.backends:
+            with self.subTest(backend=name):
+                serializer.use(name)
+                self.assertEqual(serializer.dumps(self.obj, sort_keys=True),
+                                 expected)
+                self.assertEqual(serializer.loads(expected), self.obj)
+
+    def test_backends_decode_exponents_alike(self):
+        """Test that the floats written in the notation of each backend
+        decode to the same values with every backend"""
+        for name in serializer.backends:
+            serializer.use(name)
+            data = serializer.dumps(self.exponents)
+            for other in serializer.backends:
+                with self.subTest(backend=name, decoder=other):
+                    serializer.use(other)
+                    self.assertEqual(serializer.loads(data), self.exponents)
+
+    def test_non_finite_floats_rejected(self):
+        """Test that every backend rejects NaN and infinities, also those
+        encoded by default, and does not decode them"""
+        class Model:
+            """object encoded by default as a dictionary"""
+            def to_dict(self):
+                """return the dictionary of the object"""
+                return {"latitude": float("nan")}
+
+        for name in serializer.backends:
+            serializer.use(name)
+            for value in (float("nan"), float("inf"), -float("inf")):
+                with self.subTest(backend=name, value=value):
+                    with self.assertRaises(ValueError):
+                        serializer.dumps({"a": [None, value]})
+            with self.subTest(backend=name, value="default"):
+                with self.assertRaises(ValueError):
+                    serializer.dumps([None, Model()],
+                                     default=lambda o: o.to_dict())
+            for data in (b'[NaN]', b'{"a": Infinity}', b'[-Infinity]'):
+                with self.subTest(backend=name, data=data):
+                    with self.assertRaises(ValueError):
+                        serializer.loads(data)
+
+    def test_stdlib_format(self):
+        """Test that the output is compact UTF-8 JSON"""
+        serializer.use("json")
+        self.assertEqual(serializer.dumps(self.obj),
+                         json.dumps(self.obj, ensure_ascii=False,
+                                    separators=(",", ":")).encode())
+
+    def test_default(self):
+        """Test that default encodes the unsupported types"""
+        now = datetime(2017, 9, 28, 21, 5, 54)
+        for name in serializer.backends:
+            with self.subTest(backend=name):
+                serializer.use(name)
+                self.assertEqual(serializer.dumps([now], default=str),
+                                 b'["2017-09-28 21:05:54"]')
+
+    def test_use_unknown_backend(self):
+        """Test that selecting a missing backend raises ValueError"""
+        with self.assertRaises(ValueError):
+            serializer.use("simplejson")
+
+    def test_iterload(self):
+        """Test that iterload yields the pairs across chunk boundaries"""
+        data = json.dumps(self.obj, indent=2) + "\n"
+        data = data.replace('"State.1"', '"State.2": {"a": [1, 2]}, "State.1"')
+        for size in (1, 7, 1 << 20):
+            with self.subTest(chunk_size=size):
+                pairs = list(serializer.iterload(io.StringIO(data), size))
+                self.assertEqual(dict(pairs), json.loads(data))
+                self.assertEqual([k for k, _ in pairs], ["State.2", "State.1"])
+
+    def test_iterload_truncated(self):
+        """Test that iterload raises ValueError on a truncated object"""
+        data = json.dumps(self.obj)
+        for text in (data[:-1], data[:10], "", "[]"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(serializer.iterload(io.StringIO(text), 4))
+        self.assertEqual(list(serializer.iterload(io.StringIO("{ }"))), [])